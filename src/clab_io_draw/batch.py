@@ -0,0 +1,321 @@
+# ruff: noqa: B008
+import glob
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import typer
+
+from clab_io_draw.clab2drawio import (
+    Clab2DrawioError,
+    Layout,
+    LogLevel,
+    main,
+    resolve_theme_path,
+)
+from clab_io_draw.core.config.theme_manager import ThemeManager, ThemeManagerError
+from clab_io_draw.core.layout.barycenter_engine import DEFAULT_PASSES
+from clab_io_draw.core.layout.crossing_reduction import DEFAULT_SWAP_PASSES
+from clab_io_draw.core.logging_config import configure_logging
+from clab_io_draw.core.utils.render_cache import RenderCache
+
+logger = logging.getLogger(__name__)
+
+
+app = typer.Typer(help="Generate topology diagrams for many containerlab files")
+
+# Theme styles of the batch, handed to each worker process once
+_worker_styles = None
+
+
+def expand_inputs(patterns: list[str]) -> list[str]:
+    """
+    Expand file names and glob patterns into a list of input files.
+
+    :param patterns: File paths or glob patterns ("**" matches subfolders).
+    :return: Matching files in argument order, without duplicates.
+    :raises Clab2DrawioError: If a plain file name does not exist or a pattern matches nothing.
+    """
+    inputs = {}
+    for pattern in patterns:
+        if glob.has_magic(pattern):
+            matches = sorted(glob.glob(pattern, recursive=True))
+        else:
+            matches = [pattern] if os.path.isfile(pattern) else []
+        if not matches:
+            message = f"No topology file matches '{pattern}'."
+            logger.error(message)
+            raise Clab2DrawioError(message)
+        inputs.update(dict.fromkeys(matches))
+    return list(inputs)
+
+
+def output_files(inputs: list[str], output_dir: str | None) -> list[str | None]:
+    """
+    Choose the .drawio output file for each input.
+
+    :param inputs: Input topology files.
+    :param output_dir: Folder to write to, mirroring the input folders below
+                       their common parent. None writes next to each input.
+    :return: Output file per input, None meaning main's default location.
+    """
+    if output_dir is None:
+        return [None] * len(inputs)
+    common = os.path.commonpath([os.path.dirname(os.path.abspath(f)) for f in inputs])
+    return [
+        os.path.join(
+            output_dir,
+            os.path.splitext(os.path.relpath(os.path.abspath(f), common))[0]
+            + ".drawio",
+        )
+        for f in inputs
+    ]
+
+
+def _init_worker(styles, log_level):
+    global _worker_styles
+    _worker_styles = styles
+    configure_logging(level=log_level)
+
+
+def render_file(input_file: str, output_file: str | None, options: dict):
+    """
+    Render one topology in a batch worker.
+
+    Errors are returned instead of raised so one broken lab does not stop
+    the batch.
+
+    :param input_file: Containerlab topology file.
+    :param output_file: Output .drawio file, or None for main's default.
+    :param options: Keyword arguments passed on to clab2drawio.main.
+    :return: (input_file, seconds, error message or None).
+    """
+    start = time.perf_counter()
+    try:
+        main(
+            input_file=input_file,
+            output_file=output_file,
+            styles=_worker_styles,
+            **options,
+        )
+        error = None
+    except Clab2DrawioError as e:
+        error = str(e)
+    except SystemExit as e:
+        # sys.exit() in the renderer: report its message or status
+        if isinstance(e.code, str):
+            error = e.code
+        else:
+            error = f"exited with status {e.code or 0}"
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    return input_file, time.perf_counter() - start, error
+
+
+def run_batch(
+    inputs: list[str],
+    options: dict,
+    output_dir: str | None = None,
+    jobs: int | None = None,
+    log_level: int = logging.INFO,
+) -> dict:
+    """
+    Render many topologies with one theme, spread over a process pool.
+
+    The theme in options is loaded once here and shared with every worker.
+
+    :param inputs: Input topology files.
+    :param options: Keyword arguments for clab2drawio.main, including "theme".
+    :param output_dir: Optional folder for the outputs, see output_files().
+    :param jobs: Number of worker processes (default: one per CPU). 1 renders
+                 in this process.
+    :param log_level: Logging level configured in the workers.
+    :return: Dict of input file -> error message, for the files that failed.
+    :raises Clab2DrawioError: If the theme cannot be loaded.
+    """
+    theme_path = resolve_theme_path(options["theme"])
+    try:
+        styles = ThemeManager(theme_path).load_theme()
+    except ThemeManagerError as e:
+        raise Clab2DrawioError(f"Failed to load theme '{theme_path}'") from e
+
+    start = time.perf_counter()
+    tasks = list(zip(inputs, output_files(inputs, output_dir), strict=True))
+    failures = {}
+
+    def report(input_file, seconds, error):
+        if error is None:
+            logger.info(f"Rendered {input_file} in {seconds:.2f} s")
+        else:
+            logger.error(f"Failed {input_file} after {seconds:.2f} s: {error}")
+            failures[input_file] = error
+
+    if jobs == 1:
+        _init_worker(styles, log_level)
+        for input_file, output_file in tasks:
+            report(*render_file(input_file, output_file, options))
+    else:
+        # Each worker already has a CPU of its own; packed components laid
+        # out in further processes per worker would oversubscribe the machine
+        options = {**options, "layout_jobs": 1}
+        with ProcessPoolExecutor(
+            max_workers=jobs, initializer=_init_worker, initargs=(styles, log_level)
+        ) as executor:
+            futures = [
+                executor.submit(render_file, input_file, output_file, options)
+                for input_file, output_file in tasks
+            ]
+            for future in futures:
+                report(*future.result())
+
+    logger.info(
+        f"Rendered {len(tasks) - len(failures)}/{len(tasks)} topologies "
+        f"in {time.perf_counter() - start:.2f} s"
+    )
+    return failures
+
+
+@app.command(name="clab2drawio-batch")
+def cli(
+    inputs: list[str] = typer.Argument(
+        ..., help="Containerlab YAML files or glob patterns, e.g. 'labs/**/*.clab.yml'"
+    ),
+    output_dir: Path | None = typer.Option(
+        None,
+        "-o",
+        "--output-dir",
+        help="Folder for the outputs (default: next to each input)",
+    ),
+    jobs: int | None = typer.Option(
+        None, "-j", "--jobs", help="Worker processes (default: one per CPU)"
+    ),
+    gf_dashboard: bool = typer.Option(
+        False, "-g", "--gf-dashboard", help="Generate Grafana dashboards"
+    ),
+    grafana_config: Path | None = typer.Option(
+        None, "--grafana-config", help="Path to Grafana YAML config"
+    ),
+    grafana_interface_format: str | None = typer.Option(
+        None,
+        "--grafana-interface-format",
+        help="Regex pattern for mapping interface names (e.g., 'e1-{x}:ethernet1/{x}')",
+    ),
+    grafana_interface_selector: str | None = typer.Option(
+        None,
+        "--grafana-interface-selector",
+        help="Regex pattern for selecting which part of interface name to display (e.g., 'e1-1-c{x}-1' to select 'x')",
+    ),
+    include_unlinked_nodes: bool = typer.Option(
+        False, "--include-unlinked-nodes", help="Include nodes without links"
+    ),
+    no_links: bool = typer.Option(False, "--no-links", help="Do not draw links"),
+    layout: Layout = typer.Option(Layout.VERTICAL, "--layout", help="Diagram layout"),
+    theme: str = typer.Option("nokia", "--theme", help="Diagram theme or style file"),
+    log_level: LogLevel = typer.Option(
+        LogLevel.INFO, "--log-level", "-l", help="Set logging level"
+    ),
+    stream: bool = typer.Option(
+        False,
+        "--stream",
+        help="Write diagram cells to disk as they are generated (lower memory for large labs)",
+    ),
+    compress: bool = typer.Option(
+        False, "--compress", help="Write compressed draw.io diagram pages"
+    ),
+    external_icons: bool = typer.Option(
+        False,
+        "--external-icons",
+        help="Write each node icon once to an 'icons' folder next to each output and reference it",
+    ),
+    icon_base_url: str | None = typer.Option(
+        None,
+        "--icon-base-url",
+        help="URL prefix for --external-icons (default: relative 'icons/' folder)",
+    ),
+    no_cache: bool = typer.Option(
+        False, "--no-cache", help="Always render, bypassing the result cache"
+    ),
+    cache_dir: Path | None = typer.Option(
+        None,
+        "--cache-dir",
+        help="Result cache folder (default: $XDG_CACHE_HOME/clab-io-draw)",
+    ),
+    incremental: bool = typer.Option(
+        False,
+        "--incremental",
+        help="Keep node positions from the existing outputs and only place new or re-linked nodes",
+    ),
+    pack_components: bool = typer.Option(
+        False,
+        "--pack-components",
+        help="Lay out disconnected parts of a topology separately and pack them on the page",
+    ),
+    layout_passes: int = typer.Option(
+        DEFAULT_PASSES,
+        "--layout-passes",
+        min=1,
+        help="Maximum layout sweep passes; fewer run once node positions stop changing",
+    ),
+    layout_time_budget: float | None = typer.Option(
+        None,
+        "--layout-time-budget",
+        min=0,
+        help="Seconds after which a layout starts no further sweep pass",
+    ),
+    layout_swap_passes: int = typer.Option(
+        DEFAULT_SWAP_PASSES,
+        "--layout-swap-passes",
+        min=0,
+        help="Maximum passes swapping neighboring nodes to remove link crossings, 0 to skip",
+    ),
+) -> None:
+    """Generate topology diagrams for many containerlab files in one process pool."""
+
+    configure_logging(level=log_level.to_int())
+
+    options = {
+        "grafana": gf_dashboard,
+        "theme": theme,
+        "include_unlinked_nodes": include_unlinked_nodes,
+        "no_links": no_links,
+        "layout": layout.value,
+        "log_level": log_level,
+        "grafana_config_path": str(grafana_config) if grafana_config else None,
+        "grafana_interface_format": grafana_interface_format,
+        "grafana_interface_selector": grafana_interface_selector,
+        "stream": stream,
+        "compress": compress,
+        "external_icons": external_icons,
+        "icon_base_url": icon_base_url,
+        "incremental": incremental,
+        "pack_components": pack_components,
+        "layout_passes": layout_passes,
+        "layout_time_budget": layout_time_budget,
+        "layout_swap_passes": layout_swap_passes,
+        "cache": None
+        if no_cache
+        else RenderCache(str(cache_dir) if cache_dir else None),
+    }
+    try:
+        failures = run_batch(
+            expand_inputs(inputs),
+            options,
+            output_dir=str(output_dir) if output_dir else None,
+            jobs=jobs,
+            log_level=log_level.to_int(),
+        )
+    except Clab2DrawioError:
+        sys.exit(1)
+    if failures:
+        sys.exit(1)
+
+
+def main_cli() -> None:
+    app()
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -1,7 +1,11 @@
 # ruff: noqa: B008
+import contextlib
+import copy
+import json
 import logging
 import os
 import sys
+import time
 from enum import Enum
 from pathlib import Path
 
@@ -13,16 +17,27 @@ from clab_io_draw.core.data.node_link_builder import NodeLinkBuilder
 from clab_io_draw.core.data.topology_loader import TopologyLoader, TopologyLoaderError
 from clab_io_draw.core.diagram.custom_drawio import CustomDrawioDiagram
 from clab_io_draw.core.diagram.diagram_builder import DiagramBuilder
-from clab_io_draw.core.grafana.grafana_manager import GrafanaDashboard
-from clab_io_draw.core.interactivity.interactive_manager import InteractiveManager
+from clab_io_draw.core.layout.barycenter_engine import DEFAULT_PASSES
+from clab_io_draw.core.layout.component_layout import ComponentLayout
+from clab_io_draw.core.layout.crossing_reduction import DEFAULT_SWAP_PASSES
 from clab_io_draw.core.layout.horizontal_layout import HorizontalLayout
+from clab_io_draw.core.layout.incremental_layout import (
+    IncrementalLayout,
+    LayoutSeed,
+    LayoutSeedError,
+)
+from clab_io_draw.core.layout.layout_metrics import layout_metrics
 from clab_io_draw.core.layout.vertical_layout import VerticalLayout
 from clab_io_draw.core.logging_config import configure_logging
-from clab_io_draw.core.utils.yaml_processor import YAMLProcessor
+from clab_io_draw.core.utils.render_cache import RenderCache
 
 logger = logging.getLogger(__name__)
 
 
+class Clab2DrawioError(Exception):
+    """Raised when a topology cannot be rendered."""
+
+
 class Layout(str, Enum):
     VERTICAL = "vertical"
     HORIZONTAL = "horizontal"
@@ -42,6 +57,26 @@ class LogLevel(str, Enum):
 app = typer.Typer(help="Generate a topology diagram from a containerlab YAML file")
 
 
+def resolve_theme_path(theme: str) -> str:
+    """
+    Resolve a theme name or file path to the theme file.
+
+    :param theme: Name of a bundled theme or path to a custom theme file.
+    :return: Path to the theme YAML file.
+    :raises Clab2DrawioError: If the theme file does not exist.
+    """
+    if os.path.isabs(theme):
+        theme_path = theme
+    else:
+        theme_path = os.path.join(os.path.dirname(__file__), "styles", f"{theme}.yaml")
+
+    if not os.path.exists(theme_path):
+        message = f"The specified theme file '{theme_path}' does not exist."
+        logger.error(message)
+        raise Clab2DrawioError(message)
+    return theme_path
+
+
 def main(
     input_file: str,
     output_file: str,
@@ -55,6 +90,21 @@ def main(
     grafana_config_path: str = None,
     grafana_interface_format: str | None = None,
     grafana_interface_selector: str | None = None,
+    stream: bool = False,
+    compress: bool = False,
+    external_icons: bool = False,
+    icon_base_url: str | None = None,
+    cache: RenderCache | None = None,
+    styles: dict | None = None,
+    level_manager: GraphLevelManager | None = None,
+    incremental: bool = False,
+    layout_seed: str | None = None,
+    pack_components: bool = False,
+    layout_jobs: int | None = None,
+    layout_passes: int = DEFAULT_PASSES,
+    layout_time_budget: float | None = None,
+    layout_swap_passes: int = DEFAULT_SWAP_PASSES,
+    metrics_file: str | None = None,
 ) -> None:
     """
     Main function to generate a topology diagram from a containerlab YAML or draw.io XML file.
@@ -70,47 +120,105 @@ def main(
     :param interactive: Run in interactive mode to define graph-levels and icons.
     :param grafana_interface_format: Regex pattern for mapping interface names (e.g., "e1-{x}:ethernet1/{x}").
     :param grafana_interface_selector: Regex pattern for selecting which part of interface name to display (e.g., "e1-1-c{x}-1" to select 'x').
+    :param stream: Spool diagram cells to disk as they are generated instead of keeping them in memory.
+    :param compress: Write compressed (deflate + base64) diagram pages.
+    :param external_icons: Write each embedded icon once to an "icons" folder next to the output and reference it from the node styles.
+    :param icon_base_url: URL prefix for external icons (defaults to the relative "icons/" folder).
+    :param cache: Render cache to reuse unchanged results from; None always renders. Not used in interactive mode.
+    :param styles: Styles already loaded from the theme file by ThemeManager, so callers rendering many topologies load the theme once. A copy is used.
+    :param level_manager: GraphLevelManager kept across renders, which reuses graph levels while the links stay the same.
+    :param incremental: Keep node positions from a previous diagram and only place new or re-linked nodes.
+    :param layout_seed: Previous .drawio file for incremental, defaults to the output file.
+    :param pack_components: Lay out each connected component on its own and pack them on the page.
+    :param layout_jobs: Worker processes for laying out the components of a large topology with pack_components, None for one per CPU.
+    :param layout_passes: Maximum barycenter sweep passes; fewer run once node positions stop changing.
+    :param layout_time_budget: Seconds after which the layout starts no further sweep pass, None for no limit.
+    :param layout_swap_passes: Maximum passes swapping neighboring nodes to remove link crossings after the sweeps, 0 for none.
+    :param metrics_file: Write layout quality metrics and the layout time as JSON to this file.
+    :raises Clab2DrawioError: If the topology or the theme cannot be loaded.
     """
     logger.debug("Starting clab2drawio main function.")
-    script_dir = os.path.dirname(__file__)
     loader = TopologyLoader()
     try:
         containerlab_data = loader.load(input_file)
-    except TopologyLoaderError:
-        logger.error("Failed to load topology. Exiting.")
-        sys.exit(1)
+    except TopologyLoaderError as e:
+        logger.error("Failed to load topology.")
+        raise Clab2DrawioError(str(e)) from e
 
-    try:
-        if os.path.isabs(theme):
-            theme_path = theme
-        else:
-            theme_path = os.path.join(script_dir, "styles", f"{theme}.yaml")
+    theme_path = resolve_theme_path(theme)
 
-        if not os.path.exists(theme_path):
-            raise FileNotFoundError(
-                f"The specified theme file '{theme_path}' does not exist."
-            )
-    except FileNotFoundError as e:
-        logger.error(str(e))
-        sys.exit(1)
-    except Exception as e:
-        logger.error(f"An error occurred while loading the theme: {e}")
-        sys.exit(1)
+    if not output_file:
+        output_file = os.path.splitext(input_file)[0] + ".drawio"
+    grafana_output_file = os.path.splitext(output_file)[0] + ".grafana.json"
+    flow_panel_output_file = (
+        os.path.splitext(grafana_output_file)[0] + ".flow_panel.yaml"
+    )
+    icons_dir = os.path.join(os.path.dirname(output_file) or ".", "icons")
+    output_targets = {
+        "drawio": output_file,
+        "grafana": grafana_output_file,
+        "flow_panel": flow_panel_output_file,
+        "icons": icons_dir,
+    }
+
+    cache_key = None
+    # Incremental output depends on the previous diagram, which the key does not
+    # cover, and metrics are taken from a layout that a cache hit would skip
+    if cache is not None and not interactive and not incremental and not metrics_file:
+        cache_key = cache.key(
+            containerlab_data,
+            theme_path,
+            {
+                "grafana": grafana,
+                "theme": theme,
+                "include_unlinked_nodes": include_unlinked_nodes,
+                "no_links": no_links,
+                "layout": layout,
+                "grafana_interface_format": grafana_interface_format,
+                "grafana_interface_selector": grafana_interface_selector,
+                "stream": stream,
+                "compress": compress,
+                "external_icons": external_icons,
+                "icon_base_url": icon_base_url,
+                "pack_components": pack_components,
+                "layout_passes": layout_passes,
+                "layout_time_budget": layout_time_budget,
+                "layout_swap_passes": layout_swap_passes,
+            },
+            grafana_config_path,
+        )
+        restored = cache.fetch(cache_key, output_targets)
+        if restored is not None:
+            for path in restored:
+                logger.info("Restored %s from cache", path)
+            return
 
     # Use ThemeManager to load styles
     logger.debug("Loading theme...")
     theme_manager = ThemeManager(theme_path)
 
-    try:
-        styles = theme_manager.load_theme()
-    except ThemeManagerError:
-        logger.error("Failed to load theme. Exiting.")
-        sys.exit(1)
+    if styles is not None:
+        # The render adjusts styles (page size, ports), keep the caller's intact
+        styles = copy.deepcopy(styles)
+    else:
+        try:
+            styles = theme_manager.load_theme()
+        except ThemeManagerError as e:
+            logger.error("Failed to load theme.")
+            raise Clab2DrawioError(f"Failed to load theme '{theme_path}'") from e
     logger.debug("Theme loaded successfully, building diagram...")
 
-    diagram = CustomDrawioDiagram()
+    # Optional features import their dependencies only when they are used,
+    # which keeps e.g. textual out of the startup of a plain render
+    if stream:
+        from clab_io_draw.core.diagram.streaming_drawio import StreamingDrawioDiagram
+
+        diagram = StreamingDrawioDiagram()
+    else:
+        diagram = CustomDrawioDiagram()
     diagram.layout = layout
     diagram.styles = styles
+    diagram.compressed = compress
 
     # Enable Grafana output automatically when using the grafana theme
     if (
@@ -142,6 +250,11 @@ def main(
 
     if interactive:
         logger.debug("Entering interactive mode...")
+        from clab_io_draw.core.interactivity.interactive_manager import (
+            InteractiveManager,
+        )
+        from clab_io_draw.core.utils.yaml_processor import YAMLProcessor
+
         processor = YAMLProcessor()
         interactor = InteractiveManager()
         interactor.run_interactive_mode(
@@ -211,26 +324,56 @@ def main(
         logger.debug(
             "Using predefined positions - graph levels will only be used for connectivity"
         )
-        graph_manager = GraphLevelManager()
+        graph_manager = level_manager or GraphLevelManager()
         graph_manager.assign_graphlevels(
             diagram, verbose=False, skip_warnings=True, respect_fixed_positions=True
         )
     else:
         # No fixed positions, proceed with normal graph level assignment
         logger.debug("No predefined positions found - assigning graph levels normally")
-        graph_manager = GraphLevelManager()
+        graph_manager = level_manager or GraphLevelManager()
         graph_manager.assign_graphlevels(diagram, verbose=False)
 
     # Only apply layout manager if we don't have predefined positions
-    if not has_predefined_positions:
+    if incremental or not has_predefined_positions:
         # Choose layout based on layout argument
-        if layout == "vertical":
-            layout_manager = VerticalLayout()
+        layout_cls = VerticalLayout if layout == "vertical" else HorizontalLayout
+        layout_options = {
+            "max_passes": layout_passes,
+            "time_budget": layout_time_budget,
+            "swap_passes": layout_swap_passes,
+        }
+        if pack_components:
+            layout_manager = ComponentLayout(
+                layout_cls, jobs=layout_jobs, **layout_options
+            )
         else:
-            layout_manager = HorizontalLayout()
+            layout_manager = layout_cls(**layout_options)
+
+        if incremental:
+            seed = LayoutSeed()
+            seed_file = layout_seed or output_file
+            if os.path.exists(seed_file):
+                try:
+                    seed = LayoutSeed.from_drawio(seed_file)
+                except LayoutSeedError as e:
+                    logger.warning(f"{e}, laying out all nodes")
+            # Positions from labels or annotations are explicit and always kept
+            for node in nodes.values():
+                if isinstance(node.pos_x, int | float) and isinstance(
+                    node.pos_y, int | float
+                ):
+                    seed.positions[node.name] = (node.pos_x, node.pos_y)
+                    if seed.links is not None:
+                        seed.links.pop(node.name, None)
+            layout_manager = IncrementalLayout(seed, layout_manager)
 
         logger.debug(f"Applying {layout} layout...")
+        layout_start = time.perf_counter()
         layout_manager.apply(diagram, verbose=log_level == LogLevel.DEBUG)
+        layout_seconds = time.perf_counter() - layout_start
+    else:
+        layout_seconds = 0.0
 
     # Calculate the diagram size based on the positions of the nodes
     min_x = min(node.pos_x for node in nodes.values())
@@ -251,6 +394,17 @@ def main(
     max_x = max(node.pos_x for node in nodes.values())
     max_y = max(node.pos_y for node in nodes.values())
 
+    if metrics_file:
+        metrics = layout_metrics(
+            nodes, styles.get("node_width", 75), styles.get("node_height", 75)
+        )
+        metrics["layout"] = layout
+        metrics["layout_seconds"] = round(layout_seconds, 6)
+        os.makedirs(os.path.dirname(metrics_file) or ".", exist_ok=True)
+        with open(metrics_file, "w") as f:
+            json.dump(metrics, f, indent=2)
+        logger.info("Saved layout metrics to: %s", metrics_file)
+
     max_size_x = max_x + 100  # Adding a margin to the right side
     max_size_y = max_y + 100  # Adding a margin to the bottom
 
@@ -262,63 +416,76 @@ def main(
     logger.debug("Updating diagram style...")
     diagram.update_style(styles)
 
-    diagram.add_diagram("Network Topology")
+    # A streaming diagram spools its pages to temporary files from here on,
+    # leaving the block releases them even when rendering fails
+    with diagram if stream else contextlib.nullcontext():
+        diagram.add_diagram("Network Topology")
 
-    diagram_builder = DiagramBuilder()
-    logger.debug("Adding nodes to diagram...")
-    diagram_builder.add_nodes(diagram, diagram.nodes, styles)
+        outputs = {"drawio": output_file}
+        if external_icons:
+            from clab_io_draw.core.diagram.icon_store import IconStore
 
-    if grafana:
-        styles["ports"] = True
-
-    if grafana_interface_selector:
-        styles["grafana_interface_selector"] = grafana_interface_selector
-
-    if styles["ports"]:
-        logger.debug("Adding ports and generating Grafana dashboard...")
-        diagram_builder.add_ports(diagram, styles)
-        if not output_file:
-            grafana_output_file = os.path.splitext(input_file)[0] + ".grafana.json"
-        output_folder = os.path.dirname(grafana_output_file) or "."
-        diagram.grafana_dashboard_file = grafana_output_file
-        os.makedirs(output_folder, exist_ok=True)
+            icon_store = IconStore(icons_dir, icon_base_url)
+            icon_store.externalize_styles(styles)
+            outputs.update(
+                (f"icons/{filename}", path)
+                for filename, path in icon_store.files.items()
+            )
 
-        grafana_dashboard = GrafanaDashboard(
-            diagram,
-            grafana_config_path=grafana_config_path,
-            grafana_interface_format=grafana_interface_format,
-        )
-        panel_config = grafana_dashboard.create_panel_yaml()
+        diagram_builder = DiagramBuilder()
+        logger.debug("Adding nodes to diagram...")
+        diagram_builder.add_nodes(diagram, diagram.nodes, styles)
 
-        flow_panel_output_file = (
-            os.path.splitext(grafana_output_file)[0] + ".flow_panel.yaml"
-        )
-        with open(flow_panel_output_file, "w") as f:
-            f.write(panel_config)
-        logger.info("Saved flow panel YAML to: %s", flow_panel_output_file)
+        if grafana:
+            styles["ports"] = True
 
-        grafana_json = grafana_dashboard.create_dashboard(panel_config)
-        with open(grafana_output_file, "w") as f:
-            f.write(grafana_json)
-        logger.info("Saved Grafana dashboard JSON to: %s", grafana_output_file)
+        if grafana_interface_selector:
+            styles["grafana_interface_selector"] = grafana_interface_selector
 
-    else:
-        if not no_links:
-            logger.debug("Adding links to diagram...")
-            diagram_builder.add_links(diagram, styles)
+        if styles["ports"]:
+            logger.debug("Adding ports and generating Grafana dashboard...")
+            diagram_builder.add_ports(diagram, styles)
+            output_folder = os.path.dirname(grafana_output_file) or "."
+            diagram.grafana_dashboard_file = grafana_output_file
+            os.makedirs(output_folder, exist_ok=True)
 
-    if not output_file:
-        output_file = os.path.splitext(input_file)[0] + ".drawio"
+            from clab_io_draw.core.grafana.grafana_manager import GrafanaDashboard
 
-    output_folder = os.path.dirname(output_file) or "."
-    output_filename = os.path.basename(output_file)
-    os.makedirs(output_folder, exist_ok=True)
+            grafana_dashboard = GrafanaDashboard(
+                diagram,
+                grafana_config_path=grafana_config_path,
+                grafana_interface_format=grafana_interface_format,
+            )
+            panel_config = grafana_dashboard.create_panel_yaml()
 
-    logger.debug(f"Dumping diagram to file: {output_file}")
-    diagram.dump_file(filename=output_filename, folder=output_folder)
+            with open(flow_panel_output_file, "w") as f:
+                f.write(panel_config)
+            logger.info("Saved flow panel YAML to: %s", flow_panel_output_file)
+
+            grafana_json = grafana_dashboard.create_dashboard(panel_config)
+            with open(grafana_output_file, "w") as f:
+                f.write(grafana_json)
+            logger.info("Saved Grafana dashboard JSON to: %s", grafana_output_file)
+            outputs["grafana"] = grafana_output_file
+            outputs["flow_panel"] = flow_panel_output_file
+
+        else:
+            if not no_links:
+                logger.debug("Adding links to diagram...")
+                diagram_builder.add_links(diagram, styles)
+
+        output_folder = os.path.dirname(output_file) or "."
+        output_filename = os.path.basename(output_file)
+        os.makedirs(output_folder, exist_ok=True)
+
+        logger.debug(f"Dumping diagram to file: {output_file}")
+        diagram.dump_file(filename=output_filename, folder=output_folder)
 
     logger.info("Saved file to: %s", output_file)
 
+    if cache_key is not None:
+        cache.store(cache_key, outputs)
+
     if grafana:
         logger.info(
             "Grafana SVG export skipped. Export %s manually using draw.io.",
@@ -326,6 +493,79 @@ def main(
         )
 
 
+def watch(
+    input_file: str,
+    output_file: str | None,
+    theme: str,
+    stop_event=None,
+    debounce: float = 0.2,
+    poll_interval: float = 0.5,
+    **options,
+) -> None:
+    """
+    Render the topology, then render it again whenever it changes.
+
+    The topology file, its .annotations.json and the theme file are watched.
+    The theme is only reloaded when the theme file changed, and graph levels
+    are reused while the links stay the same, e.g. when only annotations
+    moved nodes. Failed renders are logged and the watch continues.
+
+    :param input_file: Path to the containerlab YAML file.
+    :param output_file: Output file path for the generated diagram.
+    :param theme: Theme name or path to a custom theme file.
+    :param stop_event: Optional threading.Event that ends the watch.
+    :param debounce: Seconds without further changes before re-rendering.
+    :param poll_interval: Seconds between checks when inotify is unavailable.
+    :param options: Further keyword arguments for main().
+    :raises Clab2DrawioError: If the theme does not exist.
+    """
+    from clab_io_draw.core.utils.file_watcher import FileWatcher
+
+    theme_path = os.path.abspath(resolve_theme_path(theme))
+    input_path = os.path.abspath(input_file)
+    level_manager = GraphLevelManager()
+    styles = None
+    changed = {input_path, theme_path}
+
+    with FileWatcher(
+        [input_path, f"{input_path}.annotations.json", theme_path],
+        poll_interval=poll_interval,
+    ) as watcher:
+        logger.info(
+            "Watching %s for changes (%s), press Ctrl+C to stop",
+            input_file,
+            "polling" if watcher.polling else "inotify",
+        )
+        while stop_event is None or not stop_event.is_set():
+            if changed:
+                start = time.perf_counter()
+                try:
+                    if styles is None or theme_path in changed:
+                        styles = ThemeManager(theme_path).load_theme()
+                    main(
+                        input_file=input_file,
+                        output_file=output_file,
+                        theme=theme,
+                        styles=styles,
+                        level_manager=level_manager,
+                        **options,
+                    )
+                    logger.info(
+                        "Rendered %s in %.0f ms",
+                        ", ".join(sorted(os.path.basename(p) for p in changed)),
+                        (time.perf_counter() - start) * 1000,
+                    )
+                except (Clab2DrawioError, ThemeManagerError):
+                    logger.error("Render failed, waiting for the next change...")
+                except Exception:
+                    # A half-edited topology must not end the watch
+                    logger.exception("Render failed, waiting for the next change...")
+            # Short timeouts keep the loop responsive to stop_event
+            changed = watcher.wait(
+                timeout=None if stop_event is None else 0.2, debounce=debounce
+            )
+
+
 @app.command(name="clab2drawio")
 def cli(  # noqa: B008
     input: Path = typer.Option(
@@ -362,25 +602,134 @@ def cli(  # noqa: B008
     interactive: bool = typer.Option(
         False, "-I", "--interactive", help="Interactive mode"
     ),  # noqa: B008
+    stream: bool = typer.Option(
+        False,
+        "--stream",
+        help="Write diagram cells to disk as they are generated (lower memory for large labs)",
+    ),  # noqa: B008
+    compress: bool = typer.Option(
+        False, "--compress", help="Write compressed draw.io diagram pages"
+    ),  # noqa: B008
+    external_icons: bool = typer.Option(
+        False,
+        "--external-icons",
+        help="Write each node icon once to an 'icons' folder and reference it instead of embedding it per node",
+    ),  # noqa: B008
+    icon_base_url: str | None = typer.Option(
+        None,
+        "--icon-base-url",
+        help="URL prefix for --external-icons (default: relative 'icons/' folder)",
+    ),  # noqa: B008
+    no_cache: bool = typer.Option(
+        False, "--no-cache", help="Always render, bypassing the result cache"
+    ),  # noqa: B008
+    cache_dir: Path | None = typer.Option(
+        None,
+        "--cache-dir",
+        help="Result cache folder (default: $XDG_CACHE_HOME/clab-io-draw)",
+    ),  # noqa: B008
+    incremental: bool = typer.Option(
+        False,
+        "--incremental",
+        help="Keep node positions from the existing output and only place new or re-linked nodes",
+    ),  # noqa: B008
+    layout_seed: Path | None = typer.Option(
+        None,
+        "--layout-seed",
+        help="Previous .drawio file to take positions from (implies --incremental)",
+    ),  # noqa: B008
+    pack_components: bool = typer.Option(
+        False,
+        "--pack-components",
+        help="Lay out disconnected parts of the topology separately and pack them on the page",
+    ),  # noqa: B008
+    layout_jobs: int | None = typer.Option(
+        None,
+        "--layout-jobs",
+        min=1,
+        help="Worker processes for --pack-components on large labs (default: one per CPU)",
+    ),  # noqa: B008
+    layout_passes: int = typer.Option(
+        DEFAULT_PASSES,
+        "--layout-passes",
+        min=1,
+        help="Maximum layout sweep passes; fewer run once node positions stop changing",
+    ),  # noqa: B008
+    layout_time_budget: float | None = typer.Option(
+        None,
+        "--layout-time-budget",
+        min=0,
+        help="Seconds after which the layout starts no further sweep pass",
+    ),  # noqa: B008
+    layout_swap_passes: int = typer.Option(
+        DEFAULT_SWAP_PASSES,
+        "--layout-swap-passes",
+        min=0,
+        help="Maximum passes swapping neighboring nodes to remove link crossings, 0 to skip",
+    ),  # noqa: B008
+    metrics: Path | None = typer.Option(
+        None,
+        "--metrics",
+        help="Write layout quality metrics (crossings, edge length, overlaps, area) as JSON to this file",
+    ),  # noqa: B008
+    watch_changes: bool = typer.Option(
+        False,
+        "-w",
+        "--watch",
+        help="Re-render whenever the topology, its annotations or the theme change",
+    ),  # noqa: B008
 ) -> None:
     """Generate a topology diagram from a containerlab YAML or draw.io file."""
 
     configure_logging(level=log_level.to_int())
 
-    main(
-        input_file=str(input),
-        output_file=str(output) if output else None,
-        grafana=gf_dashboard,
-        theme=theme,
-        include_unlinked_nodes=include_unlinked_nodes,
-        no_links=no_links,
-        layout=layout.value,
-        log_level=log_level,
-        interactive=interactive,
-        grafana_config_path=str(grafana_config) if grafana_config else None,
-        grafana_interface_format=grafana_interface_format,
-        grafana_interface_selector=grafana_interface_selector,
-    )
+    options = {
+        "grafana": gf_dashboard,
+        "include_unlinked_nodes": include_unlinked_nodes,
+        "no_links": no_links,
+        "layout": layout.value,
+        "log_level": log_level,
+        "grafana_config_path": str(grafana_config) if grafana_config else None,
+        "grafana_interface_format": grafana_interface_format,
+        "grafana_interface_selector": grafana_interface_selector,
+        "stream": stream,
+        "compress": compress,
+        "external_icons": external_icons,
+        "icon_base_url": icon_base_url,
+        "incremental": incremental or layout_seed is not None,
+        "layout_seed": str(layout_seed) if layout_seed else None,
+        "pack_components": pack_components,
+        "layout_jobs": layout_jobs,
+        "layout_passes": layout_passes,
+        "layout_time_budget": layout_time_budget,
+        "layout_swap_passes": layout_swap_passes,
+        "metrics_file": str(metrics) if metrics else None,
+    }
+    output_file = str(output) if output else None
+
+    try:
+        if watch_changes:
+            if interactive:
+                logger.error("--watch cannot be combined with interactive mode.")
+                sys.exit(1)
+            try:
+                watch(str(input), output_file, theme, **options)
+            except KeyboardInterrupt:
+                logger.info("Stopped watching.")
+            return
+
+        main(
+            input_file=str(input),
+            output_file=output_file,
+            theme=theme,
+            interactive=interactive,
+            cache=None
+            if no_cache
+            else RenderCache(str(cache_dir) if cache_dir else None),
+            **options,
+        )
+    except Clab2DrawioError:
+        sys.exit(1)
 
 
 def main_cli() -> None:
@@ -0,0 +1,81 @@
+from array import array
+
+
+class CompactGraph:
+    """
+    Compact directed graph with integer node ids and CSR adjacency.
+
+    Node ``i`` has successors ``neighbors[offsets[i]:offsets[i + 1]]``. Both
+    arrays are typed ``array('l')`` buffers, so a graph costs a handful of
+    machine words per edge instead of the nested dicts of a networkx graph.
+    """
+
+    def __init__(self, names, offsets, neighbors):
+        """
+        :param names: List of node names, index is the node id.
+        :param offsets: CSR offsets array of length ``len(names) + 1``.
+        :param neighbors: CSR successor array of length ``offsets[-1]``.
+        """
+        self.names = names
+        self.offsets = offsets
+        self.neighbors = neighbors
+        self.ids = {name: i for i, name in enumerate(names)}
+
+    @classmethod
+    def from_nodes(cls, nodes):
+        """
+        Build the downstream link graph of the given nodes.
+
+        Every downstream link becomes an edge from its source to its target.
+        Links to nodes outside ``nodes`` are ignored.
+
+        :param nodes: Dictionary of node_name -> Node instances.
+        :return: CompactGraph instance.
+        """
+        names = list(nodes)
+        ids = {name: i for i, name in enumerate(names)}
+
+        offsets = array("l", [0])
+        neighbors = array("l")
+        for node in nodes.values():
+            for link in node.get_downstream_links():
+                target_id = ids.get(link.target.name)
+                if target_id is not None:
+                    neighbors.append(target_id)
+            offsets.append(len(neighbors))
+
+        return cls(names, offsets, neighbors)
+
+    @property
+    def num_nodes(self):
+        return len(self.names)
+
+    @property
+    def num_edges(self):
+        return len(self.neighbors)
+
+    def successors(self, node_id):
+        return self.neighbors[self.offsets[node_id] : self.offsets[node_id + 1]]
+
+    def in_degrees(self):
+        degrees = [0] * self.num_nodes
+        for target in self.neighbors:
+            degrees[target] += 1
+        return degrees
+
+    def to_networkx(self):
+        """
+        Convert to a networkx DiGraph for ad-hoc analysis.
+
+        networkx is imported lazily so it stays off the rendering path.
+
+        :return: networkx.DiGraph keyed by node name.
+        """
+        import networkx as nx
+
+        graph = nx.DiGraph()
+        graph.add_nodes_from(self.names)
+        for node_id, name in enumerate(self.names):
+            for target in self.successors(node_id):
+                graph.add_edge(name, self.names[target])
+        return graph
@@ -1,7 +1,7 @@
 import logging
-from collections import deque
 
-import networkx as nx
+from clab_io_draw.core.data.compact_graph import CompactGraph
+from clab_io_draw.core.data.level_engine import assign_levels
 
 logger = logging.getLogger(__name__)
 
@@ -9,8 +9,16 @@ logger = logging.getLogger(__name__)
 class GraphLevelManager:
     """
     Manages the graph level assignment for nodes in the diagram.
+
+    An instance remembers the levels computed for the last link graph, so
+    re-rendering a topology whose links did not change (watch mode) skips
+    the level computation.
     """
 
+    def __init__(self):
+        self._last_graph = None
+        self._last_levels = None
+
     def assign_graphlevels(
         self, diagram, verbose=False, skip_warnings=False, respect_fixed_positions=False
     ):
@@ -47,41 +55,12 @@ class GraphLevelManager:
                 "https://github.com/srl-labs/clab-io-draw/blob/main/docs/clab2drawio.md#influencing-node-placement"
             )
 
-        # Extract graph structure for level assignment
-        G = nx.DiGraph()
-        for node_name in nodes:
-            G.add_node(node_name)
-
-        for node in nodes.values():
-            for link in node.get_downstream_links():
-                G.add_edge(link.source.name, link.target.name)
-
-        # Find roots (nodes with no incoming edges)
-        roots = [n for n in G.nodes() if G.in_degree(n) == 0]
-
-        # If no roots identified, use all nodes as potential roots and prune after
-        if not roots:
-            paths_and_cycles = list(nx.simple_cycles(G))
-            if paths_and_cycles:
-                # If cycles are detected, use the first node in each cycle as a potential root
-                potential_roots = []
-                for cycle in paths_and_cycles:
-                    potential_roots.append(cycle[0])
-                    # Break the cycle by removing the last edge
-                    G.remove_edge(cycle[-1], cycle[0])
-                roots = potential_roots
-            else:
-                # If no clear cycles but also no roots, use all nodes as roots
-                roots = list(G.nodes())
-
-        # Assign levels using BFS from each root
-        levels = {}
-        for root in roots:
-            bfs_levels = self._bfs_levels(G, root)
-            # Update levels dict, keeping the minimum level for each node
-            for node, level in bfs_levels.items():
-                if node not in levels or level < levels[node]:
-                    levels[node] = level
+        # Extract graph structure for level assignment. Roots are one node per
+        # source component of the SCC condensation, which covers in-degree zero
+        # nodes as well as rings and full meshes. A single multi-source BFS then
+        # yields the minimum distance from any root.
+        graph = CompactGraph.from_nodes(nodes)
+        levels = self._levels_for(graph)
 
         # Update node levels in the diagram
         for node_name, level in levels.items():
@@ -130,25 +109,26 @@ class GraphLevelManager:
         if not (respect_fixed_positions and has_fixed_positions):
             self._normalize_levels(nodes)
 
-    def _bfs_levels(self, graph, start_node):
+    def _levels_for(self, graph):
         """
-        Perform BFS to assign levels to nodes.
+        Compute the BFS levels of graph, reusing the previous result when the
+        graph is identical.
 
-        :param graph: NetworkX DiGraph.
-        :param start_node: Root node to start BFS from.
-        :return: Dictionary mapping node names to their level.
+        :param graph: CompactGraph of the diagram.
+        :return: Dictionary of node_name -> level.
         """
-        visited = {start_node: 0}
-        queue = deque([(start_node, 0)])
-
-        while queue:
-            node, level = queue.popleft()
-            for neighbor in graph.neighbors(node):
-                if neighbor not in visited:
-                    visited[neighbor] = level + 1
-                    queue.append((neighbor, level + 1))
-
-        return visited
+        last = self._last_graph
+        if (
+            last is not None
+            and last.names == graph.names
+            and last.offsets == graph.offsets
+            and last.neighbors == graph.neighbors
+        ):
+            logger.debug("Link graph unchanged, reusing graph levels")
+            return self._last_levels
+        self._last_graph = graph
+        self._last_levels = assign_levels(graph)
+        return self._last_levels
 
     def _normalize_levels(self, nodes):
         """
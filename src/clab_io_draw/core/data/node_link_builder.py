@@ -1,6 +1,6 @@
 import logging
 
-from clab_io_draw.core.models.link import Link
+from clab_io_draw.core.models.link import Link, LinkStyle
 from clab_io_draw.core.models.node import Node
 
 logger = logging.getLogger(__name__)
@@ -146,6 +146,9 @@ class NodeLinkBuilder:
                         }
                     )
 
+        # One style object per theme, shared by every link
+        link_style = LinkStyle.from_styles(self.styles)
+
         links = []
         for link_data in links_from_clab:
             source_node = nodes.get(link_data["source"])
@@ -157,10 +160,7 @@ class NodeLinkBuilder:
                     target=target_node,
                     source_intf=link_data.get("source_intf", ""),
                     target_intf=link_data.get("target_intf", ""),
-                    base_style=self.styles.get("base_style", ""),
-                    link_style=self.styles.get("link_style", ""),
-                    src_label_style=self.styles.get("src_label_style", ""),
-                    trgt_label_style=self.styles.get("trgt_label_style", ""),
+                    style=link_style,
                     direction="downstream",
                 )
                 upstream_link = Link(
@@ -168,12 +168,12 @@ class NodeLinkBuilder:
                     target=source_node,
                     source_intf=link_data.get("target_intf", ""),
                     target_intf=link_data.get("source_intf", ""),
-                    base_style=self.styles.get("base_style", ""),
-                    link_style=self.styles.get("link_style", ""),
-                    src_label_style=self.styles.get("src_label_style", ""),
-                    trgt_label_style=self.styles.get("trgt_label_style", ""),
+                    style=link_style,
                     direction="upstream",
                 )
+                # Twins make reverse-link lookups O(1) for port generation
+                downstream_link.twin = upstream_link
+                upstream_link.twin = downstream_link
                 links.append(downstream_link)
                 links.append(upstream_link)
 
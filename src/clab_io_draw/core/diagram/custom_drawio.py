@@ -1,8 +1,11 @@
 import logging
+from xml.etree.ElementTree import Element, SubElement  # noqa: S405
 
 from defusedxml import ElementTree
 from N2G import drawio_diagram
 
+from clab_io_draw.core.utils.drawio_compression import deflate_diagram
+
 logger = logging.getLogger(__name__)
 
 
@@ -47,6 +50,70 @@ class CustomDrawioDiagram(drawio_diagram):
             node_duplicates=node_duplicates,
             link_duplicates=link_duplicates,
         )
+        # Per diagram: object id -> its mxCell element, and the set of link ids.
+        # N2G itself only keeps id lists and searches the tree with XPath.
+        self.object_index = {}
+        self.link_index = {}
+        # Write <diagram> payloads deflated and base64 encoded, like draw.io
+        # does with File > Properties > Compressed
+        self.compressed = False
+
+    def _objects(self):
+        return self.object_index.setdefault(self.current_diagram_id, {})
+
+    def _node_exists(self, id, **kwargs):
+        # Same duplicate handling as N2G, with a dict lookup instead of a list scan
+        if id not in self._objects():
+            return False
+        if self.node_duplicates == "log":
+            logger.error(f"add_node: node '{id}' already added to graph")
+        elif self.node_duplicates == "update":
+            self.update_node(id, **kwargs)
+        return True
+
+    def _link_exists(self, id, edge_tup):  # noqa: ARG002
+        link_ids = self.link_index.setdefault(self.current_diagram_id, set())
+        if id in link_ids:
+            if self.link_duplicates == "log":
+                logger.error(f"add_link: edge '{id}' already added to graph")
+            return True
+        link_ids.add(id)
+        self.edges_ids[self.current_diagram_id].append(id)
+        return None
+
+    def add_node(self, id, **kwargs):
+        """
+        Add a node through N2G and index its mxCell by object id.
+
+        :param id: Unique node identifier.
+        :param kwargs: Passed through to N2G's add_node.
+        """
+        objects = self._objects()
+        if id in objects:
+            super().add_node(id, **kwargs)
+            return
+        super().add_node(id, **kwargs)
+        element = self.current_root[-1]
+        if element.tag == "object" and element.get("id") == id:
+            objects[id] = element.find("./mxCell")
+
+    def index_objects(self):
+        """
+        Rebuild the object index of the current diagram in one pass over the tree.
+        """
+        objects = self._objects()
+        objects.clear()
+        for obj in self.current_root.iter("object"):
+            mxcell = obj.find("./mxCell")
+            if mxcell is not None:
+                objects.setdefault(obj.get("id"), mxcell)
+        return objects
+
+    def _find_object_cell(self, obj_id):
+        obj_mxcell = self._objects().get(obj_id)
+        if obj_mxcell is None:
+            obj_mxcell = self.current_root.find(f".//object[@id='{obj_id}']/mxCell")
+        return obj_mxcell
 
     def calculate_new_group_positions(self, obj_pos_old, group_pos):
         """
@@ -98,19 +165,12 @@ class CustomDrawioDiagram(drawio_diagram):
 
         # Calculate bounding box
         for obj_id in member_objects:
-            obj_mxcell = self.current_root.find(f".//object[@id='{obj_id}']/mxCell")
-            if obj_mxcell is not None:
-                geometry = obj_mxcell.find("./mxGeometry")
-                if geometry is not None:
-                    x, y = float(geometry.get("x", "0")), float(geometry.get("y", "0"))
-                    width, height = (
-                        float(geometry.get("width", "0")),
-                        float(geometry.get("height", "0")),
-                    )
-
-                    object_positions.append((obj_id, x, y, width, height))
-                    min_x, min_y = min(min_x, x), min(min_y, y)
-                    max_x, max_y = max(max_x, x + width), max(max_y, y + height)
+            member = self._member_geometry(obj_id)
+            if member is not None:
+                _, x, y, width, height = member
+                object_positions.append(member)
+                min_x, min_y = min(min_x, x), min(min_y, y)
+                max_x, max_y = max(max_x, x + width), max(max_y, y + height)
 
         group_x, group_y = min_x, min_y
         group_width, group_height = max_x - min_x, max_y - min_y
@@ -124,15 +184,89 @@ class CustomDrawioDiagram(drawio_diagram):
         self.current_root.append(group_cell)
 
         # Update positions of objects within group
-        for obj_id, x, y, _, _ in object_positions:
+        for handle, x, y, _, _ in object_positions:
             obj_pos_new = self.calculate_new_group_positions((x, y), (group_x, group_y))
-            obj_mxcell = self.current_root.find(f".//object[@id='{obj_id}']/mxCell")
-            if obj_mxcell is not None:
-                geometry = obj_mxcell.find("./mxGeometry")
-                if geometry is not None:
-                    geometry.set("x", str(obj_pos_new[0]))
-                    geometry.set("y", str(obj_pos_new[1]))
-                    obj_mxcell.set("parent", group_id)
+            self._move_member(handle, obj_pos_new, group_id)
+
+    def _member_geometry(self, obj_id):
+        """
+        Look up the geometry of an object that is about to be grouped.
+
+        :param obj_id: Object ID.
+        :return: (handle, x, y, width, height) or None if the object has no geometry.
+        """
+        obj_mxcell = self._find_object_cell(obj_id)
+        if obj_mxcell is None:
+            return None
+        geometry = obj_mxcell.find("./mxGeometry")
+        if geometry is None:
+            return None
+        return (
+            obj_mxcell,
+            float(geometry.get("x", "0")),
+            float(geometry.get("y", "0")),
+            float(geometry.get("width", "0")),
+            float(geometry.get("height", "0")),
+        )
+
+    def _move_member(self, handle, obj_pos_new, group_id):
+        """
+        Re-parent a grouped object and set its position relative to the group.
+
+        :param handle: Handle returned by _member_geometry.
+        :param obj_pos_new: (x,y) of the object inside the group.
+        :param group_id: ID of the new parent group.
+        """
+        geometry = handle.find("./mxGeometry")
+        geometry.set("x", str(obj_pos_new[0]))
+        geometry.set("y", str(obj_pos_new[1]))
+        handle.set("parent", group_id)
+
+    def group_nodes_bulk(self, groups, style=""):
+        """
+        Create many groups at once.
+
+        The object index is refreshed with a single pass over the tree, after
+        which every member lookup is a dictionary hit.
+
+        :param groups: Dict of group_id -> list of member object IDs.
+        :param style: Style string for the group cells.
+        """
+        self.index_objects()
+        for group_id, member_objects in groups.items():
+            self.group_nodes(member_objects, group_id, style=style)
+
+    def compressed_drawing(self, payloads):
+        """
+        Build an mxfile element whose pages carry compressed payloads.
+
+        :param payloads: Dict of diagram id -> text for that <diagram> element.
+        :return: New mxfile Element; the diagram tree itself is left untouched.
+        """
+        drawing = Element(self.drawing.tag, self.drawing.attrib)
+        drawing.set("compressed", "true")
+        drawing.text = self.drawing.text
+        for diagram in self.drawing.findall("./diagram"):
+            page = SubElement(drawing, "diagram", diagram.attrib)
+            page.text = payloads[diagram.attrib["id"]]
+            page.tail = diagram.tail
+        return drawing
+
+    def dump_xml(self):
+        """
+        Return the drawing XML, compressing the pages if self.compressed is set.
+        """
+        if not self.compressed:
+            return super().dump_xml()
+        payloads = {
+            diagram.attrib["id"]: deflate_diagram(
+                ElementTree.tostring(diagram.find("./mxGraphModel"), encoding="unicode")
+            )
+            for diagram in self.drawing.findall("./diagram")
+        }
+        return ElementTree.tostring(
+            self.compressed_drawing(payloads), encoding="unicode"
+        )
 
     def get_used_levels(self):
         return {node.graph_level for node in self.nodes.values()}
@@ -150,6 +284,17 @@ class CustomDrawioDiagram(drawio_diagram):
         return links
 
     def get_target_link(self, source_link):
+        """
+        Return the link describing the same connection from the other end.
+
+        Links built by NodeLinkBuilder know their twin, so this is constant
+        time; links without a twin fall back to a scan over all links.
+
+        :param source_link: Link to resolve.
+        :return: The reverse Link, or None if there is none.
+        """
+        if source_link.twin is not None:
+            return source_link.twin
         for link in self.get_links_from_nodes():
             if (
                 link.source == source_link.target
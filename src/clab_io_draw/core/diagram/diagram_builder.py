@@ -348,12 +348,11 @@ class DiagramBuilder:
                     )
 
         # Create groups for each node + connectors
-        for node_name, connector_ids in connector_dict.items():
-            group_id = f"group-{node_name}"
-            member_objects = connector_ids + [node_name]
-            diagram.group_nodes(
-                member_objects=member_objects, group_id=group_id, style="group"
-            )
+        groups = {
+            f"group-{node_name}": connector_ids + [node_name]
+            for node_name, connector_ids in connector_dict.items()
+        }
+        diagram.group_nodes_bulk(groups, style="group")
 
     def _determine_port_edge(self, node, target, layout):
         """
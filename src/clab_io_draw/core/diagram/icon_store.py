@@ -0,0 +1,79 @@
+import base64
+import binascii
+import hashlib
+import logging
+import os
+import re
+
+logger = logging.getLogger(__name__)
+
+# draw.io embeds images as image=data:<mime>,<base64>; the ";base64" marker is
+# left out because ";" separates style properties.
+_IMAGE_DATA = re.compile(r"image=data:image/([\w.+-]+),([^;]*)")
+_EXTENSIONS = {"svg+xml": "svg", "jpeg": "jpg"}
+
+
+class IconStore:
+    """
+    Moves images embedded in style strings into files that cells reference.
+
+    Each distinct image is written once, named after its content hash, and
+    every style that embedded it gets an image=<base_url><file> reference
+    instead. Styles are rewritten once per distinct string, so the work
+    scales with the number of icons in the theme, not with node count.
+    """
+
+    def __init__(self, directory, base_url=None):
+        """
+        :param directory: Folder the image files are written to.
+        :param base_url: Prefix used to reference the files from the diagram.
+                         Defaults to the folder name, relative to the diagram.
+        """
+        self.directory = directory
+        if base_url is None:
+            base_url = os.path.basename(os.path.normpath(directory))
+        self.base_url = base_url if base_url.endswith("/") else base_url + "/"
+        self.files = {}
+        self._styles = {}
+
+    def externalize(self, style):
+        """
+        Return style with embedded images replaced by file references.
+
+        :param style: draw.io style string.
+        :return: Rewritten style string.
+        """
+        if style not in self._styles:
+            self._styles[style] = _IMAGE_DATA.sub(self._replace_image, style)
+        return self._styles[style]
+
+    def externalize_styles(self, styles):
+        """
+        Rewrite the node styles of a loaded theme in place.
+
+        :param styles: Styles dictionary from ThemeManager.
+        """
+        styles["base_style"] = self.externalize(styles["base_style"])
+        styles["custom_styles"] = {
+            name: self.externalize(style)
+            for name, style in styles["custom_styles"].items()
+        }
+        logger.debug(f"Externalized {len(self.files)} icon(s) to {self.directory}")
+
+    def _replace_image(self, match):
+        mime, payload = match.group(1), match.group(2)
+        try:
+            data = base64.b64decode(payload, validate=True)
+        except binascii.Error:
+            logger.warning("Keeping embedded image that is not valid base64")
+            return match.group(0)
+
+        extension = _EXTENSIONS.get(mime, mime)
+        filename = f"{hashlib.sha256(data).hexdigest()[:16]}.{extension}"
+        if filename not in self.files:
+            os.makedirs(self.directory, exist_ok=True)
+            path = os.path.join(self.directory, filename)
+            with open(path, "wb") as f:
+                f.write(data)
+            self.files[filename] = path
+        return f"image={self.base_url}{filename}"
@@ -0,0 +1,264 @@
+import io
+import logging
+import os
+import re
+import tempfile
+import time
+from array import array
+from xml.etree.ElementTree import SubElement, tostring  # noqa: S405
+from xml.sax.saxutils import escape
+
+from N2G import drawio_diagram
+
+from clab_io_draw.core.diagram.custom_drawio import CustomDrawioDiagram
+from clab_io_draw.core.utils.drawio_compression import DeflateWriter
+
+logger = logging.getLogger(__name__)
+
+# Spooled vertex attributes that grouping may still rewrite are written as
+# \x00<kind><slot>\x01<original value>\x00. NUL never occurs in XML output.
+_MARKER = re.compile("\x00([PXY])(\\d+)\x01([^\x00]*)\x00")
+_ATTRIB_ENTITIES = {'"': "&quot;", "\n": "&#10;", "\r": "&#13;", "\t": "&#09;"}
+_SENTINEL_TAG = "clab-io-draw-cells"
+_SENTINEL = re.compile(f'<{_SENTINEL_TAG} id="([^"]*)" />')
+
+
+class CellSpool:
+    """
+    Stand-in for a diagram's <root> element that serializes cells on append.
+
+    Every appended element is written to a temporary file right away, so the
+    cells of a page never accumulate in memory. Only the geometry of vertex
+    objects is kept, as four doubles per object, so that grouping can still
+    compute bounding boxes and move members after they have been written.
+    """
+
+    def __init__(self, objects):
+        self.objects = objects
+        self.geometry = array("d")
+        self.moves = {}
+        self.file = tempfile.TemporaryFile("w+", encoding="utf-8", newline="")  # noqa: SIM115
+
+    def append(self, element):
+        """
+        Serialize an element produced by N2G or CustomDrawioDiagram.
+
+        :param element: Element that would have been appended to <root>.
+        """
+        mxcell = element.find("./mxCell") if element.tag == "object" else None
+        if mxcell is not None and mxcell.get("vertex") == "1":
+            self._track_vertex(element.get("id"), mxcell)
+        self.file.write(tostring(element, encoding="unicode"))
+
+    def _track_vertex(self, obj_id, mxcell):
+        geometry = mxcell.find("./mxGeometry")
+        if geometry is None or "x" not in geometry.attrib or "y" not in geometry.attrib:
+            return
+        try:
+            values = (
+                float(geometry.get("x")),
+                float(geometry.get("y")),
+                float(geometry.get("width", "0")),
+                float(geometry.get("height", "0")),
+            )
+        except ValueError:
+            return
+        slot = len(self.geometry) // 4
+        self.geometry.extend(values)
+        self.objects.setdefault(obj_id, slot)
+        mxcell.set("parent", f"\x00P{slot}\x01{mxcell.get('parent', '')}\x00")
+        geometry.set("x", f"\x00X{slot}\x01{geometry.get('x')}\x00")
+        geometry.set("y", f"\x00Y{slot}\x01{geometry.get('y')}\x00")
+
+    def member_geometry(self, slot):
+        offset = slot * 4
+        return tuple(self.geometry[offset : offset + 4])
+
+    def move(self, slot, obj_pos_new, group_id):
+        """
+        Record that a spooled vertex now lives inside a group.
+
+        :param slot: Geometry slot of the vertex.
+        :param obj_pos_new: (x,y) of the vertex inside the group.
+        :param group_id: ID of the new parent group.
+        """
+        self.geometry[slot * 4] = obj_pos_new[0]
+        self.geometry[slot * 4 + 1] = obj_pos_new[1]
+        self.moves[slot] = (
+            escape(group_id, _ATTRIB_ENTITIES),
+            str(obj_pos_new[0]),
+            str(obj_pos_new[1]),
+        )
+
+    def _patch(self, match):
+        move = self.moves.get(int(match.group(2)))
+        if move is None:
+            return match.group(3)
+        return move["PXY".index(match.group(1))]
+
+    def write_to(self, outfile):
+        """
+        Copy the spooled cells to outfile, applying group moves.
+
+        :param outfile: Writable text file.
+        """
+        self.file.flush()
+        self.file.seek(0)
+        for line in self.file:
+            if "\x00" in line:
+                line = _MARKER.sub(self._patch, line)
+            outfile.write(line)
+        self.file.seek(0, os.SEEK_END)
+
+    def close(self):
+        self.file.close()
+
+
+class StreamingDrawioDiagram(CustomDrawioDiagram):
+    """
+    CustomDrawioDiagram that spools cells to disk instead of building them
+    into the ElementTree.
+
+    Only the page skeleton (mxfile, diagram, mxGraphModel and the two root
+    cells) stays in memory. dump_file writes the same XML, byte for byte, as
+    CustomDrawioDiagram would for the same sequence of calls.
+
+    Cells cannot be looked up or edited once added, so update_node and
+    node_duplicates="update" raise ValueError. Use the diagram as a context
+    manager, or call close(), to release the temporary files.
+    """
+
+    def __init__(self, styles=None, node_duplicates="skip", link_duplicates="skip"):
+        if node_duplicates == "update":
+            raise ValueError("StreamingDrawioDiagram cannot update written nodes")
+        self.spools = {}
+        super().__init__(
+            styles=styles,
+            node_duplicates=node_duplicates,
+            link_duplicates=link_duplicates,
+        )
+
+    def go_to_diagram(self, diagram_name=None, diagram_index=None):
+        super().go_to_diagram(diagram_name=diagram_name, diagram_index=diagram_index)
+        spool = self.spools.get(self.current_diagram_id)
+        if spool is None:
+            spool = CellSpool(self._objects())
+            self.spools[self.current_diagram_id] = spool
+        self.current_root = spool
+
+    def update_style(self, styles):
+        super().update_style(styles)
+        # update_style starts a new drawing, so spooled pages are gone as well
+        self.close()
+        self.object_index = {}
+        self.link_index = {}
+
+    def add_node(self, id, **kwargs):
+        # The spool indexes vertex objects itself while writing them
+        drawio_diagram.add_node(self, id, **kwargs)
+
+    def update_node(self, id, **kwargs):  # noqa: ARG002
+        raise ValueError("StreamingDrawioDiagram cannot update written nodes")
+
+    def index_objects(self):
+        return self._objects()
+
+    def _find_object_cell(self, obj_id):  # noqa: ARG002
+        raise ValueError("StreamingDrawioDiagram cannot look up written cells")
+
+    def _member_geometry(self, obj_id):
+        slot = self._objects().get(obj_id)
+        if slot is None:
+            return None
+        return (slot, *self.current_root.member_geometry(slot))
+
+    def _move_member(self, handle, obj_pos_new, group_id):
+        self.current_root.move(handle, obj_pos_new, group_id)
+
+    def write(self, outfile):
+        """
+        Write the whole drawing to an open text file.
+
+        :param outfile: Writable text file.
+        """
+        diagrams = self.drawing.findall("./diagram")
+        if not self.compressed:
+            self._write_with_cells(self.drawing, diagrams, outfile)
+            return
+
+        # Each page payload is deflated while its cells stream through
+        drawing = self.compressed_drawing(
+            {
+                diagram.attrib["id"]: f"\x00{index}\x00"
+                for index, diagram in enumerate(diagrams)
+            }
+        )
+        parts = tostring(drawing, encoding="unicode").split("\x00")
+        outfile.write(parts[0])
+        for index in range(1, len(parts), 2):
+            diagram = diagrams[int(parts[index])]
+            writer = DeflateWriter(outfile)
+            self._write_with_cells(diagram.find("./mxGraphModel"), [diagram], writer)
+            writer.close()
+            outfile.write(parts[index + 1])
+
+    def _write_with_cells(self, element, diagrams, outfile):
+        """
+        Serialize element with the spooled cells of diagrams spliced into their roots.
+
+        :param element: Element to serialize, containing the roots of diagrams.
+        :param diagrams: <diagram> elements whose cells belong into element.
+        :param outfile: Writable text file.
+        """
+        sentinels = []
+        for diagram in diagrams:
+            root = diagram.find("./mxGraphModel/root")
+            sentinels.append(
+                (root, SubElement(root, _SENTINEL_TAG, id=diagram.attrib["id"]))
+            )
+        try:
+            skeleton = tostring(element, encoding="unicode")
+        finally:
+            for root, sentinel in sentinels:
+                root.remove(sentinel)
+
+        parts = _SENTINEL.split(skeleton)
+        outfile.write(parts[0])
+        for index in range(1, len(parts), 2):
+            spool = self.spools.get(parts[index])
+            if spool is not None:
+                spool.write_to(outfile)
+            outfile.write(parts[index + 1])
+
+    def dump_xml(self):
+        buffer = io.StringIO()
+        self.write(buffer)
+        return buffer.getvalue()
+
+    def dump_file(self, filename=None, folder="./Output/"):
+        """
+        Save the diagram in a .drawio file, streaming the spooled cells.
+
+        :param filename: Name of the file to save the diagram into.
+        :param folder: Folder to save the diagram file into.
+        """
+        os.makedirs(folder, exist_ok=True)
+        if not filename:
+            ctime = time.ctime().replace(":", "-")
+            filename = f"{ctime}_output.drawio"
+        with open(os.path.join(folder, filename), "w") as outfile:
+            self.write(outfile)
+
+    def close(self):
+        """
+        Release the temporary files backing the spooled pages.
+        """
+        for spool in self.spools.values():
+            spool.close()
+        self.spools = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
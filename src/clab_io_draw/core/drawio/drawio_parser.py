@@ -1,11 +1,200 @@
+import io
 import logging
 import sys
 
-from defusedxml import ElementTree
+from defusedxml import DefusedXmlException, ElementTree
+
+from clab_io_draw.core.utils.drawio_compression import inflate_diagram
 
 logger = logging.getLogger(__name__)
 
 
+class _ModelScanner:
+    """
+    Classifies the cells of one mxGraphModel <root> as they are parsed.
+
+    Only what ends up in node_details/links_info is kept: node attributes,
+    one small record per edge and per label cell. The records are resolved in
+    result() with the same precedence and ordering as the XPath based
+    extract_nodes/extract_links/extract_link_labels.
+    """
+
+    def __init__(self):
+        self.object_nodes = {}
+        self.cell_nodes = []
+        self.cell_links = []
+        self.object_links = []
+        self.labels = []
+        self.open_objects = []
+        self.object_count = 0
+        self.cell_count = 0
+
+    def start(self, elem):
+        if elem.tag == "object":
+            self.open_objects.append((self.object_count, elem.get("id")))
+            self.object_count += 1
+
+    def end(self, elem):
+        if elem.tag == "mxCell":
+            self._cell(elem)
+        elif elem.tag == "object":
+            self._object(elem)
+            self.open_objects.pop()
+
+    def _object(self, obj):
+        node_label = obj.get("label", "").strip()
+        if node_label:
+            self.object_nodes[obj.get("id")] = {
+                "label": node_label,
+                "type": obj.get("type", None),
+                "mgmt-ipv4": obj.get("mgmt-ipv4", None),
+                "group": obj.get("group", None),
+                "labels": obj.get("labels", None),
+                "kind": obj.get("kind", "nokia_srlinux"),
+            }
+
+    def _cell(self, mxCell):
+        cell_id = mxCell.get("id")
+        attrib = mxCell.attrib
+        geometry = mxCell.find("mxGeometry")
+
+        if mxCell.get("vertex") == "1":
+            node_label = mxCell.get("value", "").strip()
+            if "image=data" in mxCell.get("style", "") and node_label:
+                self.cell_nodes.append(
+                    (cell_id, {"label": node_label, "kind": "nokia_srlinux"})
+                )
+
+        if "source" in attrib and "target" in attrib and "edge" in attrib:
+            x, y = (
+                (float(geometry.get("x", 0)), float(geometry.get("y", 0)))
+                if geometry is not None
+                else (None, None)
+            )
+            record = (mxCell.get("source"), mxCell.get("target"), x, y)
+            if cell_id:
+                self.cell_links.append((cell_id, record))
+                # Only the innermost object's visit of an id can be the last one
+                enclosing = self.open_objects[-1:]
+            else:
+                # extract_links visits edges again per enclosing object
+                enclosing = self.open_objects
+            for object_order, object_id in enclosing:
+                link_id = cell_id or object_id
+                if link_id:
+                    self.object_links.append(
+                        (object_order, self.cell_count, link_id, record)
+                    )
+
+        label_value = mxCell.get("value")
+        if label_value and geometry is not None:
+            self.labels.append(
+                (
+                    mxCell.get("parent"),
+                    label_value,
+                    float(geometry.get("x", 0)),
+                    float(geometry.get("y", 0)),
+                )
+            )
+        self.cell_count += 1
+
+    def result(self):
+        """
+        :return: (node_details, links_info) as built by the XPath extractors.
+        """
+        node_details = dict(self.object_nodes)
+        for node_id, details in self.cell_nodes:
+            if node_id not in node_details:
+                node_details[node_id] = details
+
+        links_info = {}
+        self.object_links.sort(key=lambda entry: (entry[0], entry[1]))
+        for link_id, (source_id, target_id, x, y) in self.cell_links + [
+            (link_id, record) for _, _, link_id, record in self.object_links
+        ]:
+            links_info[link_id] = {
+                "id": link_id,
+                "source": node_details.get(source_id, {}).get("label", "Unknown"),
+                "target": node_details.get(target_id, {}).get("label", "Unknown"),
+                "geometry": {"x": x, "y": y},
+                "labels": [],
+            }
+
+        for parent_id, label_value, x_position, y_position in self.labels:
+            if parent_id in links_info:
+                links_info[parent_id]["labels"].append(
+                    {
+                        "value": label_value,
+                        "x_position": x_position,
+                        "y_position": y_position,
+                    }
+                )
+        return node_details, links_info
+
+
+class _ModelIndex:
+    """
+    Edge and label lookups for an in-memory mxGraphModel, built in one walk.
+
+    edges maps link_id -> mxCell as extract_links has always resolved them:
+    every edge cell with an id, then every edge wrapped in an object, per
+    enclosing object in document order, the last visit of an id winning.
+    labels_by_parent maps a parent id to its mxCell[@value] descendants in
+    document order.
+    """
+
+    def __init__(self, mxGraphModel):
+        self.model = mxGraphModel
+        self.labels_by_parent = {}
+        cell_edges = []
+        object_edges = []
+        open_objects = []
+        object_count = 0
+        cell_count = 0
+
+        # Pre-order walk, i.e. document order, tracking the enclosing objects
+        stack = [(mxGraphModel, iter(mxGraphModel))]
+        while stack:
+            elem = next(stack[-1][1], None)
+            if elem is None:
+                if stack.pop()[0].tag == "object":
+                    open_objects.pop()
+                continue
+            stack.append((elem, iter(elem)))
+
+            if elem.tag == "object":
+                open_objects.append((object_count, elem.get("id")))
+                object_count += 1
+            elif elem.tag == "mxCell":
+                attrib = elem.attrib
+                cell_id = attrib.get("id")
+                if "source" in attrib and "target" in attrib and "edge" in attrib:
+                    if cell_id:
+                        cell_edges.append((cell_id, elem))
+                        # Only the innermost object's visit can be the last one
+                        enclosing = open_objects[-1:]
+                    else:
+                        enclosing = open_objects
+                    for object_order, object_id in enclosing:
+                        link_id = cell_id or object_id
+                        if link_id:
+                            object_edges.append(
+                                (object_order, cell_count, link_id, elem)
+                            )
+                if "value" in attrib:
+                    self.labels_by_parent.setdefault(attrib.get("parent"), []).append(
+                        elem
+                    )
+                cell_count += 1
+
+        # Later visits of a link id overwrite earlier ones but keep their
+        # position, exactly like repeated assignments into links_info
+        object_edges.sort(key=lambda entry: (entry[0], entry[1]))
+        self.edges = dict(cell_edges)
+        for _, _, link_id, mxCell in object_edges:
+            self.edges[link_id] = mxCell
+
+
 class DrawioParser:
     """
     Parses draw.io XML files to extract node and link information.
@@ -14,11 +203,28 @@ class DrawioParser:
     def __init__(self, input_file, diagram_name=None):
         self.input_file = input_file
         self.diagram_name = diagram_name
+        self._model_index = None
+
+    def model_index(self, mxGraphModel):
+        """
+        Return the edge/label index of mxGraphModel, building it on first use.
+
+        extract_links and extract_link_labels share the index, so the model
+        is walked once for both.
+
+        :param mxGraphModel: Root element of mxGraphModel.
+        :return: _ModelIndex instance.
+        """
+        if self._model_index is None or self._model_index.model is not mxGraphModel:
+            self._model_index = _ModelIndex(mxGraphModel)
+        return self._model_index
 
     def parse_xml(self):
         """
         Parse the input draw.io (XML) file and return the root of mxGraphModel.
 
+        Compressed diagrams are inflated transparently.
+
         :return: mxGraphModel root element.
         """
         logger.debug(f"Parsing drawio XML from file: {self.input_file}")
@@ -35,7 +241,7 @@ class DrawioParser:
         if self.diagram_name:
             for diagram in root.findall("diagram"):
                 if diagram.get("name") == self.diagram_name:
-                    mxGraphModel_root = diagram.find(".//mxGraphModel/root")
+                    mxGraphModel_root = self._diagram_root(diagram)
                     if mxGraphModel_root is not None:
                         return mxGraphModel_root
                     logger.error(
@@ -47,7 +253,7 @@ class DrawioParser:
         else:
             first_diagram = root.find("diagram")
             if first_diagram is not None:
-                mxGraphModel_root = first_diagram.find(".//mxGraphModel/root")
+                mxGraphModel_root = self._diagram_root(first_diagram)
                 if mxGraphModel_root is not None:
                     return mxGraphModel_root
                 logger.error("mxGraphModel/root not found in the first diagram.")
@@ -55,6 +261,196 @@ class DrawioParser:
             logger.error("No diagrams found in the file.")
             sys.exit(1)
 
+    def _diagram_root(self, diagram):
+        mxGraphModel_root = diagram.find(".//mxGraphModel/root")
+        payload = (diagram.text or "").strip()
+        if mxGraphModel_root is None and payload:
+            try:
+                model = ElementTree.fromstring(self._inflate(payload))
+            except (ElementTree.ParseError, DefusedXmlException) as e:
+                logger.error(f"Error loading compressed diagram: {e}")
+                sys.exit(1)
+            if model.tag == "mxGraphModel":
+                mxGraphModel_root = model.find("./root")
+            else:
+                mxGraphModel_root = model.find(".//mxGraphModel/root")
+        return mxGraphModel_root
+
+    @staticmethod
+    def _inflate(payload):
+        try:
+            return inflate_diagram(payload)
+        except ValueError as e:
+            logger.error(f"Error decoding compressed diagram: {e}")
+            sys.exit(1)
+
+    def parse(self):
+        """
+        Parse the input file in a single streaming pass.
+
+        Equivalent to parse_xml followed by extract_nodes, extract_links and
+        extract_link_labels, but cells are classified while iterparse reads
+        them and are freed right after, so memory does not grow with the
+        size of the drawing. Parsing stops at the end of the selected diagram.
+
+        :return: (node_details, links_info)
+        """
+        logger.debug(f"Streaming drawio XML from file: {self.input_file}")
+        try:
+            return self._scan(
+                ElementTree.iterparse(self.input_file, events=("start", "end"))
+            )
+        except FileNotFoundError:
+            logger.error(f"Input file '{self.input_file}' does not exist.")
+            sys.exit(1)
+        except (ElementTree.ParseError, DefusedXmlException) as e:
+            logger.error(f"Error loading drawio file: {e}")
+            sys.exit(1)
+
+    def _scan(self, events):
+        stack = []
+        diagram = None
+
+        for event, elem in events:
+            if event == "start":
+                stack.append(elem)
+                if diagram is None:
+                    if (
+                        len(stack) == 2
+                        and elem.tag == "diagram"
+                        and (
+                            not self.diagram_name
+                            or elem.get("name") == self.diagram_name
+                        )
+                    ):
+                        diagram = elem
+                elif (
+                    elem.tag == "root"
+                    and stack[-2].tag == "mxGraphModel"
+                    and diagram in stack
+                ):
+                    return self._collect(events, stack)
+                continue
+
+            stack.pop()
+            if elem is diagram:
+                payload = (diagram.text or "").strip()
+                if payload:
+                    result = self.parse_page(payload)
+                    if result is not None:
+                        return result
+                break
+            if len(stack) == 1:
+                stack[0].clear()
+
+        if diagram is not None:
+            where = (
+                f"diagram '{self.diagram_name}'"
+                if self.diagram_name
+                else "the first diagram"
+            )
+            logger.error(f"mxGraphModel/root not found in {where}.")
+        elif self.diagram_name:
+            logger.error(f"Diagram named '{self.diagram_name}' not found.")
+        else:
+            logger.error("No diagrams found in the file.")
+        sys.exit(1)
+
+    @staticmethod
+    def _collect(events, stack):
+        """
+        Feed the cells of the <root> element on top of stack to a _ModelScanner.
+
+        :param events: iterparse event iterator positioned after <root> started.
+        :param stack: Open elements, ending with <root>.
+        :return: (node_details, links_info)
+        """
+        scope_depth = len(stack)
+        scanner = _ModelScanner()
+        for event, elem in events:
+            if event == "start":
+                stack.append(elem)
+                scanner.start(elem)
+                continue
+            stack.pop()
+            if len(stack) < scope_depth:
+                break
+            scanner.end(elem)
+            if len(stack) == scope_depth:
+                # Direct child of <root> is done, drop it from the tree
+                stack[-1].clear()
+        return scanner.result()
+
+    @classmethod
+    def parse_page(cls, data):
+        """
+        Parse a single page as returned by iter_pages.
+
+        :param data: Serialized mxGraphModel, or a compressed diagram payload.
+        :return: (node_details, links_info), or None if the page has no
+                 mxGraphModel root.
+        """
+        if not data.lstrip().startswith("<"):
+            data = cls._inflate(data)
+        stack = []
+        try:
+            events = ElementTree.iterparse(io.StringIO(data), events=("start", "end"))
+            for event, elem in events:
+                if event == "end":
+                    stack.pop()
+                    continue
+                stack.append(elem)
+                if (
+                    elem.tag == "root"
+                    and len(stack) > 1
+                    and stack[-2].tag == "mxGraphModel"
+                ):
+                    return cls._collect(events, stack)
+        except (ElementTree.ParseError, DefusedXmlException) as e:
+            logger.error(f"Error loading diagram page: {e}")
+            sys.exit(1)
+        return None
+
+    def iter_pages(self):
+        """
+        Yield every page of the input file without keeping other pages around.
+
+        :return: Iterator of (page name, page data) where page data is either the
+                 serialized mxGraphModel or the compressed payload; pass it to
+                 parse_page.
+        """
+        logger.debug(f"Reading pages from file: {self.input_file}")
+        stack = []
+        found = False
+        try:
+            for event, elem in ElementTree.iterparse(
+                self.input_file, events=("start", "end")
+            ):
+                if event == "start":
+                    stack.append(elem)
+                    continue
+                stack.pop()
+                if len(stack) != 1:
+                    continue
+                if elem.tag == "diagram":
+                    found = True
+                    model = elem.find(".//mxGraphModel")
+                    if model is not None:
+                        data = ElementTree.tostring(model, encoding="unicode")
+                    else:
+                        data = (elem.text or "").strip()
+                    yield elem.get("name") or elem.get("id", ""), data
+                stack[0].clear()
+        except FileNotFoundError:
+            logger.error(f"Input file '{self.input_file}' does not exist.")
+            sys.exit(1)
+        except (ElementTree.ParseError, DefusedXmlException) as e:
+            logger.error(f"Error loading drawio file: {e}")
+            sys.exit(1)
+        if not found:
+            logger.error("No diagrams found in the file.")
+            sys.exit(1)
+
     def extract_nodes(self, mxGraphModel):
         """
         Extract node details from mxGraphModel.
@@ -110,20 +506,13 @@ class DrawioParser:
         logger.debug("Extracting links from drawio model...")
         links_info = {}
 
-        for mxCell in mxGraphModel.findall(".//mxCell[@source][@target][@edge]"):
-            link_info = self._extract_link_info(mxCell, node_details)
+        for link_id, mxCell in self.model_index(mxGraphModel).edges.items():
+            link_info = self._extract_link_info(
+                mxCell, node_details, fallback_id=link_id
+            )
             if link_info:
                 links_info[link_info["id"]] = link_info
 
-        for object_elem in mxGraphModel.findall(".//object"):
-            mxCells = object_elem.findall(".//mxCell[@source][@target][@edge]")
-            for mxC in mxCells:
-                link_info = self._extract_link_info(
-                    mxC, node_details, fallback_id=object_elem.get("id")
-                )
-                if link_info:
-                    links_info[link_info["id"]] = link_info
-
         return links_info
 
     def _extract_link_info(self, mxCell, node_details, fallback_id=None):
@@ -165,15 +554,15 @@ class DrawioParser:
         :param links_info: Dict of link_id->link info
         """
         logger.debug("Extracting link labels from drawio model...")
-        for mxCell in mxGraphModel.findall(".//mxCell[@value]"):
-            parent_id = mxCell.get("parent")
-            if parent_id in links_info:
+        labels_by_parent = self.model_index(mxGraphModel).labels_by_parent
+        for parent_id, link_info in links_info.items():
+            for mxCell in labels_by_parent.get(parent_id, ()):
                 label_value = mxCell.get("value")
                 geometry = mxCell.find("mxGeometry")
                 if label_value and geometry is not None:
                     x_position = float(geometry.get("x", 0))
                     y_position = float(geometry.get("y", 0))
-                    links_info[parent_id]["labels"].append(
+                    link_info["labels"].append(
                         {
                             "value": label_value,
                             "x_position": x_position,
@@ -0,0 +1,358 @@
+import logging
+import time
+from bisect import bisect_left, bisect_right, insort
+
+from clab_io_draw.core.layout.crossing_reduction import crossing_counter
+from clab_io_draw.core.layout.span_index import SpanIndex
+
+logger = logging.getLogger(__name__)
+
+# Down and up sweep pairs run by the barycenter layouts unless told otherwise
+DEFAULT_PASSES = 4
+# Largest position change, in pixels, of a pass that counts as converged
+_STABLE_TOLERANCE = 1e-6
+
+
+def numpy_available():
+    """
+    :return: True if the optional NumPy dependency can be imported.
+    """
+    try:
+        import numpy  # noqa: F401, PLC0415
+    except ImportError:
+        return False
+    return True
+
+
+def resolve_engine(engine):
+    """
+    Pick the barycenter engine for a layout.
+
+    :param engine: "numpy", "python", or None to use NumPy when installed.
+    :return: "numpy" or "python".
+    :raises ValueError: If engine is unknown, or "numpy" without NumPy.
+    """
+    if engine is None:
+        return "numpy" if numpy_available() else "python"
+    if engine not in ("numpy", "python"):
+        raise ValueError(f"Unknown layout engine '{engine}'")
+    if engine == "numpy" and not numpy_available():
+        raise ValueError(
+            "The numpy layout engine needs NumPy: pip install 'clab-io-draw[fast]'"
+        )
+    return engine
+
+
+def level_shape(levels):
+    """
+    Positions relative to the first one, flattened.
+
+    A sweep pass treats the drawing the same wherever it sits, so a pass
+    that only shifts every node by the same amount has converged.
+
+    :param levels: Iterable of position lists, one per level.
+    :return: List of positions minus the first position.
+    """
+    shape = [p for positions in levels for p in positions]
+    return [p - shape[0] for p in shape] if shape else shape
+
+
+def sweep_until_stable(sweep, snapshot, max_passes, time_budget=None, crossings=None):
+    """
+    Repeat a barycenter sweep pass until it stops changing the drawing, or
+    until the link crossings stop decreasing.
+
+    :param sweep: Callable running one down and up sweep pass.
+    :param snapshot: Callable returning the level_shape() of all positions.
+    :param max_passes: Upper bound on the passes.
+    :param time_budget: Seconds after which no further pass is started,
+                        None for no limit. The first pass always runs.
+    :param crossings: Callable returning the level crossings at the current
+                      positions, see crossing_counter(). None only stops on
+                      stable positions.
+    :return: Number of passes run.
+    """
+    deadline = None if time_budget is None else time.monotonic() + time_budget
+    previous = snapshot()
+    fewest = None
+    for passes in range(1, max_passes + 1):
+        sweep()
+        current = snapshot()
+        if len(current) == len(previous) and all(
+            abs(a - b) <= _STABLE_TOLERANCE
+            for a, b in zip(current, previous, strict=True)
+        ):
+            logger.debug(f"Barycenter sweeps converged after {passes} pass(es)")
+            return passes
+        previous = current
+        if crossings is not None:
+            count = crossings()
+            if fewest is not None and count >= fewest:
+                logger.debug(
+                    f"Barycenter sweeps stopped after {passes} pass(es) "
+                    f"at {count} crossings"
+                )
+                return passes
+            fewest = count
+        if deadline is not None and time.monotonic() >= deadline:
+            logger.debug(f"Barycenter time budget used up after {passes} pass(es)")
+            return passes
+    return max_passes
+
+
+class BarycenterEngine:
+    """
+    NumPy implementation of the iterative barycenter sweeps shared by the
+    vertical and horizontal layouts.
+
+    Node positions along the level axis live in one array and the links of
+    each level are kept as a sparse weight matrix, so the barycenters of a
+    whole level are computed in one vectorized operation. Each node then
+    picks the free slot nearest to its barycenter by bisection in the
+    sorted list of slots still valid, instead of testing every slot. Placement rules,
+    processing order and tie-breaking are those of the pure Python loop,
+    so both produce the same positions.
+    """
+
+    def __init__(self, nodes_by_level, axis, padding, link_weight):
+        """
+        :param nodes_by_level: Dictionary of graph level -> list of Nodes,
+                               with initial positions set.
+        :param axis: Node attribute holding the position within a level
+                     ("pos_x" for vertical, "pos_y" for horizontal layouts).
+        :param padding: Distance between neighboring nodes of a level.
+        :param link_weight: Function (node, neighbor) -> weight of the
+                            neighbor in the node's barycenter, the one of
+                            the calling layout.
+        """
+        import numpy as np  # noqa: PLC0415
+
+        self.np = np
+        self.axis = axis
+        self.padding = float(padding)
+
+        self.levels = [nodes_by_level[level] for level in sorted(nodes_by_level)]
+        self.nodes = [node for level_nodes in self.levels for node in level_nodes]
+        index = {id(node): i for i, node in enumerate(self.nodes)}
+        self.pos = np.array([float(getattr(n, axis)) for n in self.nodes])
+
+        level_of = {}
+        for level_id, level_nodes in enumerate(self.levels):
+            for node in level_nodes:
+                level_of[id(node)] = level_id
+
+        # Neighbors in get_neighbors() order with their weights. Links to
+        # other levels go into one weight matrix per level; nodes with
+        # same-level neighbors, which move while their level is placed, get
+        # their barycenter recomputed when their turn comes.
+        self.neighbors = [None] * len(self.nodes)
+        self.same_level = [None] * len(self.nodes)
+        self.level_data = []
+        offset = 0
+        for level_id, level_nodes in enumerate(self.levels):
+            rows, cols, weights = [], [], []
+            degree = np.zeros(len(level_nodes))
+            for local, node in enumerate(level_nodes):
+                i = offset + local
+                neighbors = []
+                for nbr in node.get_neighbors():
+                    j = index.get(id(nbr))
+                    if j is None:
+                        continue
+                    weight = link_weight(node, nbr)
+                    neighbors.append((j, weight))
+                    rows.append(local)
+                    cols.append(j)
+                    weights.append(weight)
+                    if level_of[id(nbr)] == level_id:
+                        self.same_level[i] = self.same_level[i] or set()
+                        self.same_level[i].add(j)
+                self.neighbors[i] = neighbors
+                degree[local] = sum(weight for _, weight in neighbors)
+
+            # Placement order: most connected first, ties in level order
+            order = sorted(
+                range(offset, offset + len(level_nodes)),
+                key=lambda i: len(self.nodes[i].get_neighbors()),
+                reverse=True,
+            )
+            self.level_data.append(
+                (
+                    offset,
+                    order,
+                    np.array(rows, dtype=np.intp),
+                    np.array(cols, dtype=np.intp),
+                    np.array(weights),
+                    degree,
+                )
+            )
+            offset += len(level_nodes)
+
+    def run(self, max_passes=DEFAULT_PASSES, time_budget=None):
+        """
+        Run down and up sweeps until the positions stop changing or the
+        budget is used up, and write the positions back to the nodes.
+
+        :param max_passes: Upper bound on the down and up sweep pairs.
+        :param time_budget: Seconds after which no further pass is started.
+        :return: Number of passes run.
+        """
+
+        def sweep():
+            for level in self.level_data:
+                self._reposition_level(*level)
+            for level in reversed(self.level_data):
+                self._reposition_level(*level)
+
+        def snapshot():
+            positions = self.pos.tolist()
+            return level_shape(
+                positions[offset : offset + len(order)]
+                for offset, order, *_ in self.level_data
+            )
+
+        count = crossing_counter(self.levels, self.axis)
+
+        def crossings():
+            self._store_positions()
+            return count()
+
+        passes = sweep_until_stable(sweep, snapshot, max_passes, time_budget, crossings)
+        self._store_positions()
+        return passes
+
+    def _store_positions(self):
+        """Copy the positions back to the nodes."""
+        for node, position in zip(self.nodes, self.pos.tolist(), strict=True):
+            setattr(node, self.axis, position)
+
+    def _barycenter(self, i):
+        """Weighted barycenter of node i at the current positions."""
+        neighbors = self.neighbors[i]
+        if not neighbors:
+            return float(self.pos[i])
+        total = sum(float(self.pos[j]) * weight for j, weight in neighbors)
+        return total / sum(weight for _, weight in neighbors)
+
+    def _reposition_level(self, offset, order, rows, cols, weights, degree):
+        np = self.np
+        pos = self.pos
+        padding = self.padding
+        spacing = padding * 0.9
+
+        # Barycenters of the whole level at once. bincount adds in link
+        # order, like the sequential sum of the Python loop.
+        own = pos[offset : offset + len(order)]
+        sums = np.bincount(rows, weights=weights * pos[cols], minlength=len(order))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            barycenters = np.where(degree > 0, sums / degree, own).tolist()
+
+        slots = _Slots(padding, spacing)
+        positioned = set()
+        spans = SpanIndex()
+        for i in order:
+            same = self.same_level[i]
+            if same:
+                barycenter = self._barycenter(i)
+                connected = [j for j in same if j in positioned]
+            else:
+                barycenter = barycenters[i - offset]
+                connected = ()
+
+            position = slots.pick(
+                barycenter,
+                spans,
+                [float(pos[j]) + d for j in connected for d in (padding, -padding)],
+            )
+            pos[i] = position
+            slots.add(position)
+            positioned.add(i)
+            for j in connected:
+                spans.add(position, float(pos[j]))
+
+
+class _Slots:
+    """
+    Positions of the placed nodes of a level and the candidate slots of the
+    Python loop (left of the first node, right of every node) that are
+    still at least spacing away from all of them.
+
+    Placing a node only removes slots, apart from the two next to it, so
+    the valid ones are kept in a sorted list and the one nearest to a
+    barycenter is found by bisection instead of testing every slot.
+    """
+
+    def __init__(self, padding, spacing):
+        self.padding = padding
+        self.spacing = spacing
+        self.placed = []
+        # Candidates right of a placed node, and the valid candidates
+        self.right_of = set()
+        self.free = []
+
+    def valid(self, position):
+        """:return: True if position keeps spacing to every placed node."""
+        placed = self.placed
+        k = bisect_left(placed, position)
+        return (k == len(placed) or placed[k] - position >= self.spacing) and (
+            k == 0 or position - placed[k - 1] >= self.spacing
+        )
+
+    def pick(self, barycenter, spans, extra):
+        """
+        :param barycenter: Preferred position.
+        :param spans: SpanIndex of the spans between linked placed nodes.
+        :param extra: Further candidates, next to linked placed nodes.
+        :return: The valid candidate outside the spans nearest to the
+                 barycenter, the lower one on ties; inside the spans if
+                 there is no other.
+        """
+        if not self.placed:
+            return barycenter
+        free = self.free
+        k = bisect_left(free, barycenter)
+        outside = []
+        for indexes in (range(k - 1, -1, -1), range(k, len(free))):
+            for index in indexes:
+                if free[index] not in spans:
+                    outside.append(free[index])
+                    break
+        inside = [free[index] for index in (k - 1, k) if 0 <= index < len(free)]
+        for position in extra:
+            if self.valid(position):
+                (inside if position in spans else outside).append(position)
+        best = outside or inside
+        if not best:
+            return self.placed[-1] + self.padding
+        return min(best, key=lambda p: (abs(p - barycenter), p))
+
+    def add(self, position):
+        placed = self.placed
+        spacing = self.spacing
+        new_first = not placed or position < placed[0]
+        if placed and new_first:
+            first = placed[0] - self.padding
+            if first not in self.right_of:
+                self._discard(first)
+        insort(placed, position)
+
+        # Slots now too close to the new node
+        free = self.free
+        del free[
+            bisect_right(free, position - spacing) : bisect_left(
+                free, position + spacing
+            )
+        ]
+
+        right = position + self.padding
+        self.right_of.add(right)
+        candidates = [right, position - self.padding] if new_first else [right]
+        for candidate in candidates:
+            k = bisect_left(free, candidate)
+            if (k == len(free) or free[k] != candidate) and self.valid(candidate):
+                free.insert(k, candidate)
+
+    def _discard(self, position):
+        k = bisect_left(self.free, position)
+        if k < len(self.free) and self.free[k] == position:
+            del self.free[k]
@@ -0,0 +1,230 @@
+import logging
+import math
+import os
+
+from clab_io_draw.core.diagram.custom_drawio import CustomDrawioDiagram
+from clab_io_draw.core.layout.layout_manager import LayoutManager
+from clab_io_draw.core.models.link import Link
+from clab_io_draw.core.models.node import Node
+
+logger = logging.getLogger(__name__)
+
+# Components are only sent to worker processes when the topology has at
+# least this many nodes, and only components of at least
+# PARALLEL_MIN_COMPONENT nodes; smaller ones cost more to ship than to lay out
+PARALLEL_MIN_NODES = 2000
+PARALLEL_MIN_COMPONENT = 100
+
+
+def connected_components(nodes):
+    """
+    Split nodes into connected components.
+
+    :param nodes: Dictionary of node_name -> Node.
+    :return: List of components, each a list of Nodes in dictionary order,
+             ordered by their first node.
+    """
+    component_of = {}
+    components = []
+    for name in nodes:
+        if name in component_of:
+            continue
+        component_id = len(components)
+        component_of[name] = component_id
+        stack = [name]
+        while stack:
+            for nbr in nodes[stack.pop()].get_neighbors():
+                if nbr.name in nodes and nbr.name not in component_of:
+                    component_of[nbr.name] = component_id
+                    stack.append(nbr.name)
+        components.append([])
+    for name, node in nodes.items():
+        components[component_of[name]].append(node)
+    return components
+
+
+def pack_shelves(sizes, gap_x, gap_y):
+    """
+    Pack rectangles on shelves: tallest first, left to right, starting a
+    new shelf below when the current one is full.
+
+    The shelf width is the larger of the widest rectangle and the side of
+    a square with the total area, so the result is roughly square.
+
+    :param sizes: List of (width, height) tuples.
+    :param gap_x: Horizontal space between rectangles.
+    :param gap_y: Vertical space between shelves.
+    :return: List of (x, y) top-left offsets, in the order of sizes.
+    """
+    if not sizes:
+        return []
+    area = sum((w + gap_x) * (h + gap_y) for w, h in sizes)
+    shelf_width = max(max(w for w, _ in sizes), math.sqrt(area))
+
+    offsets = [None] * len(sizes)
+    x = y = shelf_height = 0.0
+    for i in sorted(range(len(sizes)), key=lambda i: -sizes[i][1]):
+        w, h = sizes[i]
+        if x > 0 and x + w > shelf_width:
+            y += shelf_height + gap_y
+            x = shelf_height = 0.0
+        offsets[i] = (x, y)
+        x += w + gap_x
+        shelf_height = max(shelf_height, h)
+    return offsets
+
+
+def _layout_component(layout_cls, layout_options, paddings, nodes, links):
+    """
+    Lay out one component in a worker process.
+
+    :param layout_cls: Layout class to apply.
+    :param layout_options: Keyword arguments for layout_cls.
+    :param paddings: Tuple of (padding_x, padding_y).
+    :param nodes: List of (name, graph_level, width, height) tuples.
+    :param links: Per node, the (source, target) node indexes of its links.
+    :return: List of (pos_x, pos_y), in the order of nodes.
+    """
+    rebuilt = [
+        Node(name, name, "", graph_level=level, width=width, height=height)
+        for name, level, width, height in nodes
+    ]
+    for node, node_links in zip(rebuilt, links, strict=True):
+        for source, target in node_links:
+            node.add_link(Link(rebuilt[source], rebuilt[target]))
+    diagram = CustomDrawioDiagram()
+    diagram.nodes = {node.name: node for node in rebuilt}
+    diagram.styles = {"padding_x": paddings[0], "padding_y": paddings[1]}
+    layout_cls(**layout_options).apply(diagram)
+    return [(node.pos_x, node.pos_y) for node in rebuilt]
+
+
+class ComponentLayout(LayoutManager):
+    """
+    Lays out each connected component on its own and packs the resulting
+    blocks onto the page.
+
+    Layout time then follows the largest component instead of the whole
+    topology. For large topologies the bigger components are laid out in
+    parallel worker processes.
+    """
+
+    def __init__(self, layout_cls, jobs=None, **layout_options):
+        """
+        :param layout_cls: LayoutManager class applied to every component.
+        :param jobs: Worker processes for large topologies; None uses one per
+                     CPU, 1 lays out everything in this process.
+        :param layout_options: Keyword arguments for layout_cls (engine,
+                               max_passes, time_budget, swap_passes),
+                               applied to each component separately.
+        """
+        self.layout_cls = layout_cls
+        self.jobs = jobs
+        self.layout_options = layout_options
+
+    def apply(self, diagram, verbose=False) -> None:
+        components = connected_components(diagram.nodes)
+        if len(components) <= 1:
+            self.layout_cls(**self.layout_options).apply(diagram, verbose=verbose)
+            return
+        logger.debug(f"Laying out {len(components)} connected components...")
+
+        remote = self._parallel_components(diagram, components)
+        if remote:
+            self._apply_in_workers(diagram, remote)
+        remote_ids = {id(component) for component in remote}
+        for component in components:
+            if id(component) not in remote_ids:
+                self._apply_here(diagram, component, verbose)
+
+        self._pack(diagram, components)
+
+    def _parallel_components(self, diagram, components):
+        """
+        :return: The components worth laying out in worker processes, empty
+                 if the topology is small or has fewer than two of them.
+        """
+        if self._workers() < 2 or len(diagram.nodes) < PARALLEL_MIN_NODES:
+            return []
+        large = [c for c in components if len(c) >= PARALLEL_MIN_COMPONENT]
+        return large if len(large) > 1 else []
+
+    def _workers(self):
+        return self.jobs or os.cpu_count() or 1
+
+    def _apply_here(self, diagram, component, verbose):
+        sub = CustomDrawioDiagram()
+        sub.nodes = {node.name: node for node in component}
+        sub.styles = diagram.styles
+        sub.layout = getattr(diagram, "layout", None)
+        self.layout_cls(**self.layout_options).apply(sub, verbose=verbose)
+
+    def _apply_in_workers(self, diagram, components):
+        # Lazy import: worker processes are only needed for large topologies
+        from concurrent.futures import ProcessPoolExecutor  # noqa: PLC0415
+
+        paddings = (diagram.styles["padding_x"], diagram.styles["padding_y"])
+        jobs = min(self._workers(), len(components))
+        logger.debug(
+            f"Laying out {len(components)} components in {jobs} worker processes..."
+        )
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = []
+            for component in components:
+                index = {node.name: i for i, node in enumerate(component)}
+                nodes = [
+                    (node.name, node.graph_level, node.width, node.height)
+                    for node in component
+                ]
+                links = [
+                    [
+                        (index[link.source.name], index[link.target.name])
+                        for link in node.links
+                        if link.source.name in index and link.target.name in index
+                    ]
+                    for node in component
+                ]
+                futures.append(
+                    pool.submit(
+                        _layout_component,
+                        self.layout_cls,
+                        self.layout_options,
+                        paddings,
+                        nodes,
+                        links,
+                    )
+                )
+            for component, future in zip(components, futures, strict=True):
+                for node, (x, y) in zip(component, future.result(), strict=True):
+                    node.pos_x, node.pos_y = x, y
+
+    def _pack(self, diagram, components):
+        styles = diagram.styles
+        default_w = float(styles.get("node_width", 75))
+        default_h = float(styles.get("node_height", 75))
+
+        boxes = []
+        for component in components:
+            left = min(node.pos_x for node in component)
+            top = min(node.pos_y for node in component)
+            right = max(
+                node.pos_x + (float(node.width) if node.width else default_w)
+                for node in component
+            )
+            bottom = max(
+                node.pos_y + (float(node.height) if node.height else default_h)
+                for node in component
+            )
+            boxes.append((left, top, right - left, bottom - top))
+
+        offsets = pack_shelves(
+            [(w, h) for _, _, w, h in boxes],
+            styles["padding_x"],
+            styles["padding_y"],
+        )
+        for component, (left, top, _, _), (x, y) in zip(
+            components, boxes, offsets, strict=True
+        ):
+            for node in component:
+                node.pos_x += 100 + x - left
+                node.pos_y += 100 + y - top
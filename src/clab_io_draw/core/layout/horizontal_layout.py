@@ -1,12 +1,49 @@
 import logging
+from bisect import bisect_left, insort
 from collections import defaultdict
 
+from clab_io_draw.core.layout.barycenter_engine import (
+    DEFAULT_PASSES,
+    BarycenterEngine,
+    level_shape,
+    resolve_engine,
+    sweep_until_stable,
+)
+from clab_io_draw.core.layout.crossing_reduction import (
+    DEFAULT_SWAP_PASSES,
+    crossing_counter,
+    refine_by_adjacent_swaps,
+)
 from clab_io_draw.core.layout.layout_manager import LayoutManager
+from clab_io_draw.core.layout.node_grid import adjust_intermediary_nodes
+from clab_io_draw.core.layout.span_index import SpanIndex
 
 logger = logging.getLogger(__name__)
 
 
 class HorizontalLayout(LayoutManager):
+    def __init__(
+        self,
+        engine=None,
+        max_passes=DEFAULT_PASSES,
+        time_budget=None,
+        swap_passes=DEFAULT_SWAP_PASSES,
+    ):
+        """
+        :param engine: Barycenter engine, "numpy" or "python". None uses
+                       NumPy when it is installed.
+        :param max_passes: Upper bound on the down and up sweep passes; fewer
+                           run when the positions stop changing.
+        :param time_budget: Seconds after which no further sweep pass is
+                            started, None for no limit.
+        :param swap_passes: Upper bound on the adjacent swap passes that
+                            remove crossings after the sweeps, 0 for none.
+        """
+        self.engine = engine
+        self.max_passes = max_passes
+        self.time_budget = time_budget
+        self.swap_passes = swap_passes
+
     def apply(self, diagram, verbose=False) -> None:
         logger.debug("Applying iterative barycenter layout (horizontal)...")
         self.diagram = diagram
@@ -24,33 +61,20 @@ class HorizontalLayout(LayoutManager):
             for i, nd in enumerate(nodes_by_level[level]):
                 nd.pos_y = float(100 + i * self.diagram.styles["padding_y"])
 
-        def get_connected_pairs(level_nodes):
-            """Get pairs of nodes in the same level that are directly connected."""
-            pairs = []
-            for i, node1 in enumerate(level_nodes):
-                for node2 in level_nodes[i + 1 :]:
-                    if node2 in node1.get_neighbors():
-                        pairs.append((node1, node2))
-            return pairs
-
-        def is_position_between_connected_nodes(pos, node, level_nodes):
-            """Check if a position would place the node between connected nodes."""
-            connected_pairs = get_connected_pairs(level_nodes)
-            for n1, n2 in connected_pairs:
-                if n1 != node and n2 != node:
-                    min_y, max_y = min(n1.pos_y, n2.pos_y), max(n1.pos_y, n2.pos_y)
-                    if min_y < pos < max_y:
-                        return True
-            return False
-
-        def find_valid_positions(node, level_nodes, barycenter):
-            """Find all valid positions, prioritizing those that don't create crossings."""
+        def find_valid_positions(node, placed, barycenter, spans, existing_positions):
+            """Find all valid positions, prioritizing those that don't create crossings.
+
+            :param placed: Set of the already positioned nodes of the level.
+            :param spans: SpanIndex of the spans between connected placed nodes.
+            :param existing_positions: Sorted positions of the placed nodes.
+            """
             positions = []
 
-            connected_nodes = set(node.get_neighbors())
-            same_level_connected = [n for n in level_nodes if n in connected_nodes]
+            # Get the placed nodes that are directly connected to this node
+            same_level_connected = [
+                n for n in node.get_neighbors() if n in placed and n is not node
+            ]
 
-            existing_positions = sorted([n.pos_y for n in level_nodes if n != node])
             if not existing_positions:
                 return [barycenter]
 
@@ -75,17 +99,19 @@ class HorizontalLayout(LayoutManager):
             min_spacing = self.diagram.styles["padding_y"] * 0.9
             valid_positions = []
             for pos in sorted(set(positions)):
-                if all(
-                    abs(pos - other_pos) >= min_spacing
-                    for other_pos in existing_positions
-                ):
+                # Only the closest existing positions on either side matter
+                i = bisect_left(existing_positions, pos)
+                if (
+                    i == len(existing_positions)
+                    or abs(pos - existing_positions[i]) >= min_spacing
+                ) and (i == 0 or abs(pos - existing_positions[i - 1]) >= min_spacing):
                     valid_positions.append(pos)
 
             # Sort positions by priority
             return sorted(
                 valid_positions,
                 key=lambda p: (
-                    is_position_between_connected_nodes(p, node, level_nodes),
+                    p in spans,
                     abs(p - barycenter),
                 ),
             )
@@ -98,8 +124,7 @@ class HorizontalLayout(LayoutManager):
             for nbr in node.get_neighbors():
                 try:
                     pos = float(nbr.pos_y)
-                    # Give higher weight to same-level connections
-                    weight = 2.0 if nbr.graph_level == node.graph_level else 1.0
+                    weight = self.link_weight(node, nbr)
                     positions.append(pos)
                     weights.append(weight)
                 except (TypeError, ValueError):
@@ -115,13 +140,18 @@ class HorizontalLayout(LayoutManager):
             """Position nodes in a level while avoiding problematic placements."""
             # Sort nodes by number of connections (more connected nodes first)
             nodes_to_position = sorted(
-                level_nodes, key=lambda n: len(list(n.get_neighbors())), reverse=True
+                level_nodes, key=lambda n: len(n.get_neighbors()), reverse=True
             )
 
             positioned = []
+            placed = set()
+            existing_positions = []
+            spans = SpanIndex()
             for node in nodes_to_position:
                 barycenter = compute_barycenter(node)
-                valid_positions = find_valid_positions(node, positioned, barycenter)
+                valid_positions = find_valid_positions(
+                    node, placed, barycenter, spans, existing_positions
+                )
 
                 if valid_positions:
                     node.pos_y = valid_positions[0]
@@ -135,15 +165,52 @@ class HorizontalLayout(LayoutManager):
                         node.pos_y = barycenter
 
                 positioned.append(node)
+                placed.add(node)
+                insort(existing_positions, node.pos_y)
+                # Later nodes should not land between node and its neighbors
+                for nbr in node.get_neighbors():
+                    if nbr in placed and nbr is not node:
+                        spans.add(node.pos_y, nbr.pos_y)
 
         # Main layout iterations
-        num_passes = 4
-        for _iter in range(num_passes):
-            for level in sorted_levels:
-                reposition_level(nodes_by_level[level])
+        if resolve_engine(self.engine) == "numpy":
+            BarycenterEngine(
+                nodes_by_level,
+                "pos_y",
+                self.diagram.styles["padding_y"],
+                self.link_weight,
+            ).run(self.max_passes, self.time_budget)
+        else:
+
+            def sweep():
+                for level in sorted_levels:
+                    reposition_level(nodes_by_level[level])
+
+                for level in reversed(sorted_levels):
+                    reposition_level(nodes_by_level[level])
+
+            def snapshot():
+                return level_shape(
+                    [nd.pos_y for nd in nodes_by_level[level]]
+                    for level in sorted_levels
+                )
+
+            sweep_until_stable(
+                sweep,
+                snapshot,
+                self.max_passes,
+                self.time_budget,
+                crossing_counter(
+                    [nodes_by_level[level] for level in sorted_levels], "pos_y"
+                ),
+            )
 
-            for level in reversed(sorted_levels):
-                reposition_level(nodes_by_level[level])
+        if self.swap_passes:
+            refine_by_adjacent_swaps(
+                [nodes_by_level[level] for level in sorted_levels],
+                "pos_y",
+                self.swap_passes,
+            )
 
         # Assign X positions
         for level in sorted_levels:
@@ -155,6 +222,13 @@ class HorizontalLayout(LayoutManager):
 
         logger.debug("Iterative barycenter layout complete (horizontal).")
 
+    @staticmethod
+    def link_weight(node, nbr):
+        """
+        Weight of nbr in the barycenter of node. Give higher weight to same-level connections.
+        """
+        return 2.0 if nbr.graph_level == node.graph_level else 1.0
+
     def _center_align_nodes(self, nodes_by_level):
         sorted_levels = sorted(nodes_by_level.keys())
         global_center = 300.0
@@ -187,39 +261,4 @@ class HorizontalLayout(LayoutManager):
                 prev_center = col_center
 
     def _adjust_intermediary_nodes(self, diagram, offset=100.0):
-        all_links = diagram.get_links_from_nodes()
-        nodes = list(diagram.nodes.values())
-
-        for nd in nodes:
-            nd.half_w = float(nd.width) / 2.0 if nd.width else 20.0
-            nd.half_h = float(nd.height) / 2.0 if nd.height else 20.0
-
-        for link in all_links:
-            A = link.source
-            B = link.target
-
-            if abs(A.pos_y - B.pos_y) < 1e-5:
-                left_x = min(A.pos_x, B.pos_x)
-                right_x = max(A.pos_x, B.pos_x)
-                for N in nodes:
-                    if N not in (A, B):
-                        Ny_top = N.pos_y - N.half_h
-                        Ny_bot = N.pos_y + N.half_h
-                        if Ny_top <= A.pos_y <= Ny_bot:
-                            Nx_left = N.pos_x - N.half_w
-                            Nx_right = N.pos_x + N.half_w
-                            if Nx_left < right_x and Nx_right > left_x:
-                                N.pos_y -= offset
-
-            elif abs(A.pos_x - B.pos_x) < 1e-5:
-                top_y = min(A.pos_y, B.pos_y)
-                bot_y = max(A.pos_y, B.pos_y)
-                for N in nodes:
-                    if N not in (A, B):
-                        Nx_left = N.pos_x - N.half_w
-                        Nx_right = N.pos_x + N.half_w
-                        if Nx_left <= A.pos_x <= Nx_right:
-                            Ny_top = N.pos_y - N.half_h
-                            Ny_bot = N.pos_y + N.half_h
-                            if Ny_top < bot_y and Ny_bot > top_y:
-                                N.pos_x -= offset
+        adjust_intermediary_nodes(diagram, offset, vertical_first=False)
@@ -0,0 +1,307 @@
+import logging
+from bisect import bisect_left, insort
+from collections import Counter, deque
+
+from defusedxml import DefusedXmlException, ElementTree
+
+from clab_io_draw.core.layout.layout_manager import LayoutManager
+from clab_io_draw.core.utils.drawio_compression import inflate_diagram
+
+logger = logging.getLogger(__name__)
+
+
+class LayoutSeedError(Exception):
+    """Raised when a previous diagram cannot be read as a layout seed."""
+
+
+class LayoutSeed:
+    """
+    Node positions (and, if known, links) of a previous rendering.
+    """
+
+    def __init__(self, positions=None, links=None):
+        """
+        :param positions: Dictionary of node_name -> (x, y).
+        :param links: Dictionary of node_name -> set of neighbor names, or
+                      None when the previous links are unknown. Nodes missing
+                      from it are never treated as changed.
+        """
+        self.positions = dict(positions or {})
+        self.links = links
+
+    @classmethod
+    def from_drawio(cls, path):
+        """
+        Read node positions and links from the first page of a .drawio file
+        written by clab2drawio.
+
+        Nodes grouped with their ports have coordinates relative to the
+        group; they are converted back to page coordinates. Links are taken
+        from edges between nodes and from port ids
+        ("<node>:<intf>:<peer>:<intf>").
+
+        :param path: Path to the .drawio file.
+        :return: LayoutSeed instance.
+        :raises LayoutSeedError: If the file cannot be parsed.
+        """
+        try:
+            page = ElementTree.parse(path).getroot().find("diagram")
+            if page is None:
+                raise LayoutSeedError(f"No diagram page in '{path}'")
+            model = page.find("mxGraphModel")
+            if model is None:
+                model = ElementTree.fromstring(inflate_diagram(page.text or ""))
+        except (OSError, ValueError, ElementTree.ParseError, DefusedXmlException) as e:
+            raise LayoutSeedError(f"Cannot read layout seed '{path}': {e}") from e
+
+        geometry = {}
+        edges = []
+        node_ids = set()
+        for parent in model.iter():
+            for cell in parent:
+                if cell.tag == "object":
+                    cell_id = cell.get("id")
+                    cell = cell.find("mxCell")
+                    if cell is None:
+                        continue
+                    node_ids.add(cell_id)
+                elif cell.tag == "mxCell" and parent.tag != "object":
+                    cell_id = cell.get("id")
+                else:
+                    continue
+                if cell.get("edge") == "1":
+                    edges.append((cell.get("source"), cell.get("target")))
+                    continue
+                geom = cell.find("mxGeometry")
+                if geom is not None and geom.get("relative") != "1":
+                    geometry[cell_id] = (
+                        cell.get("parent"),
+                        float(geom.get("x", 0)),
+                        float(geom.get("y", 0)),
+                    )
+
+        def absolute(cell_id):
+            x = y = 0.0
+            while cell_id in geometry:
+                cell_id, dx, dy = geometry[cell_id]
+                x += dx
+                y += dy
+            return x, y
+
+        # Port and link midpoint cells are objects too, keep the nodes only
+        ports = set()
+        for cell_id in node_ids:
+            parts = cell_id.split(":")
+            if len(parts) == 4 and parts[0] in node_ids and parts[2] in node_ids:
+                ports.add(cell_id)
+        positions = {
+            cell_id: absolute(cell_id)
+            for cell_id in node_ids - ports
+            if cell_id in geometry and not cell_id.startswith("mid:")
+        }
+
+        pairs = [(s, t) for s, t in edges if s in positions and t in positions]
+        for cell_id in ports:
+            parts = cell_id.split(":")
+            if parts[0] in positions and parts[2] in positions:
+                pairs.append((parts[0], parts[2]))
+        links = None
+        if pairs:
+            links = {name: set() for name in positions}
+            for source, target in pairs:
+                links[source].add(target)
+                links[target].add(source)
+        return cls(positions, links)
+
+
+class IncrementalLayout(LayoutManager):
+    """
+    Keeps nodes where a previous rendering put them and places only new
+    nodes and nodes whose links changed.
+
+    A node is placed in the row of its graph level, at the barycenter of its
+    already placed neighbors, shifted to the nearest free slot. Work and
+    movement are proportional to the number of placed nodes; unchanged nodes
+    do not move.
+    """
+
+    def __init__(self, seed, fallback):
+        """
+        :param seed: LayoutSeed with the previous positions.
+        :param fallback: LayoutManager used when no node has a seed position.
+        """
+        self.seed = seed
+        self.fallback = fallback
+        self.placed = []
+
+    def apply(self, diagram, verbose=False) -> None:
+        nodes = diagram.nodes
+        # Only report the nodes of this run when the layout is reused
+        self.placed = []
+        fixed = {
+            name: pos for name, pos in self.seed.positions.items() if name in nodes
+        }
+        if not fixed:
+            logger.debug("No seed positions match the topology, full layout...")
+            self.fallback.apply(diagram, verbose=verbose)
+            self.placed = list(nodes)
+            return
+
+        pending = set(nodes) - set(fixed)
+        if self.seed.links is not None:
+            for name in fixed.keys() & self.seed.links.keys():
+                current = {
+                    nbr.name for nbr in nodes[name].get_neighbors() if nbr.name in nodes
+                }
+                if current != self.seed.links.get(name, set()) & nodes.keys():
+                    pending.add(name)
+        for name in pending:
+            fixed.pop(name, None)
+        if not fixed:
+            logger.debug("Every seeded node changed, full layout...")
+            self.fallback.apply(diagram, verbose=verbose)
+            self.placed = list(nodes)
+            return
+
+        vertical = diagram.layout != "horizontal"
+        along, across = ("pos_x", "pos_y") if vertical else ("pos_y", "pos_x")
+        styles = diagram.styles
+        step = styles["padding_x"] if vertical else styles["padding_y"]
+        level_step = styles["padding_y"] if vertical else styles["padding_x"]
+
+        for name, (x, y) in fixed.items():
+            nodes[name].pos_x, nodes[name].pos_y = float(x), float(y)
+
+        row_of_level = self._row_coordinates(
+            [nodes[name] for name in fixed], across, level_step
+        )
+        rows = {}
+        for name in fixed:
+            node = nodes[name]
+            rows.setdefault(round(getattr(node, across)), []).append(
+                getattr(node, along)
+            )
+        for row in rows.values():
+            row.sort()
+        first_along = min(getattr(nodes[name], along) for name in fixed)
+
+        def place(node):
+            coordinate = row_of_level(node.graph_level)
+            row = rows.setdefault(round(coordinate), [])
+            anchors = [
+                getattr(nbr, along)
+                for nbr in node.get_neighbors()
+                if nbr.name in nodes and nbr.name not in pending
+            ]
+            if anchors:
+                target = sum(anchors) / len(anchors)
+            else:
+                target = row[-1] + step if row else first_along
+            position = self._free_slot(row, target, step)
+            insort(row, position)
+            setattr(node, along, position)
+            setattr(node, across, coordinate)
+            pending.discard(node.name)
+            self.placed.append(node.name)
+            if verbose:
+                logger.debug(f"Placed {node.name} at {along}={position}")
+
+        def order(name):
+            return (nodes[name].graph_level or 0, name)
+
+        # Grow outwards from the fixed nodes, so new nodes are placed next
+        # to the neighbors that are already in the drawing
+        queue = deque(
+            sorted(
+                (
+                    name
+                    for name in pending
+                    if any(
+                        nbr.name not in pending for nbr in nodes[name].get_neighbors()
+                    )
+                ),
+                key=order,
+            )
+        )
+        while pending:
+            if not queue:
+                queue.append(min(pending, key=order))
+            name = queue.popleft()
+            if name not in pending:
+                continue
+            node = nodes[name]
+            place(node)
+            queue.extend(
+                sorted(
+                    (nbr.name for nbr in node.get_neighbors() if nbr.name in pending),
+                    key=order,
+                )
+            )
+        logger.debug(
+            f"Incremental layout kept {len(fixed)} node(s), placed {len(self.placed)}"
+        )
+
+    @staticmethod
+    def _row_coordinates(fixed_nodes, across, level_step):
+        """
+        Build a graph level -> row coordinate lookup from the fixed nodes.
+
+        Each level uses the most common coordinate of its fixed nodes; levels
+        without fixed nodes are extrapolated from the nearest known level.
+        """
+        by_level = {}
+        for node in fixed_nodes:
+            if node.graph_level is not None:
+                by_level.setdefault(node.graph_level, Counter())[
+                    getattr(node, across)
+                ] += 1
+        known = {
+            level: counts.most_common(1)[0][0] for level, counts in by_level.items()
+        }
+        fallback = max((getattr(n, across) for n in fixed_nodes), default=100.0)
+
+        def row_of_level(level):
+            if level is None or not known:
+                return fallback + level_step
+            if level in known:
+                return known[level]
+            nearest = min(known, key=lambda known_level: abs(known_level - level))
+            return known[nearest] + (level - nearest) * level_step
+
+        return row_of_level
+
+    @staticmethod
+    def _free_slot(row, target, step):
+        """
+        Closest position to target that keeps `step` * 0.9 from every
+        position in the sorted list row.
+        """
+        spacing = step * 0.9
+
+        def fits(position):
+            i = bisect_left(row, position)
+            return (i == len(row) or row[i] - position >= spacing) and (
+                i == 0 or position - row[i - 1] >= spacing
+            )
+
+        if fits(target):
+            return target
+        start = bisect_left(row, target)
+        right = next(
+            p
+            for p in (row[i] + step for i in range(max(start - 1, 0), len(row)))
+            if fits(p)
+        )
+        left = next(
+            (
+                p
+                for p in (
+                    row[i] - step for i in range(min(start, len(row) - 1), -1, -1)
+                )
+                if fits(p)
+            ),
+            None,
+        )
+        if left is not None and target - left < right - target:
+            return left
+        return right
@@ -0,0 +1,229 @@
+import logging
+import math
+from bisect import bisect_left, bisect_right
+from collections import Counter, defaultdict
+from heapq import heappop, heappush
+
+logger = logging.getLogger(__name__)
+
+# Interpolated coordinates are rounded to this many decimals, so a link
+# passing exactly through a point is seen there despite float error
+_PRECISION = 6
+
+
+def node_boxes(nodes, default_width=75, default_height=75):
+    """
+    :param nodes: Dictionary of node_name -> Node with positions set.
+    :param default_width: Width of nodes without one.
+    :param default_height: Height of nodes without one.
+    :return: Dictionary of node_name -> (left, top, right, bottom).
+    """
+    boxes = {}
+    for name, node in nodes.items():
+        width = float(node.width) if node.width else float(default_width)
+        height = float(node.height) if node.height else float(default_height)
+        boxes[name] = (node.pos_x, node.pos_y, node.pos_x + width, node.pos_y + height)
+    return boxes
+
+
+def link_segments(nodes, boxes):
+    """
+    Straight segments between the centers of linked nodes.
+
+    A connection is listed on both of its nodes, so every connection gives
+    one segment; parallel links between the same nodes give one each.
+
+    :param nodes: Dictionary of node_name -> Node.
+    :param boxes: Dictionary of node_name -> (left, top, right, bottom).
+    :return: List of ((x1, y1), (x2, y2)) tuples.
+    """
+    multiplicity = {}
+    for name, node in nodes.items():
+        per_peer = Counter()
+        for link in node.get_all_links():
+            peer = link.target if link.source is node else link.source
+            if peer.name in nodes and peer.name != name:
+                per_peer[peer.name] += 1
+        for peer, count in per_peer.items():
+            key = (name, peer) if name < peer else (peer, name)
+            multiplicity[key] = max(multiplicity.get(key, 0), count)
+
+    def center(name):
+        left, top, right, bottom = boxes[name]
+        return ((left + right) / 2, (top + bottom) / 2)
+
+    segments = []
+    for (a, b), count in multiplicity.items():
+        segments.extend([(center(a), center(b))] * count)
+    return segments
+
+
+def count_overlaps(boxes):
+    """
+    Count pairs of nodes whose boxes overlap, with a sweep over x.
+
+    :param boxes: Iterable of (left, top, right, bottom) tuples.
+    :return: Number of overlapping pairs; boxes that only touch do not count.
+    """
+    # Boxes whose x range contains the sweep position, by their right edge
+    open_boxes = []
+    overlaps = 0
+    for i, (left, top, right, bottom) in enumerate(sorted(boxes)):
+        while open_boxes and open_boxes[0][0] <= left:
+            heappop(open_boxes)
+        overlaps += sum(
+            1
+            for _, _, other_top, other_bottom in open_boxes
+            if other_top < bottom and top < other_bottom
+        )
+        heappush(open_boxes, (right, i, top, bottom))
+    return overlaps
+
+
+def layout_metrics(nodes, default_width=75, default_height=75):
+    """
+    Measure the quality of a finished layout.
+
+    Links are taken as straight lines between node centers.
+
+    :param nodes: Dictionary of node_name -> Node with positions set.
+    :param default_width: Width of nodes without one.
+    :param default_height: Height of nodes without one.
+    :return: Dictionary with the node and link counts, edge crossings,
+             total edge length, overlapping node pairs and the bounding box
+             of all nodes.
+    """
+    boxes = node_boxes(nodes, default_width, default_height)
+    segments = link_segments(nodes, boxes)
+    lefts, tops, rights, bottoms = (
+        zip(*boxes.values(), strict=True) if boxes else ((0,),) * 4
+    )
+    width = round(max(rights) - min(lefts), 1)
+    height = round(max(bottoms) - min(tops), 1)
+    return {
+        "nodes": len(nodes),
+        "links": len(segments),
+        "crossings": count_crossings(segments),
+        "total_edge_length": round(sum(math.dist(p, q) for p, q in segments), 1),
+        "node_overlaps": count_overlaps(boxes.values()),
+        "bounding_box": {
+            "width": width,
+            "height": height,
+            "area": round(width * height, 1),
+        },
+    }
+
+
+def count_crossings(segments):
+    """
+    Count proper crossings between straight segments with a sweep line.
+
+    The sweep stops at every distinct endpoint coordinate along the axis
+    with fewer of them, which for the layered layouts are the levels.
+    Between two stops no segment begins or ends, so the segments crossing
+    in there are exactly the pairs whose order swaps from one stop to the
+    next, counted as inversions in O(n log n). Pairs meeting on a stop are
+    counted there. The cost is O(S log S), with S the number of segment
+    pieces between consecutive stops, instead of testing all pairs.
+
+    Segments that only touch (shared end points, an end point on another
+    segment) or overlap along a line do not count as crossing.
+
+    :param segments: List of ((x1, y1), (x2, y2)) tuples.
+    :return: Number of crossing pairs.
+    """
+    segments = [(p, q) for p, q in segments if p != q]
+    if len({p[0] for s in segments for p in s}) < len(
+        {p[1] for s in segments for p in s}
+    ):
+        # Sweep along x instead: swap the axes
+        segments = [((p[1], p[0]), (q[1], q[0])) for p, q in segments]
+
+    stops = sorted({p[1] for s in segments for p in s})
+    stop_index = {y: i for i, y in enumerate(stops)}
+
+    flat = defaultdict(list)
+    starting = defaultdict(list)
+    for p, q in segments:
+        (x1, y1), (x2, y2) = (p, q) if p[1] <= q[1] else (q, p)
+        if y1 == y2:
+            flat[stop_index[y1]].append(
+                (round(min(x1, x2), _PRECISION), round(max(x1, x2), _PRECISION))
+            )
+        else:
+            starting[stop_index[y1]].append(
+                (stop_index[y1], stop_index[y2], x1, y1, x2, y2)
+            )
+
+    def x_at(seg, k):
+        first, last, x1, y1, x2, y2 = seg
+        if k == first:
+            return round(x1, _PRECISION)
+        if k == last:
+            return round(x2, _PRECISION)
+        return round(x1 + (x2 - x1) * (stops[k] - y1) / (y2 - y1), _PRECISION)
+
+    crossings = 0
+    active = []
+    for k in range(len(stops)):
+        # Segments running through stop k, not ending on it
+        through = [seg for seg in active if seg[1] > k]
+        if through:
+            crossings += _crossings_on_stop(through, [x_at(s, k) for s in through])
+            if flat[k]:
+                xs = sorted(x_at(s, k) for s in through)
+                for low, high in flat[k]:
+                    crossings += _count_between(xs, low, high)
+        active = through + starting[k]
+        if k + 1 < len(stops) and len(active) > 1:
+            crossings += _inversions(
+                sorted((x_at(seg, k), x_at(seg, k + 1)) for seg in active)
+            )
+    return crossings
+
+
+def _crossings_on_stop(segments, xs):
+    """Pairs of segments running through the same point in different directions."""
+    shared = {x for x, n in Counter(xs).items() if n > 1}
+    if not shared:
+        return 0
+    at_point = defaultdict(Counter)
+    for (_, _, x1, y1, x2, y2), x in zip(segments, xs, strict=True):
+        if x in shared:
+            at_point[x][(x2 - x1) / (y2 - y1)] += 1
+    crossings = 0
+    for slopes in at_point.values():
+        total = sum(slopes.values())
+        crossings += (
+            total * (total - 1) - sum(n * (n - 1) for n in slopes.values())
+        ) // 2
+    return crossings
+
+
+def _count_between(sorted_values, low, high):
+    """Number of values strictly between low and high."""
+    return max(0, bisect_left(sorted_values, high) - bisect_right(sorted_values, low))
+
+
+def _inversions(pairs):
+    """
+    :param pairs: List of (start, end) tuples sorted by start, then end.
+    :return: Number of pairs whose starts and ends are both strictly in
+             opposite order, counted with a Fenwick tree over the ends.
+    """
+    ranks = {end: i for i, end in enumerate(sorted({end for _, end in pairs}), 1)}
+    tree = [0] * (len(ranks) + 1)
+    inversions = 0
+    for seen, (_, end) in enumerate(pairs):
+        rank = ranks[end]
+        # Earlier pairs with an end at or before this one
+        i, at_or_before = rank, 0
+        while i:
+            at_or_before += tree[i]
+            i -= i & -i
+        inversions += seen - at_or_before
+        i = rank
+        while i < len(tree):
+            tree[i] += 1
+            i += i & -i
+    return inversions
@@ -0,0 +1,158 @@
+import logging
+import math
+
+logger = logging.getLogger(__name__)
+
+
+class NodeGrid:
+    """
+    Uniform grid over node bounding boxes.
+
+    Every node is registered in each cell its box overlaps, so the nodes
+    near a straight link segment are found by visiting only the cells the
+    segment crosses. Nodes must be moved through move() to keep the grid
+    in sync.
+    """
+
+    def __init__(self, nodes, cell_size):
+        """
+        :param nodes: Nodes with pos_x, pos_y, half_w and half_h set.
+        :param cell_size: Edge length of a grid cell.
+        """
+        self.cell_size = float(cell_size)
+        self.cells = {}
+        self._cells_of = {}
+        for node in nodes:
+            self._insert(node)
+
+    def _span(self, low, high):
+        return range(
+            math.floor(low / self.cell_size), math.floor(high / self.cell_size) + 1
+        )
+
+    def _insert(self, node):
+        keys = [
+            (cx, cy)
+            for cx in self._span(node.pos_x - node.half_w, node.pos_x + node.half_w)
+            for cy in self._span(node.pos_y - node.half_h, node.pos_y + node.half_h)
+        ]
+        for key in keys:
+            self.cells.setdefault(key, set()).add(node)
+        self._cells_of[node] = keys
+
+    def move(self, node, dx=0.0, dy=0.0):
+        """
+        Shift node by (dx, dy) and update the cells it is registered in.
+        """
+        for key in self._cells_of.pop(node):
+            cell = self.cells[key]
+            cell.discard(node)
+            if not cell:
+                del self.cells[key]
+        node.pos_x += dx
+        node.pos_y += dy
+        self._insert(node)
+
+    def near_vertical(self, x, top, bottom):
+        """
+        :return: Nodes registered in the cells crossed by the vertical
+                 segment at x from top to bottom.
+        """
+        cx = math.floor(x / self.cell_size)
+        return self._collect((cx, cy) for cy in self._span(top, bottom))
+
+    def near_horizontal(self, y, left, right):
+        """
+        :return: Nodes registered in the cells crossed by the horizontal
+                 segment at y from left to right.
+        """
+        cy = math.floor(y / self.cell_size)
+        return self._collect((cx, cy) for cx in self._span(left, right))
+
+    def _collect(self, keys):
+        found = set()
+        for key in keys:
+            cell = self.cells.get(key)
+            if cell:
+                found |= cell
+        return found
+
+
+def adjust_intermediary_nodes(
+    diagram, offset=100.0, vertical_first=True, max_passes=10
+):
+    """
+    Move nodes off straight links that run through them.
+
+    A node overlapped by a vertical link is shifted left by offset, a node
+    overlapped by a horizontal link is shifted up. Shifting a node can put
+    it on another link, so links are checked again until a pass moves
+    nothing or max_passes is reached.
+
+    :param diagram: Diagram whose nodes are adjusted in place.
+    :param offset: Distance a node is shifted by.
+    :param vertical_first: Check a link as vertical before horizontal when
+                           both ends share the same position.
+    :param max_passes: Upper bound on the passes over all links.
+    """
+    all_links = diagram.get_links_from_nodes()
+    nodes = list(diagram.nodes.values())
+    if not nodes:
+        return
+
+    for nd in nodes:
+        nd.half_w = float(nd.width) / 2.0 if nd.width else 20.0
+        nd.half_h = float(nd.height) / 2.0 if nd.height else 20.0
+
+    # Cells about the size of the largest node, so a box spans at most two
+    # cells per axis
+    cell_size = max(max(2 * max(nd.half_w, nd.half_h) for nd in nodes), 1.0)
+    grid = NodeGrid(nodes, cell_size)
+
+    def shift_off_vertical(A, B):
+        top_y = min(A.pos_y, B.pos_y)
+        bot_y = max(A.pos_y, B.pos_y)
+        moved = 0
+        for N in grid.near_vertical(A.pos_x, top_y, bot_y):
+            if N is A or N is B:
+                continue
+            if (
+                N.pos_x - N.half_w <= A.pos_x <= N.pos_x + N.half_w
+                and N.pos_y - N.half_h < bot_y
+                and N.pos_y + N.half_h > top_y
+            ):
+                grid.move(N, dx=-offset)
+                moved += 1
+        return moved
+
+    def shift_off_horizontal(A, B):
+        left_x = min(A.pos_x, B.pos_x)
+        right_x = max(A.pos_x, B.pos_x)
+        moved = 0
+        for N in grid.near_horizontal(A.pos_y, left_x, right_x):
+            if N is A or N is B:
+                continue
+            if (
+                N.pos_y - N.half_h <= A.pos_y <= N.pos_y + N.half_h
+                and N.pos_x - N.half_w < right_x
+                and N.pos_x + N.half_w > left_x
+            ):
+                grid.move(N, dy=-offset)
+                moved += 1
+        return moved
+
+    for passes in range(1, max_passes + 1):
+        moved = 0
+        for link in all_links:
+            A = link.source
+            B = link.target
+            vertical = abs(A.pos_x - B.pos_x) < 1e-5
+            horizontal = abs(A.pos_y - B.pos_y) < 1e-5
+            if vertical and (vertical_first or not horizontal):
+                moved += shift_off_vertical(A, B)
+            elif horizontal:
+                moved += shift_off_horizontal(A, B)
+        if not moved:
+            logger.debug(f"Link overlaps resolved after {passes} pass(es)")
+            return
+    logger.debug(f"Link overlaps still moving nodes after {max_passes} passes")
@@ -0,0 +1,43 @@
+from bisect import bisect_left, bisect_right
+
+
+class SpanIndex:
+    """
+    Union of open intervals (low, high), kept as sorted, non-overlapping
+    spans so that membership is a binary search.
+
+    The layouts use it for the spans between connected nodes of a level:
+    a position strictly inside one of them would put a node between two
+    nodes that are linked to each other.
+    """
+
+    def __init__(self):
+        self._lows = []
+        self._highs = []
+
+    def add(self, a, b):
+        """
+        Add the open interval between a and b, in either order.
+        """
+        low, high = min(a, b), max(a, b)
+        if low == high:
+            return
+        # Spans overlapping (low, high); touching ones stay separate because
+        # their shared end point is in neither open interval
+        start = bisect_right(self._highs, low)
+        end = bisect_left(self._lows, high)
+        if start < end:
+            low = min(low, self._lows[start])
+            high = max(high, self._highs[end - 1])
+        self._lows[start:end] = [low]
+        self._highs[start:end] = [high]
+
+    def __contains__(self, position):
+        """
+        :return: True if position lies strictly inside one of the intervals.
+        """
+        i = bisect_left(self._lows, position) - 1
+        return i >= 0 and position < self._highs[i]
+
+    def __len__(self):
+        return len(self._lows)
@@ -1,13 +1,21 @@
 import logging
+import sys
 
 from rich.logging import RichHandler
-from rich.traceback import install
+
+
+def _rich_excepthook(exc_type, exc_value, traceback):
+    # rich.traceback pulls in pygments; only load it once a traceback is shown
+    from rich.traceback import install
+
+    install(show_locals=False)
+    sys.excepthook(exc_type, exc_value, traceback)
 
 
 def configure_logging(level: int = logging.INFO) -> None:
     """Configure the logging settings for the application."""
 
-    install(show_locals=False)
+    sys.excepthook = _rich_excepthook
     handler = RichHandler(
         show_time=False,
         show_path=False,
@@ -1,8 +1,61 @@
+class LinkStyle:
+    """
+    Style strings shared by every link drawn with the same theme.
+
+    Links keep a reference to one LinkStyle instead of four string attributes
+    each, and copy it only when their styles are changed individually.
+    """
+
+    __slots__ = ("base_style", "link_style", "src_label_style", "trgt_label_style")
+
+    def __init__(
+        self, base_style="", link_style="", src_label_style="", trgt_label_style=""
+    ):
+        self.base_style = base_style
+        self.link_style = link_style
+        self.src_label_style = src_label_style
+        self.trgt_label_style = trgt_label_style
+
+    @classmethod
+    def from_styles(cls, styles):
+        """
+        Build the shared link style of a theme.
+
+        :param styles: Theme styles dictionary.
+        :return: LinkStyle instance.
+        """
+        return cls(
+            base_style=styles.get("base_style", ""),
+            link_style=styles.get("link_style", ""),
+            src_label_style=styles.get("src_label_style", ""),
+            trgt_label_style=styles.get("trgt_label_style", ""),
+        )
+
+
 class Link:
     """
     Represents a link between two nodes, including styling and interface labels.
     """
 
+    __slots__ = (
+        "source",
+        "target",
+        "source_intf",
+        "target_intf",
+        "direction",
+        "theme",
+        "style",
+        "entryY",
+        "exitY",
+        "entryX",
+        "exitX",
+        # Same connection seen from the other end, set by NodeLinkBuilder
+        "twin",
+        # Filled in by GraphLevelManager and DiagramBuilder
+        "level_diff",
+        "port_pos",
+    )
+
     def __init__(self, source, target, source_intf=None, target_intf=None, **kwargs):
         self.source = source
         self.target = target
@@ -10,20 +63,47 @@ class Link:
         self.target_intf = target_intf
         self.direction = kwargs.get("direction", "")
         self.theme = kwargs.get("theme", "nokia")
-        self.base_style = kwargs.get("base_style", "")
-        self.link_style = kwargs.get("link_style", "")
-        self.src_label_style = kwargs.get("src_label_style", "")
-        self.trgt_label_style = kwargs.get("trgt_label_style", "")
+        style = kwargs.get("style")
+        if style is None:
+            style = LinkStyle(
+                base_style=kwargs.get("base_style", ""),
+                link_style=kwargs.get("link_style", ""),
+                src_label_style=kwargs.get("src_label_style", ""),
+                trgt_label_style=kwargs.get("trgt_label_style", ""),
+            )
+        self.style = style
         self.entryY = kwargs.get("entryY", 0)
         self.exitY = kwargs.get("exitY", 0)
         self.entryX = kwargs.get("entryX", 0)
         self.exitX = kwargs.get("exitX", 0)
+        self.twin = kwargs.get("twin")
+        self.level_diff = 0
+        self.port_pos = None
+
+    @property
+    def base_style(self):
+        return self.style.base_style
+
+    @property
+    def link_style(self):
+        return self.style.link_style
+
+    @property
+    def src_label_style(self):
+        return self.style.src_label_style
+
+    @property
+    def trgt_label_style(self):
+        return self.style.trgt_label_style
 
     def set_styles(self, **kwargs):
-        self.base_style = kwargs.get("base_style", self.base_style)
-        self.link_style = kwargs.get("link_style", self.link_style)
-        self.src_label_style = kwargs.get("src_label_style", self.src_label_style)
-        self.trgt_label_style = kwargs.get("trgt_label_style", self.trgt_label_style)
+        # Copy on write so the shared theme style stays untouched
+        self.style = LinkStyle(
+            base_style=kwargs.get("base_style", self.base_style),
+            link_style=kwargs.get("link_style", self.link_style),
+            src_label_style=kwargs.get("src_label_style", self.src_label_style),
+            trgt_label_style=kwargs.get("trgt_label_style", self.trgt_label_style),
+        )
 
     def set_entry_exit_points(self, **kwargs):
         self.entryY = kwargs.get("entryY", self.entryY)
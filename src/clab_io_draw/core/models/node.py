@@ -3,6 +3,34 @@ class Node:
     Represents a single node in the topology.
     """
 
+    __slots__ = (
+        "name",
+        "label",
+        "kind",
+        "mgmt_ipv4",
+        "graph_level",
+        "graph_icon",
+        "base_style",
+        "custom_style",
+        "width",
+        "height",
+        "pos_x",
+        "pos_y",
+        "links",
+        "group",
+        # Half extents, filled in by the layouts
+        "half_w",
+        "half_h",
+        # Lazily built link index, see _build_link_index()
+        "_index_valid",
+        "_downstream_links",
+        "_upstream_links",
+        "_lateral_links",
+        "_neighbors",
+        "_neighbor_set",
+        "_neighbors_by_name",
+    )
+
     def __init__(
         self,
         name,
@@ -54,9 +82,38 @@ class Node:
 
         self.links = []
         self.group = kwargs.get("group", "")
+        self.half_w = None
+        self.half_h = None
+        self._index_valid = False
 
     def add_link(self, link):
         self.links.append(link)
+        self._index_valid = False
+
+    def _build_link_index(self):
+        """
+        Bucket links by direction and index neighbors in a single pass.
+
+        The index is rebuilt lazily after add_link() or update_links().
+        """
+        self._downstream_links = []
+        self._upstream_links = []
+        self._lateral_links = []
+        self._neighbors_by_name = {}
+        buckets = {
+            "downstream": self._downstream_links,
+            "upstream": self._upstream_links,
+            "lateral": self._lateral_links,
+        }
+        for link in self.links:
+            bucket = buckets.get(link.direction)
+            if bucket is not None:
+                bucket.append(link)
+            neighbor = link.target if link.source.name == self.name else link.source
+            self._neighbors_by_name.setdefault(neighbor.name, neighbor)
+        self._neighbors = list(self._neighbors_by_name.values())
+        self._neighbor_set = set(self._neighbors)
+        self._index_valid = True
 
     def get_connection_count(self):
         return len(self.links)
@@ -71,11 +128,17 @@ class Node:
             ]
         )
 
+    # The get_* accessors below return cached lists; callers must not mutate them.
+
     def get_downstream_links(self):
-        return [link for link in self.links if link.direction == "downstream"]
+        if not self._index_valid:
+            self._build_link_index()
+        return self._downstream_links
 
     def get_upstream_links(self):
-        return [link for link in self.links if link.direction == "upstream"]
+        if not self._index_valid:
+            self._build_link_index()
+        return self._upstream_links
 
     def get_upstream_links_towards_level(self, level):
         return [
@@ -85,25 +148,32 @@ class Node:
         ]
 
     def get_lateral_links(self):
-        return [link for link in self.links if link.direction == "lateral"]
+        if not self._index_valid:
+            self._build_link_index()
+        return self._lateral_links
 
     def get_all_links(self):
         return self.links
 
     def get_neighbors(self):
-        neighbors = set()
-        for link in self.get_all_links():
-            if link.source.name == self.name:
-                neighbors.add(link.target)
-            else:
-                neighbors.add(link.source)
-        return list(neighbors)
+        if not self._index_valid:
+            self._build_link_index()
+        return self._neighbors
+
+    def get_neighbor_set(self):
+        if not self._index_valid:
+            self._build_link_index()
+        return self._neighbor_set
+
+    def get_neighbor_map(self):
+        if not self._index_valid:
+            self._build_link_index()
+        return self._neighbors_by_name
 
     def is_connected_to(self, other_node):
-        for link in self.links:
-            if link.source == other_node or link.target == other_node:
-                return True
-        return False
+        if not self._index_valid:
+            self._build_link_index()
+        return other_node in self._neighbor_set
 
     def set_base_style(self, style):
         self.base_style = style
@@ -128,6 +198,7 @@ class Node:
                 link.direction = "upstream"
             else:
                 link.direction = "lateral"
+        self._index_valid = False
 
     def __repr__(self):
         return f"Node(name='{self.name}', kind='{self.kind}')"
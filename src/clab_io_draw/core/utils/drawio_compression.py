@@ -0,0 +1,82 @@
+"""
+draw.io compressed diagram payloads.
+
+A compressed <diagram> holds its mxGraphModel as
+base64(raw_deflate(encodeURIComponent(xml))), which is what draw.io itself
+writes when "Compressed" is enabled in File > Properties.
+"""
+
+import base64
+import io
+import zlib
+from urllib.parse import quote, unquote
+
+# Characters encodeURIComponent leaves alone besides letters, digits and "-_."
+_URI_SAFE = "~!*'()"
+
+
+class DeflateWriter:
+    """
+    File-like writer that compresses text into a draw.io payload on the fly.
+
+    Text can be written in any number of chunks; the payload is identical to
+    deflate_diagram() on the concatenated text.
+    """
+
+    def __init__(self, outfile):
+        self.outfile = outfile
+        self.compressor = zlib.compressobj(
+            zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15
+        )
+        self.pending = b""
+
+    def write(self, text):
+        self._emit(
+            self.compressor.compress(quote(text, safe=_URI_SAFE).encode("ascii"))
+        )
+
+    def _emit(self, data):
+        data = self.pending + data
+        # base64 works on 3 byte groups, keep the remainder for the next chunk
+        cut = len(data) - len(data) % 3
+        self.pending = data[cut:]
+        if cut:
+            self.outfile.write(base64.b64encode(data[:cut]).decode("ascii"))
+
+    def close(self):
+        """
+        Flush the compressor and write the final, padded base64 group.
+        """
+        self._emit(self.compressor.flush())
+        if self.pending:
+            self.outfile.write(base64.b64encode(self.pending).decode("ascii"))
+            self.pending = b""
+
+
+def deflate_diagram(xml):
+    """
+    Compress mxGraphModel XML into a draw.io diagram payload.
+
+    :param xml: Serialized mxGraphModel.
+    :return: base64 payload for the <diagram> element text.
+    """
+    buffer = io.StringIO()
+    writer = DeflateWriter(buffer)
+    writer.write(xml)
+    writer.close()
+    return buffer.getvalue()
+
+
+def inflate_diagram(payload):
+    """
+    Decompress a draw.io diagram payload back into mxGraphModel XML.
+
+    :param payload: base64 text of a compressed <diagram> element.
+    :return: Serialized mxGraphModel.
+    :raises ValueError: If the payload is not valid base64 deflate data.
+    """
+    try:
+        data = zlib.decompress(base64.b64decode(payload.strip()), -15)
+    except zlib.error as e:
+        raise ValueError(f"Invalid compressed diagram: {e}") from e
+    return unquote(data.decode("utf-8"))
@@ -0,0 +1,166 @@
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import time
+
+logger = logging.getLogger(__name__)
+
+# inotify(7) constants
+_IN_MODIFY = 0x002
+_IN_CLOSE_WRITE = 0x008
+_IN_MOVED_TO = 0x080
+_IN_CREATE = 0x100
+_IN_DELETE = 0x200
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_WATCH_MASK = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+_EVENT = struct.Struct("iIII")
+
+
+class _Inotify:
+    """
+    Minimal inotify binding through ctypes, watching the parent folders of
+    the files so that editors replacing a file by rename are noticed too.
+    """
+
+    def __init__(self, directories):
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.directories = {}
+        try:
+            for directory in directories:
+                wd = libc.inotify_add_watch(
+                    self.fd, os.fsencode(directory), _WATCH_MASK
+                )
+                if wd < 0:
+                    raise OSError(ctypes.get_errno(), f"Cannot watch {directory}")
+                self.directories[wd] = directory
+        except OSError:
+            os.close(self.fd)
+            raise
+
+    def read(self, timeout):
+        """
+        :param timeout: Seconds to wait for events, None waits forever.
+        :return: Paths of the files that had events, empty on timeout.
+        """
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+        data = os.read(self.fd, 64 * 1024)
+        paths = set()
+        pos = 0
+        while pos < len(data):
+            wd, _mask, _cookie, length = _EVENT.unpack_from(data, pos)
+            pos += _EVENT.size
+            name = data[pos : pos + length].rstrip(b"\0")
+            pos += length
+            if wd in self.directories and name:
+                paths.add(os.path.join(self.directories[wd], os.fsdecode(name)))
+        return paths
+
+    def close(self):
+        os.close(self.fd)
+
+
+class FileWatcher:
+    """
+    Waits for changes to a fixed set of files.
+
+    Uses inotify where available (Linux) and falls back to polling the
+    files' modification time and size elsewhere. Files do not need to exist
+    yet; creating one counts as a change.
+    """
+
+    def __init__(self, paths, poll_interval=0.5, use_inotify=True):
+        """
+        :param paths: Files to watch.
+        :param poll_interval: Seconds between checks when polling.
+        :param use_inotify: Try inotify before falling back to polling.
+        """
+        self.paths = {os.path.abspath(p) for p in paths}
+        self.poll_interval = poll_interval
+        self._inotify = None
+        if use_inotify:
+            try:
+                self._inotify = _Inotify({os.path.dirname(p) for p in self.paths})
+            except (OSError, AttributeError, TypeError) as e:
+                # AttributeError: libc without inotify, TypeError: no libc found
+                logger.debug(f"inotify unavailable, polling for changes: {e}")
+        self._stats = self._snapshot()
+
+    @property
+    def polling(self):
+        return self._inotify is None
+
+    def wait(self, timeout=None, debounce=0.2):
+        """
+        Block until a watched file changes.
+
+        Once something changed, further changes are collected until the files
+        stay quiet for `debounce` seconds, so an editor writing a file in
+        several steps triggers a single render.
+
+        :param timeout: Seconds to wait for a first change, None waits forever.
+        :param debounce: Quiet period in seconds that ends a burst of changes.
+        :return: Set of changed paths (absolute), empty on timeout.
+        """
+        changed = self._next_changes(timeout)
+        while changed:
+            more = self._next_changes(debounce)
+            if not more:
+                break
+            changed |= more
+        return changed
+
+    def _next_changes(self, timeout):
+        if self._inotify is not None:
+            deadline = None if timeout is None else time.monotonic() + timeout
+            while True:
+                remaining = (
+                    None if deadline is None else max(0, deadline - time.monotonic())
+                )
+                events = self._inotify.read(remaining)
+                changed = events & self.paths
+                if changed or not events:
+                    return changed
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            stats = self._snapshot()
+            changed = {p for p in self.paths if stats[p] != self._stats[p]}
+            self._stats = stats
+            if changed:
+                return changed
+            if deadline is not None and time.monotonic() >= deadline:
+                return set()
+            sleep = self.poll_interval
+            if deadline is not None:
+                sleep = min(sleep, max(0, deadline - time.monotonic()))
+            time.sleep(sleep)
+
+    def _snapshot(self):
+        stats = {}
+        for path in self.paths:
+            try:
+                st = os.stat(path)
+                stats[path] = (st.st_mtime_ns, st.st_size, st.st_ino)
+            except OSError:
+                stats[path] = None
+        return stats
+
+    def close(self):
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,175 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+from importlib.metadata import PackageNotFoundError, version
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_SIZE = 256 * 2**20
+MANIFEST = "manifest.json"
+
+
+def default_cache_dir() -> str:
+    """
+    :return: $XDG_CACHE_HOME/clab-io-draw, falling back to ~/.cache/clab-io-draw.
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(base, "clab-io-draw")
+
+
+def _package_version() -> str:
+    try:
+        return version("clab-io-draw")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+class RenderCache:
+    """
+    Content-addressed cache of clab2drawio outputs.
+
+    Entries are keyed by a hash of everything a render depends on and hold a
+    copy of each file the render wrote. Least recently used entries are
+    evicted once the cache grows beyond max_size bytes. Cache failures are
+    logged and never fail a render.
+    """
+
+    def __init__(self, directory: str | None = None, max_size: int = DEFAULT_MAX_SIZE):
+        """
+        :param directory: Cache folder. Defaults to default_cache_dir().
+        :param max_size: Total size in bytes kept before evicting old entries.
+        """
+        self.directory = directory or default_cache_dir()
+        self.max_size = max_size
+
+    def key(
+        self,
+        containerlab_data: dict,
+        theme_path: str,
+        options: dict,
+        grafana_config_path: str | None = None,
+    ) -> str:
+        """
+        Hash the inputs of a render.
+
+        :param containerlab_data: Expanded topology from TopologyLoader.load, including annotations.
+        :param theme_path: Theme file; its contents are hashed, not its path.
+        :param options: Render options that influence the output.
+        :param grafana_config_path: Optional Grafana panel config file.
+        :return: Hex digest identifying the render.
+        """
+        digest = hashlib.sha256()
+
+        def add(label, data):
+            digest.update(f"{label}:{len(data)}:".encode())
+            digest.update(data)
+
+        add("version", _package_version().encode())
+        add(
+            "topology",
+            json.dumps(containerlab_data, sort_keys=True, default=str).encode(),
+        )
+        with open(theme_path, "rb") as f:
+            add("theme", f.read())
+        if grafana_config_path:
+            with open(grafana_config_path, "rb") as f:
+                add("grafana_config", f.read())
+        add("options", json.dumps(options, sort_keys=True, default=str).encode())
+        return digest.hexdigest()
+
+    def fetch(self, key: str, targets: dict) -> list[str] | None:
+        """
+        Copy the files of a cached render to their output locations.
+
+        :param key: Render key from key().
+        :param targets: Maps an output name to its path. Names with a "/"
+                        (e.g. "icons/<file>") are placed inside the folder
+                        given for the part before the slash.
+        :return: Paths written, or None on a cache miss.
+        """
+        entry = os.path.join(self.directory, key)
+        manifest_file = os.path.join(entry, MANIFEST)
+        try:
+            with open(manifest_file) as f:
+                names = json.load(f)
+            if any(name.partition("/")[0] not in targets for name in names):
+                return None
+            written = []
+            for index, name in enumerate(names):
+                role, _, filename = name.partition("/")
+                dest = (
+                    os.path.join(targets[role], filename) if filename else targets[role]
+                )
+                os.makedirs(os.path.dirname(dest) or ".", exist_ok=True)
+                shutil.copyfile(os.path.join(entry, str(index)), dest)
+                written.append(dest)
+            # The manifest's mtime records the last use for eviction
+            os.utime(manifest_file)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable cache entry {entry}: {e}")
+            return None
+        logger.debug(f"Cache hit for {key}")
+        return written
+
+    def store(self, key: str, outputs: dict) -> None:
+        """
+        Save the files of a finished render.
+
+        :param key: Render key from key().
+        :param outputs: Maps output names, as used by fetch(), to the written files.
+        """
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            staging = tempfile.mkdtemp(prefix=".staging-", dir=self.directory)
+            try:
+                for index, path in enumerate(outputs.values()):
+                    shutil.copyfile(path, os.path.join(staging, str(index)))
+                with open(os.path.join(staging, MANIFEST), "w") as f:
+                    json.dump(list(outputs), f)
+                # Publish atomically, so concurrent runs never see half an entry
+                os.replace(staging, os.path.join(self.directory, key))
+            except OSError:
+                shutil.rmtree(staging, ignore_errors=True)
+                if os.path.isdir(os.path.join(self.directory, key)):
+                    # Another run stored the same render first
+                    return
+                raise
+            self.evict(keep=key)
+        except OSError as e:
+            logger.warning(f"Could not write render cache entry: {e}")
+
+    def evict(self, keep: str | None = None) -> None:
+        """
+        Remove least recently used entries until the cache fits max_size.
+
+        :param keep: Entry that is never evicted, usually the one just stored.
+        """
+        entries = []
+        total = 0
+        for dir_entry in os.scandir(self.directory):
+            if dir_entry.name.startswith(".") or not dir_entry.is_dir():
+                continue
+            try:
+                files = list(os.scandir(dir_entry.path))
+                size = sum(f.stat().st_size for f in files)
+                last_used = os.stat(os.path.join(dir_entry.path, MANIFEST)).st_mtime
+            except OSError:
+                continue
+            entries.append((last_used, dir_entry.name, size))
+            total += size
+
+        for _, name, size in sorted(entries):
+            if total <= self.max_size:
+                break
+            if name == keep:
+                continue
+            logger.debug(f"Evicting cache entry {name}")
+            shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
+            total -= size
@@ -1,6 +1,8 @@
 # ruff: noqa: B008
 import logging
 import os
+import re
+import sys
 from pathlib import Path
 
 import typer
@@ -22,6 +24,8 @@ def main(
     style: str = "flow",
     diagram_name: str = None,
     default_kind: str = "nokia_srlinux",
+    all_pages: bool = False,
+    jobs: int | None = None,
 ) -> None:
     """
     Convert a .drawio file to a Containerlab YAML file.
@@ -31,15 +35,37 @@ def main(
     :param style: YAML style ("block" or "flow").
     :param diagram_name: Name of the diagram to parse within the .drawio file.
     :param default_kind: Default kind for nodes if not specified.
+    :param all_pages: Convert every page into its own YAML file, named after output_file and the page. Cannot be combined with diagram_name.
+    :param jobs: Number of worker processes for all_pages (default: one per CPU).
     """
     logger.debug("Starting drawio2clab conversion...")
+    if all_pages and diagram_name:
+        logger.error("--diagram-name cannot be combined with --all-pages.")
+        sys.exit(1)
     parser = DrawioParser(input_file, diagram_name)
-    mxGraphModel_root = parser.parse_xml()
+    if all_pages:
+        convert_all_pages(parser, output_file, style, default_kind, jobs)
+        return
 
-    node_details = parser.extract_nodes(mxGraphModel_root)
-    links_info = parser.extract_links(mxGraphModel_root, node_details)
-    parser.extract_link_labels(mxGraphModel_root, links_info)
+    node_details, links_info = parser.parse()
+    save_topology(
+        node_details, links_info, input_file, output_file, style, default_kind
+    )
+
+
+def save_topology(
+    node_details, links_info, input_file, output_file, style, default_kind
+):
+    """
+    Convert parsed nodes and links into a Containerlab topology and save it.
 
+    :param node_details: Dict of node_id -> node details from DrawioParser.
+    :param links_info: Dict of link_id -> link info from DrawioParser.
+    :param input_file: File name the topology name is derived from.
+    :param output_file: Output YAML file path.
+    :param style: YAML style ("block" or "flow").
+    :param default_kind: Default kind for nodes if not specified.
+    """
     converter = Drawio2ClabConverter(default_kind=default_kind)
     compiled_links = converter.compile_link_information(links_info)
     yaml_data = converter.generate_yaml_structure(
@@ -53,6 +79,86 @@ def main(
     logger.info(f"Conversion completed. Output saved to {output_file}")
 
 
+def convert_page(page_data, output_file, style, default_kind):
+    """
+    Decode and convert a single page; runs in a worker process.
+
+    :param page_data: Page data as yielded by DrawioParser.iter_pages.
+    :param output_file: Output YAML file path for this page.
+    :param style: YAML style ("block" or "flow").
+    :param default_kind: Default kind for nodes if not specified.
+    :return: output_file, or None if the page holds no diagram.
+    """
+    result = DrawioParser.parse_page(page_data)
+    if result is None:
+        return None
+    node_details, links_info = result
+    save_topology(
+        node_details, links_info, output_file, output_file, style, default_kind
+    )
+    return output_file
+
+
+def page_output_file(output_file, page_name, used):
+    """
+    Derive a unique per-page output path, e.g. lab.yaml -> lab-Page-1.yaml.
+
+    :param output_file: Output path given for the whole file.
+    :param page_name: Name of the draw.io page.
+    :param used: Set of page suffixes already taken; updated in place.
+    """
+    base, ext = os.path.splitext(output_file)
+    suffix = re.sub(r"[^\w-]+", "_", page_name).strip("_") or "page"
+    candidate, count = suffix, 1
+    while candidate in used:
+        count += 1
+        candidate = f"{suffix}-{count}"
+    used.add(candidate)
+    return f"{base}-{candidate}{ext or '.yaml'}"
+
+
+def convert_all_pages(parser, output_file, style, default_kind, jobs=None):
+    """
+    Convert every page of a .drawio file into its own YAML file.
+
+    Pages are read in one streaming pass; inflating, parsing and converting
+    them happens concurrently in a process pool.
+
+    :param parser: DrawioParser for the input file.
+    :param output_file: Output path the per-page file names are derived from.
+    :param style: YAML style ("block" or "flow").
+    :param default_kind: Default kind for nodes if not specified.
+    :param jobs: Number of worker processes (default: one per CPU).
+    :return: List of written YAML files, in page order.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    used = set()
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [
+            (
+                name,
+                executor.submit(
+                    convert_page,
+                    data,
+                    page_output_file(output_file, name, used),
+                    style,
+                    default_kind,
+                ),
+            )
+            for name, data in parser.iter_pages()
+        ]
+        written = []
+        for name, future in futures:
+            page_file = future.result()
+            if page_file is None:
+                logger.warning(f"Page '{name}' has no diagram content, skipped.")
+            else:
+                written.append(page_file)
+    logger.info(f"Converted {len(written)} page(s) from {parser.input_file}")
+    return written
+
+
 @app.command(name="drawio2clab")
 def cli(  # noqa: B008
     input: Path = typer.Option(..., "-i", "--input", help="Input .drawio XML file"),  # noqa: B008
@@ -64,6 +170,14 @@ def cli(  # noqa: B008
     default_kind: str = typer.Option(
         "nokia_srlinux", "--default-kind", help="Default node kind"
     ),  # noqa: B008
+    all_pages: bool = typer.Option(
+        False,
+        "--all-pages",
+        help="Convert every page into its own YAML file (<output>-<page>.yaml)",
+    ),  # noqa: B008
+    jobs: int | None = typer.Option(
+        None, "-j", "--jobs", help="Worker processes for --all-pages"
+    ),  # noqa: B008
 ) -> None:
     """Convert a .drawio diagram to a Containerlab YAML file."""
 
@@ -77,6 +191,8 @@ def cli(  # noqa: B008
         style=style,
         diagram_name=diagram_name,
         default_kind=default_kind,
+        all_pages=all_pages,
+        jobs=jobs,
     )
 
 
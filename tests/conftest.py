@@ -0,0 +1,110 @@
+import random
+from pathlib import Path
+
+import pytest
+
+from clab_io_draw.core.config.theme_manager import ThemeManager
+from clab_io_draw.core.data.node_link_builder import NodeLinkBuilder
+from clab_io_draw.core.diagram.custom_drawio import CustomDrawioDiagram
+from clab_io_draw.core.models.link import Link
+from clab_io_draw.core.models.node import Node
+
+STYLES_DIR = Path(__file__).resolve().parents[1] / "src" / "clab_io_draw" / "styles"
+
+
+def _clos_topology(num_spines, num_leaves, hosts_per_leaf):
+    """Return containerlab data for a synthetic leaf/spine/host fabric."""
+    nodes = {}
+    links = []
+    for s in range(num_spines):
+        nodes[f"spine{s}"] = {"kind": "nokia_srlinux"}
+    for leaf in range(num_leaves):
+        nodes[f"leaf{leaf}"] = {"kind": "nokia_srlinux"}
+        for s in range(num_spines):
+            links.append(
+                {"endpoints": [f"leaf{leaf}:e1-{49 + s}", f"spine{s}:e1-{leaf + 1}"]}
+            )
+        for h in range(hosts_per_leaf):
+            host = f"host{leaf}-{h}"
+            nodes[host] = {"kind": "linux"}
+            links.append({"endpoints": [f"{host}:eth1", f"leaf{leaf}:e1-{h + 1}"]})
+    return {
+        "name": "synthetic",
+        "prefix": "",
+        "topology": {"nodes": nodes, "links": links},
+        "annotations": None,
+    }
+
+
+def _layered_diagram(levels, width, layout, seed=7):
+    """Random levelled graph with some links inside a level."""
+    rnd = random.Random(seed)  # noqa: S311
+    rows = [
+        [
+            Node(f"{'abc'[level % 3]}{level}-{i}", "", "srl", graph_level=level)
+            for i in range(width)
+        ]
+        for level in range(levels)
+    ]
+
+    def connect(a, b):
+        a.add_link(Link(a, b))
+        b.add_link(Link(b, a))
+
+    for level, row in enumerate(rows[:-1]):
+        for node in row:
+            for peer in rnd.sample(rows[level + 1], 2):
+                connect(node, peer)
+            if rnd.random() < 0.1:
+                connect(node, rnd.choice(row))
+    diagram = CustomDrawioDiagram()
+    diagram.nodes = {node.name: node for row in rows for node in row}
+    diagram.styles = {"padding_x": 150, "padding_y": 175}
+    diagram.layout = layout
+    return diagram
+
+
+@pytest.fixture(autouse=True)
+def isolated_render_cache(tmp_path, monkeypatch):
+    """Keep CLI runs from reading or filling the user's render cache."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "xdg-cache"))
+
+
+@pytest.fixture(scope="session")
+def nokia_styles():
+    return ThemeManager(str(STYLES_DIR / "nokia.yaml")).load_theme()
+
+
+@pytest.fixture(scope="session")
+def grafana_styles():
+    return ThemeManager(str(STYLES_DIR / "grafana.yaml")).load_theme()
+
+
+@pytest.fixture
+def clos_topology():
+    """Factory returning containerlab data for a synthetic Clos fabric."""
+    return _clos_topology
+
+
+@pytest.fixture
+def layered_diagram():
+    """Factory for random levelled graphs with some links inside a level."""
+    return _layered_diagram
+
+
+@pytest.fixture
+def clos_diagram(nokia_styles, clos_topology):
+    """Factory building a CustomDrawioDiagram for a synthetic Clos fabric."""
+
+    def factory(num_spines, num_leaves, hosts_per_leaf, layout="vertical"):
+        data = clos_topology(num_spines, num_leaves, hosts_per_leaf)
+        styles = dict(nokia_styles)
+        builder = NodeLinkBuilder(data, styles, "", data["name"])
+        nodes, _ = builder.build_nodes_and_links()
+        diagram = CustomDrawioDiagram()
+        diagram.nodes = nodes
+        diagram.styles = styles
+        diagram.layout = layout
+        return diagram
+
+    return factory
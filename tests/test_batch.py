@@ -0,0 +1,83 @@
+import shutil
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from clab_io_draw import batch
+from clab_io_draw.batch import expand_inputs, render_file, run_batch
+from clab_io_draw.clab2drawio import Clab2DrawioError, main
+
+LAB_EXAMPLES_DIR = Path(__file__).resolve().parents[1] / "lab-examples"
+
+
+def test_main_raises_instead_of_exiting(tmp_path):
+    with pytest.raises(Clab2DrawioError):
+        main(str(tmp_path / "missing.clab.yml"), None, grafana=False, theme="nokia")
+    with pytest.raises(Clab2DrawioError):
+        main(str(LAB_EXAMPLES_DIR / "st.clab.yml"), None, grafana=False, theme="nope")
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_batch_renders_all_labs_and_reports_failures(tmp_path, jobs):
+    labs = tmp_path / "labs"
+    for name in ("clos01", "dci"):
+        (labs / name).mkdir(parents=True)
+        shutil.copy(LAB_EXAMPLES_DIR / f"{name}.clab.yml", labs / name)
+    (labs / "broken.clab.yml").write_text("topology: [unclosed")
+
+    inputs = expand_inputs(
+        [str(labs / "**" / "*.clab.yml"), str(labs / "dci" / "dci.clab.yml")]
+    )
+    assert len(inputs) == 3  # noqa: S101
+    out = tmp_path / "out"
+    failures = run_batch(
+        inputs, {"grafana": False, "theme": "nokia"}, output_dir=str(out), jobs=jobs
+    )
+
+    assert list(failures) == [str(labs / "broken.clab.yml")]  # noqa: S101
+    assert sorted(p.relative_to(out).as_posix() for p in out.rglob("*.drawio")) == [  # noqa: S101
+        "clos01/clos01.clab.drawio",
+        "dci/dci.clab.drawio",
+    ]
+
+
+def test_render_file_reports_why_the_renderer_exited(monkeypatch):
+    def exits(code):
+        def fake_main(**_):
+            sys.exit(code)
+
+        return fake_main
+
+    monkeypatch.setattr(batch, "main", exits("Unsupported node kind"))
+    assert render_file("a.clab.yml", None, {})[2] == "Unsupported node kind"  # noqa: S101
+    monkeypatch.setattr(batch, "main", exits(3))
+    assert render_file("a.clab.yml", None, {})[2] == "exited with status 3"  # noqa: S101
+
+
+def test_batch_workers_lay_out_components_in_process(monkeypatch):
+    calls = []
+    monkeypatch.setattr(batch, "ProcessPoolExecutor", ThreadPoolExecutor)
+    monkeypatch.setattr(batch, "main", lambda **kwargs: calls.append(kwargs))
+    options = {"grafana": False, "theme": "nokia", "pack_components": True}
+
+    assert run_batch(["a.clab.yml", "b.clab.yml"], options, jobs=2) == {}  # noqa: S101
+    assert [call["layout_jobs"] for call in calls] == [1, 1]  # noqa: S101
+    assert "layout_jobs" not in options  # noqa: S101
+
+
+def test_batch_cli_passes_rendering_options(tmp_path):
+    labs = tmp_path / "labs"
+    labs.mkdir()
+    shutil.copy(LAB_EXAMPLES_DIR / "clos01.clab.yml", labs)
+    out = tmp_path / "out"
+    result = CliRunner().invoke(
+        batch.app,
+        [str(labs / "clos01.clab.yml"), "-o", str(out), "-j", "1"]
+        + ["--stream", "--external-icons", "--icon-base-url", "https://icons/"],
+    )
+    assert result.exit_code == 0, result.output  # noqa: S101
+    assert (out / "icons").is_dir()  # noqa: S101
+    assert "https://icons/" in (out / "clos01.clab.drawio").read_text()  # noqa: S101
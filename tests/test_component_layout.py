@@ -0,0 +1,150 @@
+import pytest
+import yaml
+
+from clab_io_draw.clab2drawio import main
+from clab_io_draw.core.data.graph_level_manager import GraphLevelManager
+from clab_io_draw.core.data.node_link_builder import NodeLinkBuilder
+from clab_io_draw.core.diagram.custom_drawio import CustomDrawioDiagram
+from clab_io_draw.core.layout import component_layout
+from clab_io_draw.core.layout.component_layout import (
+    ComponentLayout,
+    connected_components,
+    pack_shelves,
+)
+from clab_io_draw.core.layout.incremental_layout import LayoutSeed
+from clab_io_draw.core.layout.vertical_layout import VerticalLayout
+
+
+@pytest.fixture
+def pods(clos_topology):
+    """Factory for containerlab data with one Clos pod per size and unlinked nodes."""
+
+    def factory(pod_sizes, singletons=0):
+        nodes = {}
+        links = []
+        for pod, num_leaves in enumerate(pod_sizes):
+            fabric = clos_topology(2, num_leaves, 2)["topology"]
+            nodes.update(
+                {f"p{pod}-{name}": node for name, node in fabric["nodes"].items()}
+            )
+            links += [
+                {"endpoints": [f"p{pod}-{endpoint}" for endpoint in link["endpoints"]]}
+                for link in fabric["links"]
+            ]
+        for i in range(singletons):
+            nodes[f"lone{i}"] = {"kind": "linux"}
+        return {
+            "name": "pods",
+            "prefix": "",
+            "topology": {"nodes": nodes, "links": links},
+            "annotations": None,
+        }
+
+    return factory
+
+
+def _diagram(styles, data):
+    nodes, _ = NodeLinkBuilder(data, styles, "", data["name"]).build_nodes_and_links()
+    diagram = CustomDrawioDiagram()
+    diagram.nodes = nodes
+    diagram.styles = styles
+    diagram.layout = "vertical"
+    GraphLevelManager().assign_graphlevels(diagram, skip_warnings=True)
+    return diagram
+
+
+def _boxes(diagram, styles):
+    boxes = []
+    for component in connected_components(diagram.nodes):
+        xs = [n.pos_x for n in component]
+        ys = [n.pos_y for n in component]
+        boxes.append(
+            (
+                min(xs),
+                min(ys),
+                max(xs) + styles["node_width"],
+                max(ys) + styles["node_height"],
+            )
+        )
+    return boxes
+
+
+def test_components_are_laid_out_alone_and_packed(nokia_styles, pods):
+    diagram = _diagram(nokia_styles, pods([6, 3, 3], singletons=4))
+    components = connected_components(diagram.nodes)
+    assert [len(c) for c in components] == [20, 11, 11, 1, 1, 1, 1]  # noqa: S101
+
+    ComponentLayout(VerticalLayout, jobs=1).apply(diagram)
+
+    # Each pod keeps the shape it gets when laid out on its own
+    alone = _diagram(nokia_styles, pods([3]))
+    VerticalLayout().apply(alone)
+    for pod in ("p1", "p2"):
+        origin = diagram.nodes[f"{pod}-spine0"]
+        shape = {
+            name[3:]: (n.pos_x - origin.pos_x, n.pos_y - origin.pos_y)
+            for name, n in diagram.nodes.items()
+            if name.startswith(pod)
+        }
+        origin = alone.nodes["p0-spine0"]
+        expected = {
+            name[3:]: (n.pos_x - origin.pos_x, n.pos_y - origin.pos_y)
+            for name, n in alone.nodes.items()
+        }
+        assert shape == expected  # noqa: S101
+
+    boxes = _boxes(diagram, nokia_styles)
+    for i, (l1, t1, r1, b1) in enumerate(boxes):
+        for l2, t2, r2, b2 in boxes[i + 1 :]:
+            assert r1 <= l2 or r2 <= l1 or b1 <= t2 or b2 <= t1  # noqa: S101
+    # Packed into a page much narrower than all blocks side by side
+    width = max(r for _, _, r, _ in boxes) - min(left for left, _, _, _ in boxes)
+    assert width < sum(r - left for left, _, r, _ in boxes) * 0.75  # noqa: S101
+
+
+def test_pack_shelves_stays_within_square_width():
+    sizes = [(300, 200), (100, 100), (100, 100), (50, 50), (400, 80)]
+    offsets = pack_shelves(sizes, 10, 10)
+    rects = [
+        (x, y, x + w, y + h) for (x, y), (w, h) in zip(offsets, sizes, strict=True)
+    ]
+    for i, (l1, t1, r1, b1) in enumerate(rects):
+        for l2, t2, r2, b2 in rects[i + 1 :]:
+            assert r1 <= l2 or r2 <= l1 or b1 <= t2 or b2 <= t1  # noqa: S101
+    assert max(r for _, _, r, _ in rects) <= 500  # noqa: S101
+
+
+def test_worker_processes_give_the_same_layout(nokia_styles, pods, monkeypatch):
+    monkeypatch.setattr(component_layout, "PARALLEL_MIN_NODES", 10)
+    monkeypatch.setattr(component_layout, "PARALLEL_MIN_COMPONENT", 10)
+    results = []
+    for jobs in (1, 2):
+        diagram = _diagram(nokia_styles, pods([8, 8, 4], singletons=2))
+        ComponentLayout(VerticalLayout, jobs=jobs).apply(diagram)
+        results.append({name: (n.pos_x, n.pos_y) for name, n in diagram.nodes.items()})
+    assert results[0] == results[1]  # noqa: S101
+
+
+def test_render_with_packed_components(tmp_path, pods, monkeypatch):
+    monkeypatch.setattr(component_layout, "PARALLEL_MIN_NODES", 1)
+    monkeypatch.setattr(component_layout, "PARALLEL_MIN_COMPONENT", 1)
+    monkeypatch.setattr(component_layout.os, "cpu_count", lambda: 4)
+    monkeypatch.setattr(
+        component_layout.ComponentLayout,
+        "_apply_in_workers",
+        lambda *_: pytest.fail("layout_jobs=1 started worker processes"),
+    )
+    input_file = tmp_path / "pods.clab.yml"
+    input_file.write_text(yaml.safe_dump(pods([2, 2], singletons=1)))
+    output_file = tmp_path / "pods.drawio"
+    main(
+        str(input_file),
+        str(output_file),
+        grafana=False,
+        theme="nokia",
+        include_unlinked_nodes=True,
+        pack_components=True,
+        layout_jobs=1,
+    )
+    positions = LayoutSeed.from_drawio(str(output_file)).positions
+    assert len(positions) == 2 * 8 + 1  # noqa: S101
@@ -0,0 +1,72 @@
+import time
+
+import pytest
+
+from clab_io_draw.core.data.graph_level_manager import GraphLevelManager
+from clab_io_draw.core.diagram.custom_drawio import CustomDrawioDiagram
+from clab_io_draw.core.diagram.diagram_builder import DiagramBuilder
+
+
+def test_target_link_resolves_through_twin(clos_diagram, monkeypatch):
+    diagram = clos_diagram(num_spines=2, num_leaves=4, hosts_per_leaf=2)
+    links = diagram.get_links_from_nodes()
+
+    def _no_scan():
+        raise AssertionError("get_target_link fell back to a full scan")
+
+    monkeypatch.setattr(diagram, "get_links_from_nodes", _no_scan)
+    for link in links:
+        target_link = diagram.get_target_link(link)
+        assert target_link.source is link.target  # noqa: S101
+        assert target_link.target is link.source  # noqa: S101
+        assert target_link.source_intf == link.target_intf  # noqa: S101
+        assert target_link.target_intf == link.source_intf  # noqa: S101
+        assert diagram.get_target_link(target_link) is link  # noqa: S101
+
+
+def test_target_link_without_twin_falls_back_to_scan(clos_diagram):
+    diagram = clos_diagram(num_spines=1, num_leaves=1, hosts_per_leaf=1)
+    link = diagram.get_links_from_nodes()[0]
+    expected = link.twin
+    link.twin = None
+    assert CustomDrawioDiagram.get_target_link(diagram, link) is expected  # noqa: S101
+
+
+def _ported_diagram(clos_diagram, grafana_styles, num_leaves):
+    diagram = clos_diagram(num_spines=2, num_leaves=num_leaves, hosts_per_leaf=2)
+    diagram.styles = grafana_styles
+    GraphLevelManager().assign_graphlevels(diagram, skip_warnings=True)
+    for i, node in enumerate(diagram.nodes.values()):
+        node.pos_x = float(i * 100)
+        node.pos_y = float(node.graph_level * 100)
+    diagram.add_diagram("Network Topology")
+    DiagramBuilder().add_nodes(diagram, diagram.nodes, grafana_styles)
+    return diagram
+
+
+def test_group_nodes_bulk_reparents_members(clos_diagram, grafana_styles):
+    diagram = _ported_diagram(clos_diagram, grafana_styles, num_leaves=2)
+    DiagramBuilder().add_ports(diagram, grafana_styles)
+
+    root = diagram.current_root
+    groups = {cell.get("id") for cell in root.findall("./mxCell[@style='group']")}
+    assert groups == {f"group-{name}" for name in diagram.nodes}  # noqa: S101
+    for name in diagram.nodes:
+        cell = root.find(f"./object[@id='{name}']/mxCell")
+        assert cell.get("parent") == f"group-{name}"  # noqa: S101
+        geometry = cell.find("./mxGeometry")
+        assert float(geometry.get("x")) >= 0  # noqa: S101
+        assert float(geometry.get("y")) >= 0  # noqa: S101
+
+
+@pytest.mark.benchmark
+def test_add_ports_scales_linearly(clos_diagram, grafana_styles):
+    timings = []
+    for num_leaves in (100, 400):
+        diagram = _ported_diagram(clos_diagram, grafana_styles, num_leaves)
+        start = time.perf_counter()
+        DiagramBuilder().add_ports(diagram, grafana_styles)
+        timings.append(time.perf_counter() - start)
+
+    # 4x the fabric must not cost anywhere near 16x
+    assert timings[1] < timings[0] * 8, timings  # noqa: S101
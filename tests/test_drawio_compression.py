@@ -0,0 +1,71 @@
+import io
+import shutil
+from pathlib import Path
+from random import SystemRandom
+
+import pytest
+from defusedxml import ElementTree
+
+from clab_io_draw.clab2drawio import main
+from clab_io_draw.core.utils.drawio_compression import (
+    DeflateWriter,
+    deflate_diagram,
+    inflate_diagram,
+)
+
+LAB_EXAMPLES_DIR = Path(__file__).resolve().parents[1] / "lab-examples"
+
+
+def test_deflate_roundtrip_and_chunking():
+    xml = '<mxGraphModel><root><mxCell id="ü &amp; ~!*()\'" /></root></mxGraphModel>'
+    payload = deflate_diagram(xml)
+    assert inflate_diagram(payload) == xml  # noqa: S101
+
+    for chunk_size in (1, 2, 7):
+        buffer = io.StringIO()
+        writer = DeflateWriter(buffer)
+        for pos in range(0, len(xml), chunk_size):
+            writer.write(xml[pos : pos + chunk_size])
+        writer.close()
+        assert buffer.getvalue() == payload  # noqa: S101
+
+
+def _render(tmp_path, name, **kwargs):
+    input_file = tmp_path / f"{name}.clab.yml"
+    shutil.copy(LAB_EXAMPLES_DIR / "clos01.clab.yml", input_file)
+    main(
+        input_file=str(input_file),
+        output_file=None,
+        grafana=False,
+        theme="grafana",
+        include_unlinked_nodes=True,
+        **kwargs,
+    )
+    return input_file.with_suffix(".drawio").read_text()
+
+
+def test_compressed_output_matches_plain_output(tmp_path, monkeypatch):
+    monkeypatch.setattr(SystemRandom, "random", lambda _self: 0.5)
+    monkeypatch.setattr(SystemRandom, "getrandbits", lambda _self, _k: 0)
+
+    plain = _render(tmp_path, "plain")
+    compressed = _render(tmp_path, "compressed", compress=True)
+    streamed = _render(tmp_path, "streamed", compress=True, stream=True)
+    assert streamed == compressed  # noqa: S101
+    assert len(compressed) * 5 < len(plain)  # noqa: S101
+
+    plain_drawing = ElementTree.fromstring(plain)
+    drawing = ElementTree.fromstring(compressed)
+    assert drawing.get("compressed") == "true"  # noqa: S101
+    pages = drawing.findall("./diagram")
+    assert len(pages) == 1  # noqa: S101
+    model = ElementTree.fromstring(inflate_diagram(pages[0].text))
+    expected = plain_drawing.find("./diagram/mxGraphModel")
+    expected.tail = None
+    assert ElementTree.tostring(model) == ElementTree.tostring(expected)  # noqa: S101
+
+
+@pytest.mark.parametrize("payload", ["", "not base64!"])
+def test_inflate_rejects_garbage(payload):
+    with pytest.raises(ValueError):
+        inflate_diagram(payload)
@@ -0,0 +1,250 @@
+import json
+import time
+import tracemalloc
+from pathlib import Path
+
+import pytest
+import yaml
+from defusedxml import ElementTree
+from typer.testing import CliRunner
+
+from clab_io_draw.core.drawio.drawio_parser import DrawioParser
+from clab_io_draw.core.utils.drawio_compression import deflate_diagram
+from clab_io_draw.drawio2clab import app, convert_all_pages
+
+LAB_EXAMPLES_DIR = Path(__file__).resolve().parents[1] / "lab-examples"
+
+TRICKY_DRAWIO = """<mxfile>
+  <diagram id="a" name="Other"><mxGraphModel><root>
+    <object id="ignored" label="ignored"><mxCell vertex="1" parent="1"/></object>
+  </root></mxGraphModel></diagram>
+  <diagram id="b" name="Fabric"><mxGraphModel><root>
+    <mxCell id="0"/>
+    <mxCell id="1" parent="0"/>
+    <mxCell id="e0-src" value="e1-1" vertex="1" parent="e0">
+      <mxGeometry x="-0.5" relative="1" as="geometry"/>
+    </mxCell>
+    <object id="leaf1" label=" leaf1 " kind="linux" mgmt-ipv4="10.0.0.1">
+      <mxCell vertex="1" parent="1"><mxGeometry x="10" y="20"/></mxCell>
+    </object>
+    <mxCell id="spine1" value="spine1" style="image=data:image/svg+xml,AA" vertex="1"/>
+    <object id="leaf1" label="leaf1-renamed">
+      <mxCell vertex="1" parent="1"/>
+    </object>
+    <mxCell id="e0" edge="1" source="leaf1" target="spine1" parent="1">
+      <mxGeometry x="1" y="2"/>
+    </mxCell>
+    <object id="wrapped">
+      <mxCell edge="1" source="spine1" target="nowhere" parent="1"/>
+      <object id="inner">
+        <mxCell edge="1" source="leaf1" target="spine1" parent="1"/>
+      </object>
+    </object>
+    <object id="e0" label="">
+      <mxCell id="e0" edge="1" source="spine1" target="leaf1" parent="1"/>
+    </object>
+    <mxCell id="e0-trgt" value="e1-49" vertex="1" parent="e0">
+      <mxGeometry x="0.5" y="3" relative="-1" as="geometry"/>
+    </mxCell>
+  </root></mxGraphModel></diagram>
+</mxfile>
+"""
+
+
+def _tree_parse(path, diagram_name=None):
+    parser = DrawioParser(str(path), diagram_name)
+    root = parser.parse_xml()
+    node_details = parser.extract_nodes(root)
+    links_info = parser.extract_links(root, node_details)
+    parser.extract_link_labels(root, links_info)
+    return node_details, links_info
+
+
+def _dumps(result):
+    # json keeps dict order, so ordering differences show up as well
+    return json.dumps(result)
+
+
+@pytest.mark.parametrize(
+    "drawio_file", sorted(LAB_EXAMPLES_DIR.glob("*.drawio")), ids=lambda p: p.name
+)
+def test_streaming_parse_matches_tree_parse(drawio_file):
+    expected = _tree_parse(drawio_file)
+    assert _dumps(DrawioParser(str(drawio_file)).parse()) == _dumps(expected)  # noqa: S101
+
+
+def test_streaming_parse_edge_cases(tmp_path):
+    drawio_file = tmp_path / "tricky.drawio"
+    drawio_file.write_text(TRICKY_DRAWIO)
+
+    expected = _tree_parse(drawio_file, "Fabric")
+    node_details, links_info = DrawioParser(str(drawio_file), "Fabric").parse()
+    assert _dumps((node_details, links_info)) == _dumps(expected)  # noqa: S101
+    assert list(node_details) == ["leaf1", "spine1"]  # noqa: S101
+    assert list(links_info) == ["e0", "wrapped", "inner"]  # noqa: S101
+    assert len(links_info["e0"]["labels"]) == 2  # noqa: S101
+
+    assert list(DrawioParser(str(drawio_file)).parse()[0]) == ["ignored"]  # noqa: S101
+
+
+def test_streaming_parse_missing_diagram(tmp_path):
+    drawio_file = tmp_path / "tricky.drawio"
+    drawio_file.write_text(TRICKY_DRAWIO)
+    with pytest.raises(SystemExit):
+        DrawioParser(str(drawio_file), "Missing").parse()
+
+
+@pytest.mark.benchmark
+def test_streaming_parse_memory_is_bounded(tmp_path):
+    drawio_file = tmp_path / "large.drawio"
+    style = "shape=image;image=data:image/svg+xml," + "A" * 2000
+    with open(drawio_file, "w") as f:
+        f.write('<mxfile><diagram id="d" name="d"><mxGraphModel><root>')
+        for i in range(5000):
+            f.write(
+                f'<object id="n{i}" label="n{i}"><mxCell style="{style}" vertex="1" '
+                f'parent="1"><mxGeometry x="{i}" y="0" as="geometry"/></mxCell></object>'
+                f'<object id="l{i}"><mxCell edge="1" source="n{i}" '
+                f'target="n{i - 1}" parent="1"><mxGeometry relative="1" as="geometry"/>'
+                "</mxCell></object>"
+            )
+        f.write("</root></mxGraphModel></diagram></mxfile>")
+
+    # Peak memory beyond the returned node_details/links_info
+    overheads = []
+    for parse in (
+        lambda: _tree_parse(drawio_file),
+        DrawioParser(str(drawio_file)).parse,
+    ):
+        tracemalloc.start()
+        result = parse()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        overheads.append(peak - current)
+        del result
+    assert overheads[1] * 10 < overheads[0], overheads  # noqa: S101
+
+
+def _multi_page_file(tmp_path):
+    pages = []
+    for name in ("clos01.clab.drawio", "dci.clab.drawio"):
+        drawing = ElementTree.parse(LAB_EXAMPLES_DIR / name).getroot()
+        pages.append(drawing.find("diagram"))
+    plain = ElementTree.tostring(pages[0], encoding="unicode")
+    payload = deflate_diagram(
+        ElementTree.tostring(pages[0].find("mxGraphModel"), encoding="unicode")
+    )
+    compressed = f'<diagram id="c" name="Fabric compressed">{payload}</diagram>'
+    other = ElementTree.tostring(pages[1], encoding="unicode")
+    drawio_file = tmp_path / "multi.drawio"
+    drawio_file.write_text(
+        f'<mxfile compressed="true">{plain}{compressed}{other}</mxfile>'
+    )
+    return drawio_file, pages[0].get("name")
+
+
+def test_compressed_page_parses_like_plain_page(tmp_path):
+    drawio_file, plain_name = _multi_page_file(tmp_path)
+    expected = _dumps(DrawioParser(str(drawio_file), plain_name).parse())
+
+    streamed = DrawioParser(str(drawio_file), "Fabric compressed").parse()
+    assert _dumps(streamed) == expected  # noqa: S101
+    assert _dumps(_tree_parse(drawio_file, "Fabric compressed")) == expected  # noqa: S101
+
+
+def test_all_pages_are_converted_in_parallel(tmp_path):
+    drawio_file, _ = _multi_page_file(tmp_path)
+    output_file = tmp_path / "out" / "lab.yaml"
+    output_file.parent.mkdir()
+    written = convert_all_pages(
+        DrawioParser(str(drawio_file)), str(output_file), "flow", "nokia_srlinux", 2
+    )
+
+    assert [Path(p).name for p in written] == [  # noqa: S101
+        "lab-Network_Topology.yaml",
+        "lab-Fabric_compressed.yaml",
+        "lab-Network_Topology-2.yaml",
+    ]
+    plain, compressed, other = (yaml.safe_load(Path(p).read_text()) for p in written)
+    assert plain["topology"] == compressed["topology"]  # noqa: S101
+    assert plain["topology"] != other["topology"]  # noqa: S101
+
+
+def test_all_pages_rejects_diagram_name(tmp_path):
+    drawio_file, _ = _multi_page_file(tmp_path)
+    output_file = tmp_path / "out" / "lab.yaml"
+    output_file.parent.mkdir()
+    result = CliRunner().invoke(
+        app,
+        [
+            "-i",
+            str(drawio_file),
+            "-o",
+            str(output_file),
+            "--all-pages",
+            "--diagram-name",
+            "Fabric compressed",
+        ],
+    )
+
+    assert result.exit_code == 1  # noqa: S101
+    assert list(output_file.parent.iterdir()) == []  # noqa: S101
+
+
+def _nested_links_file(path, links, nest):
+    with open(path, "w") as f:
+        f.write('<mxfile><diagram id="d" name="d"><mxGraphModel><root>')
+        for i in range(links):
+            f.write(
+                f'<object id="n{i}" label="n{i}"><mxCell vertex="1" parent="1">'
+                f'<mxGeometry x="{i}" y="0" as="geometry"/></mxCell></object>'
+            )
+        # edges wrapped in `nest` levels of objects
+        for i in range(0, links, nest):
+            f.write("".join(f'<object id="w{i}-{k}">' for k in range(nest)))
+            for j in range(i, min(i + nest, links)):
+                f.write(
+                    f'<mxCell id="l{j}" edge="1" source="n{j}" target="n{j - 1}" '
+                    'parent="1"><mxGeometry relative="1" as="geometry"/></mxCell>'
+                )
+            f.write("</object>" * nest)
+        for i in range(links):
+            for end, x in (("src", -0.5), ("trgt", 0.5)):
+                f.write(
+                    f'<mxCell id="l{i}-{end}" value="e1-1" vertex="1" parent="l{i}">'
+                    f'<mxGeometry x="{x}" relative="1" as="geometry"/></mxCell>'
+                )
+        f.write("</root></mxGraphModel></diagram></mxfile>")
+
+
+def test_nested_link_extraction_matches_streaming_parse(tmp_path):
+    drawio_file = tmp_path / "links.drawio"
+    _nested_links_file(drawio_file, 200, nest=50)
+    parser = DrawioParser(str(drawio_file))
+    root = parser.parse_xml()
+    node_details = parser.extract_nodes(root)
+    links_info = parser.extract_links(root, node_details)
+    parser.extract_link_labels(root, links_info)
+
+    assert len(links_info) == 200  # noqa: S101
+    assert all(len(link["labels"]) == 2 for link in links_info.values())  # noqa: S101
+    assert _dumps((node_details, links_info)) == _dumps(parser.parse())  # noqa: S101
+
+
+@pytest.mark.benchmark
+def test_link_extraction_scales_linearly(tmp_path):
+    timings = []
+    for links in (2500, 10000):
+        drawio_file = tmp_path / f"links{links}.drawio"
+        _nested_links_file(drawio_file, links, nest=50)
+        parser = DrawioParser(str(drawio_file))
+        root = parser.parse_xml()
+        node_details = parser.extract_nodes(root)
+
+        start = time.perf_counter()
+        links_info = parser.extract_links(root, node_details)
+        parser.extract_link_labels(root, links_info)
+        timings.append(time.perf_counter() - start)
+        assert len(links_info) == links  # noqa: S101
+    # 4x the links must not cost anywhere near 16x
+    assert timings[1] < timings[0] * 8, timings  # noqa: S101
@@ -0,0 +1,155 @@
+import subprocess
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from clab_io_draw.core.data.compact_graph import CompactGraph
+from clab_io_draw.core.data.graph_level_manager import GraphLevelManager
+from clab_io_draw.core.data.node_link_builder import NodeLinkBuilder
+from clab_io_draw.core.data.topology_loader import TopologyLoader
+from clab_io_draw.core.models.link import Link
+from clab_io_draw.core.models.node import Node
+
+LAB_EXAMPLES_DIR = Path(__file__).resolve().parents[1] / "lab-examples"
+
+
+def _build_diagram(names, edges):
+    nodes = {name: Node(name=name, label=name, kind="linux") for name in names}
+    for i, (src, dst) in enumerate(edges):
+        source, target = nodes[src], nodes[dst]
+        source.add_link(Link(source, target, f"e{i}", f"e{i}", direction="downstream"))
+        target.add_link(Link(target, source, f"e{i}", f"e{i}", direction="upstream"))
+    return SimpleNamespace(nodes=nodes)
+
+
+def _levels(diagram):
+    GraphLevelManager().assign_graphlevels(diagram, skip_warnings=True)
+    return {name: node.graph_level for name, node in diagram.nodes.items()}
+
+
+def test_lab_example_levels():
+    data = TopologyLoader().load(str(LAB_EXAMPLES_DIR / "clos01.clab.yml"))
+    builder = NodeLinkBuilder(data, {}, data.get("prefix", "clab"), data["name"])
+    nodes, _ = builder.build_nodes_and_links()
+    levels = _levels(SimpleNamespace(nodes=nodes))
+    assert levels == {  # noqa: S101
+        "clab-clos01-client1": 0,
+        "clab-clos01-client2": 0,
+        "clab-clos01-leaf1": 1,
+        "clab-clos01-leaf2": 1,
+        "clab-clos01-spine": 2,
+    }
+
+
+def test_ring_is_rooted_deterministically():
+    names = ["r1", "r2", "r3", "r4"]
+    diagram = _build_diagram(
+        names, [("r1", "r2"), ("r2", "r3"), ("r3", "r4"), ("r4", "r1")]
+    )
+    assert _levels(diagram) == {"r1": 0, "r2": 1, "r3": 2, "r4": 3}  # noqa: S101
+
+
+def test_cycle_unreachable_from_roots_gets_levels():
+    names = ["a", "b", "x", "y"]
+    diagram = _build_diagram(names, [("a", "b"), ("x", "y"), ("y", "x")])
+    assert _levels(diagram) == {"a": 0, "b": 1, "x": 0, "y": 1}  # noqa: S101
+
+
+def test_full_mesh_terminates():
+    names = [f"dc{i}" for i in range(64)]
+    edges = [(a, b) for i, a in enumerate(names) for b in names[i + 1 :]]
+    edges += [(names[-1], names[0])]
+    levels = _levels(_build_diagram(names, edges))
+    assert levels[names[0]] == 0  # noqa: S101
+    assert all(level == 1 for name, level in levels.items() if name != names[0])  # noqa: S101
+
+
+def test_ring_of_cliques_is_linear():
+    clique_size = 5
+    num_cliques = 1000
+    names = [f"n{c}-{i}" for c in range(num_cliques) for i in range(clique_size)]
+    edges = []
+    for c in range(num_cliques):
+        members = names[c * clique_size : (c + 1) * clique_size]
+        edges.extend((a, b) for a in members for b in members if a != b)
+        edges.append((members[-1], names[((c + 1) % num_cliques) * clique_size]))
+    diagram = _build_diagram(names, edges)
+
+    start = time.perf_counter()
+    levels = _levels(diagram)
+    elapsed = time.perf_counter() - start
+
+    assert len(levels) == 5000  # noqa: S101
+    assert all(level is not None for level in levels.values())  # noqa: S101
+    assert elapsed < 1.0, f"level assignment took {elapsed:.2f}s"  # noqa: S101
+
+
+def _per_root_levels(diagram):
+    """Reference: one BFS per root, merged by minimum level."""
+    nodes = diagram.nodes.values()
+    roots = [n for n in nodes if not n.get_upstream_links()]
+    levels = {}
+    for root in roots:
+        seen = {root.name: 0}
+        frontier = [root]
+        while frontier:
+            nxt = []
+            for node in frontier:
+                for link in node.get_downstream_links():
+                    if link.target.name not in seen:
+                        seen[link.target.name] = seen[node.name] + 1
+                        nxt.append(link.target)
+            frontier = nxt
+        for name, level in seen.items():
+            levels[name] = min(level, levels.get(name, level))
+    return levels
+
+
+def test_multi_source_bfs_matches_per_root_bfs(clos_diagram):
+    diagram = clos_diagram(num_spines=4, num_leaves=16, hosts_per_leaf=8)
+    expected = _per_root_levels(diagram)
+    assert _levels(diagram) == expected  # noqa: S101
+
+
+@pytest.mark.benchmark
+def test_clos_level_assignment_scales_linearly(clos_diagram):
+    timings = []
+    for num_leaves in (32, 128, 512):
+        diagram = clos_diagram(num_spines=4, num_leaves=num_leaves, hosts_per_leaf=8)
+        size = len(diagram.nodes) + len(diagram.get_links_from_nodes())
+        # Best of three, so a garbage collection pass does not skew one size
+        elapsed = float("inf")
+        for _ in range(3):
+            start = time.perf_counter()
+            _levels(diagram)
+            elapsed = min(elapsed, time.perf_counter() - start)
+        timings.append((size, elapsed))
+
+    (small_size, small_time), (large_size, large_time) = timings[0], timings[-1]
+    per_element_ratio = (large_time / large_size) / (small_time / small_size)
+    assert per_element_ratio < 4, timings  # noqa: S101
+
+
+def test_compact_graph_csr_layout():
+    diagram = _build_diagram(["a", "b", "c"], [("a", "b"), ("a", "c"), ("b", "c")])
+    graph = CompactGraph.from_nodes(diagram.nodes)
+    assert list(graph.offsets) == [0, 2, 3, 3]  # noqa: S101
+    assert list(graph.neighbors) == [1, 2, 2]  # noqa: S101
+    assert graph.in_degrees() == [0, 1, 2]  # noqa: S101
+    assert sorted(graph.to_networkx().edges()) == [  # noqa: S101
+        ("a", "b"),
+        ("a", "c"),
+        ("b", "c"),
+    ]
+
+
+def test_level_assignment_does_not_import_networkx():
+    code = (
+        "import sys\n"
+        "from clab_io_draw.core.data.graph_level_manager import GraphLevelManager\n"
+        "assert 'networkx' not in sys.modules\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)  # noqa: S603
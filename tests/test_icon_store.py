@@ -0,0 +1,44 @@
+import base64
+import re
+import shutil
+from pathlib import Path
+
+from clab_io_draw.clab2drawio import main
+from clab_io_draw.core.diagram.icon_store import IconStore
+
+LAB_EXAMPLES_DIR = Path(__file__).resolve().parents[1] / "lab-examples"
+
+
+def test_externalize_writes_each_icon_once(tmp_path):
+    svg = b"<svg xmlns='http://www.w3.org/2000/svg'/>"
+    payload = base64.b64encode(svg).decode()
+    style = f"shape=image;image=data:image/svg+xml,{payload};aspect=fixed;"
+    store = IconStore(str(tmp_path / "icons"), "https://example.com/icons")
+
+    first = store.externalize(style)
+    second = store.externalize("fillColor=#fff;" + style)
+    assert "data:" not in first + second  # noqa: S101
+    assert len(store.files) == 1  # noqa: S101
+    (path,) = store.files.values()
+    assert Path(path).read_bytes() == svg  # noqa: S101
+    assert first == (  # noqa: S101
+        f"shape=image;image=https://example.com/icons/{Path(path).name};aspect=fixed;"
+    )
+
+
+def test_external_icons_render(tmp_path):
+    input_file = tmp_path / "lab.clab.yml"
+    shutil.copy(LAB_EXAMPLES_DIR / "clos01.clab.yml", input_file)
+    main(
+        input_file=str(input_file),
+        output_file=None,
+        grafana=False,
+        theme="nokia",
+        external_icons=True,
+    )
+
+    drawio = (tmp_path / "lab.clab.drawio").read_text()
+    referenced = set(re.findall(r"image=icons/([^;]+)", drawio))
+    assert "image=data:" not in drawio  # noqa: S101
+    assert referenced  # noqa: S101
+    assert referenced <= {p.name for p in (tmp_path / "icons").iterdir()}  # noqa: S101
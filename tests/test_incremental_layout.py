@@ -0,0 +1,132 @@
+import shutil
+import time
+from pathlib import Path
+
+import pytest
+import yaml
+
+from clab_io_draw.clab2drawio import main
+from clab_io_draw.core.data.graph_level_manager import GraphLevelManager
+from clab_io_draw.core.data.node_link_builder import NodeLinkBuilder
+from clab_io_draw.core.diagram.custom_drawio import CustomDrawioDiagram
+from clab_io_draw.core.layout.incremental_layout import IncrementalLayout, LayoutSeed
+from clab_io_draw.core.layout.vertical_layout import VerticalLayout
+
+LAB_EXAMPLES_DIR = Path(__file__).resolve().parents[1] / "lab-examples"
+
+
+@pytest.fixture
+def fabric(nokia_styles, clos_topology):
+    """Factory for a levelled Clos diagram, optionally with a host on leaf3."""
+
+    def factory(num_leaves, extra_host=None):
+        data = clos_topology(num_spines=2, num_leaves=num_leaves, hosts_per_leaf=2)
+        if extra_host:
+            data["topology"]["nodes"][extra_host] = {"kind": "linux"}
+            data["topology"]["links"].append(
+                {"endpoints": [f"{extra_host}:eth1", "leaf3:e1-9"]}
+            )
+        nodes, _ = NodeLinkBuilder(
+            data, nokia_styles, "", data["name"]
+        ).build_nodes_and_links()
+        diagram = CustomDrawioDiagram()
+        diagram.nodes = nodes
+        diagram.styles = nokia_styles
+        diagram.layout = "vertical"
+        GraphLevelManager().assign_graphlevels(diagram, skip_warnings=True)
+        return diagram
+
+    return factory
+
+
+def _grid_seed(diagram):
+    """Positions as a previous vertical layout would have left them."""
+    positions = {}
+    columns = {}
+    for name, node in diagram.nodes.items():
+        column = columns.get(node.graph_level, 0)
+        columns[node.graph_level] = column + 1
+        positions[name] = (100.0 + column * 150, 100.0 + node.graph_level * 175)
+    links = {
+        name: {nbr.name for nbr in node.get_neighbors()}
+        for name, node in diagram.nodes.items()
+    }
+    return LayoutSeed(positions, links)
+
+
+def test_adding_a_host_only_places_its_neighborhood(nokia_styles, fabric):
+    before = fabric(num_leaves=8)
+    VerticalLayout().apply(before)
+    seed = LayoutSeed(
+        {name: (n.pos_x, n.pos_y) for name, n in before.nodes.items()},
+        {
+            name: {nbr.name for nbr in n.get_neighbors()}
+            for name, n in before.nodes.items()
+        },
+    )
+
+    after = fabric(num_leaves=8, extra_host="host3-new")
+    layout = IncrementalLayout(seed, VerticalLayout())
+    layout.apply(after)
+
+    # leaf3 gained a link, so it is re-placed along with the new host
+    assert sorted(layout.placed) == ["host3-new", "leaf3"]  # noqa: S101
+    for name, (x, y) in seed.positions.items():
+        if name not in layout.placed:
+            assert (after.nodes[name].pos_x, after.nodes[name].pos_y) == (x, y)  # noqa: S101
+
+    new = after.nodes["host3-new"]
+    assert new.pos_y == after.nodes["host3-0"].pos_y  # noqa: S101
+    row = [
+        n.pos_x for n in after.nodes.values() if n.pos_y == new.pos_y and n is not new
+    ]
+    assert min(abs(x - new.pos_x) for x in row) >= 0.9 * nokia_styles["padding_x"]  # noqa: S101
+
+
+def test_reapplying_reports_only_the_nodes_of_that_run(fabric):
+    seed = _grid_seed(fabric(num_leaves=8))
+    layout = IncrementalLayout(seed, VerticalLayout())
+    for _ in range(2):
+        layout.apply(fabric(num_leaves=8, extra_host="host3-new"))
+        assert sorted(layout.placed) == ["host3-new", "leaf3"]  # noqa: S101
+
+
+@pytest.mark.benchmark
+def test_incremental_work_follows_the_edit_not_the_fabric(fabric):
+    timings = []
+    for num_leaves in (64, 512):
+        seed = _grid_seed(fabric(num_leaves))
+        after = fabric(num_leaves, extra_host="host3-new")
+        layout = IncrementalLayout(seed, VerticalLayout())
+        start = time.perf_counter()
+        layout.apply(after)
+        timings.append(time.perf_counter() - start)
+        assert sorted(layout.placed) == ["host3-new", "leaf3"]  # noqa: S101
+    # Seeding stays linear in the fabric, placement does not grow with it
+    assert timings[1] < timings[0] * 8 * 2, timings  # noqa: S101
+
+
+def test_incremental_render_reuses_previous_output(tmp_path):
+    input_file = tmp_path / "lab.clab.yml"
+    shutil.copy(LAB_EXAMPLES_DIR / "clos01.clab.yml", input_file)
+    output_file = tmp_path / "lab.drawio"
+    main(str(input_file), str(output_file), grafana=True, theme="nokia")
+    seed = LayoutSeed.from_drawio(str(output_file))
+    assert len(seed.positions) == 5  # noqa: S101
+    assert seed.links["clab-clos01-spine"] == {  # noqa: S101
+        "clab-clos01-leaf1",
+        "clab-clos01-leaf2",
+    }
+
+    data = yaml.safe_load(input_file.read_text())
+    data["topology"]["nodes"]["client3"] = {"kind": "linux"}
+    data["topology"]["links"].append({"endpoints": ["client3:eth1", "leaf2:e1-3"]})
+    input_file.write_text(yaml.safe_dump(data))
+    main(
+        str(input_file), str(output_file), grafana=True, theme="nokia", incremental=True
+    )
+
+    after = LayoutSeed.from_drawio(str(output_file))
+    assert after.positions.keys() - seed.positions.keys() == {"clab-clos01-client3"}  # noqa: S101
+    for name in ("clab-clos01-leaf1", "clab-clos01-client1", "clab-clos01-spine"):
+        assert after.positions[name] == seed.positions[name]  # noqa: S101
@@ -0,0 +1,138 @@
+import time
+from pathlib import Path
+
+import pytest
+
+from clab_io_draw.core.data.graph_level_manager import GraphLevelManager
+from clab_io_draw.core.data.node_link_builder import NodeLinkBuilder
+from clab_io_draw.core.data.topology_loader import TopologyLoader
+from clab_io_draw.core.diagram.custom_drawio import CustomDrawioDiagram
+from clab_io_draw.core.layout import barycenter_engine, vertical_layout
+from clab_io_draw.core.layout.barycenter_engine import (
+    numpy_available,
+    resolve_engine,
+    sweep_until_stable,
+)
+from clab_io_draw.core.layout.horizontal_layout import HorizontalLayout
+from clab_io_draw.core.layout.vertical_layout import VerticalLayout
+
+# Only the NumPy engine needs the optional `fast` extra
+needs_numpy = pytest.mark.skipif(not numpy_available(), reason="NumPy is not installed")
+
+LAB_EXAMPLES = sorted(
+    (Path(__file__).resolve().parents[1] / "lab-examples").glob("*.clab.yml")
+)
+LAYOUTS = [(VerticalLayout, "vertical"), (HorizontalLayout, "horizontal")]
+
+
+def _positions(diagram):
+    return {name: (n.pos_x, n.pos_y) for name, n in diagram.nodes.items()}
+
+
+@needs_numpy
+@pytest.mark.parametrize(("layout_cls", "layout"), LAYOUTS)
+def test_numpy_engine_matches_python_loop(
+    clos_diagram, layered_diagram, layout_cls, layout
+):
+    results = []
+    for engine in ("python", "numpy"):
+        fabric = clos_diagram(2, 6, 2, layout=layout)
+        GraphLevelManager().assign_graphlevels(fabric, skip_warnings=True)
+        layered = layered_diagram(8, 12, layout)
+        layout_cls(engine).apply(fabric)
+        layout_cls(engine).apply(layered)
+        results.append((_positions(fabric), _positions(layered)))
+    assert results[0] == results[1]  # noqa: S101
+
+
+@needs_numpy
+@pytest.mark.parametrize("lab", LAB_EXAMPLES, ids=lambda path: path.name)
+@pytest.mark.parametrize(("layout_cls", "layout"), LAYOUTS)
+def test_engines_match_on_lab_examples(nokia_styles, lab, layout_cls, layout):
+    # The layouts weight neighbors differently (by name prefix or by level),
+    # the labs have links where the two rules disagree
+    data = TopologyLoader().load(str(lab))
+    results = []
+    for engine in ("python", "numpy"):
+        nodes, _ = NodeLinkBuilder(
+            data, nokia_styles, data.get("prefix", "clab"), data["name"]
+        ).build_nodes_and_links()
+        diagram = CustomDrawioDiagram()
+        diagram.nodes = {name: node for name, node in nodes.items() if node.links}
+        diagram.styles = nokia_styles
+        diagram.layout = layout
+        GraphLevelManager().assign_graphlevels(diagram, skip_warnings=True)
+        layout_cls(engine, swap_passes=0).apply(diagram)
+        results.append(_positions(diagram))
+    assert results[0] == results[1]  # noqa: S101
+
+
+@pytest.mark.benchmark
+@needs_numpy
+@pytest.mark.parametrize(("layout_cls", "layout"), LAYOUTS)
+def test_numpy_engine_speedup_on_5000_nodes(
+    layered_diagram, layout_cls, layout, monkeypatch
+):
+    # Time the barycenter sweeps only: 5 levels of 1000 nodes, where placing
+    # the nodes of a wide level dominates
+    monkeypatch.setattr(layout_cls, "_adjust_intermediary_nodes", lambda *_: None)
+    timings = {}
+    results = {}
+    for engine in ("numpy", "python"):
+        diagram = layered_diagram(5, 1000, layout)
+        start = time.perf_counter()
+        layout_cls(engine, swap_passes=0).apply(diagram)
+        timings[engine] = time.perf_counter() - start
+        results[engine] = _positions(diagram)
+    assert results["numpy"] == results["python"]  # noqa: S101
+    assert timings["numpy"] * 10 < timings["python"], timings  # noqa: S101
+
+
+def test_unknown_engine_is_rejected():
+    assert resolve_engine("python") == "python"  # noqa: S101
+    with pytest.raises(ValueError, match="Unknown layout engine"):
+        resolve_engine("fortran")
+
+
+@pytest.mark.parametrize("engine", ["python", pytest.param("numpy", marks=needs_numpy)])
+def test_sweeps_stop_once_positions_are_stable(
+    clos_diagram, layered_diagram, engine, monkeypatch
+):
+    passes = []
+
+    def counting(*args, **kwargs):
+        passes.append(sweep_until_stable(*args, **kwargs))
+        return passes[-1]
+
+    monkeypatch.setattr(vertical_layout, "sweep_until_stable", counting)
+    monkeypatch.setattr(barycenter_engine, "sweep_until_stable", counting)
+
+    results = []
+    for max_passes in (4, 50):
+        fabric = clos_diagram(2, 4, 0)
+        GraphLevelManager().assign_graphlevels(fabric, skip_warnings=True)
+        VerticalLayout(engine, max_passes=max_passes).apply(fabric)
+        results.append(_positions(fabric))
+    # Stopping at the fixpoint gives what running all passes gives
+    assert results[0] == results[1]  # noqa: S101
+    assert passes[0] == passes[1] < 4  # noqa: S101
+
+    # A used up time budget still runs one pass
+    VerticalLayout(engine, time_budget=0).apply(layered_diagram(8, 12, "vertical"))
+    assert passes[-1] == 1  # noqa: S101
+
+
+def test_sweeps_stop_once_crossings_stop_decreasing():
+    positions = [0.0, 0.0]
+
+    def sweep():
+        positions[1] += 1.0
+
+    counts = iter([5, 3, 3, 1])
+    passes = sweep_until_stable(
+        sweep, lambda: list(positions), 10, None, lambda: next(counts)
+    )
+    assert passes == 3  # noqa: S101
+    # Without a crossing count only the pass budget stops a drawing that
+    # keeps moving
+    assert sweep_until_stable(sweep, lambda: list(positions), 10) == 10  # noqa: S101
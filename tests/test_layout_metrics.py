@@ -0,0 +1,85 @@
+import json
+import random
+from pathlib import Path
+
+from clab_io_draw.clab2drawio import main
+from clab_io_draw.core.layout.layout_metrics import count_crossings, layout_metrics
+from clab_io_draw.core.models.link import Link
+from clab_io_draw.core.models.node import Node
+
+LAB_EXAMPLES_DIR = Path(__file__).resolve().parents[1] / "lab-examples"
+
+
+def _orientation(a, b, c):
+    value = (b[0] - a[0]) * (c[1] - a[1]) - (b[1] - a[1]) * (c[0] - a[0])
+    return (value > 0) - (value < 0)
+
+
+def _pairwise_crossings(segments):
+    """Reference count: pairs whose interiors cross in a single point."""
+    segments = [s for s in segments if s[0] != s[1]]
+    count = 0
+    for i, (a, b) in enumerate(segments):
+        for c, d in segments[i + 1 :]:
+            if (
+                _orientation(a, b, c) * _orientation(a, b, d) < 0
+                and _orientation(c, d, a) * _orientation(c, d, b) < 0
+            ):
+                count += 1
+    return count
+
+
+def test_sweep_matches_pairwise_crossing_test():
+    # Points on a small grid give shared end points, end points on other
+    # segments, collinear overlaps and crossings on the sweep stops
+    for seed in range(500):
+        rnd = random.Random(seed)  # noqa: S311
+        size = rnd.choice([3, 4, 6, 10])
+
+        def point(rnd=rnd, size=size):
+            return (rnd.randint(0, size) * 150.0, rnd.randint(0, size) * 175.0)
+
+        segments = [(point(), point()) for _ in range(rnd.randint(1, 25))]
+        assert count_crossings(segments) == _pairwise_crossings(segments)  # noqa: S101
+
+
+def test_layout_metrics_of_a_crossed_square():
+    # a b      a and b linked to both c and d: the diagonals cross once
+    # c d      and d overlaps a fifth node e
+    positions = {"a": (0, 0), "b": (150, 0), "c": (0, 175), "d": (150, 175)}
+    positions["e"] = (180, 200)
+    nodes = {name: Node(name, name, "srl") for name in positions}
+    for name, (x, y) in positions.items():
+        nodes[name].pos_x, nodes[name].pos_y = x, y
+    for top in "ab":
+        for bottom in "cd":
+            link = Link(nodes[top], nodes[bottom])
+            twin = Link(nodes[bottom], nodes[top], twin=link)
+            link.twin = twin
+            nodes[top].add_link(link)
+            nodes[bottom].add_link(twin)
+
+    metrics = layout_metrics(nodes, 50, 50)
+    assert metrics["links"] == 4  # noqa: S101
+    assert metrics["crossings"] == 1  # noqa: S101
+    assert metrics["node_overlaps"] == 1  # noqa: S101
+    diagonal = (150**2 + 175**2) ** 0.5
+    assert metrics["total_edge_length"] == round(2 * 175 + 2 * diagonal, 1)  # noqa: S101
+    assert metrics["bounding_box"] == {"width": 230, "height": 250, "area": 57500}  # noqa: S101
+
+
+def test_render_writes_metrics(tmp_path):
+    metrics_file = tmp_path / "metrics" / "dci.json"
+    main(
+        str(LAB_EXAMPLES_DIR / "dci.clab.yml"),
+        str(tmp_path / "dci.drawio"),
+        grafana=False,
+        theme="nokia",
+        metrics_file=str(metrics_file),
+    )
+    metrics = json.loads(metrics_file.read_text())
+    assert metrics["nodes"] == 21  # noqa: S101
+    assert metrics["links"] == 32  # noqa: S101
+    assert metrics["node_overlaps"] == 0  # noqa: S101
+    assert metrics["layout"] == "vertical"  # noqa: S101
+    assert metrics["layout_seconds"] > 0  # noqa: S101
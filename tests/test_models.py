@@ -0,0 +1,82 @@
+import gc
+import tracemalloc
+
+import pytest
+
+from clab_io_draw.core.data.node_link_builder import NodeLinkBuilder
+from clab_io_draw.core.models.link import Link
+from clab_io_draw.core.models.node import Node
+
+
+def _connect(source, target, direction="downstream"):
+    link = Link(source, target, "e1", "e1", direction=direction)
+    source.add_link(link)
+    return link
+
+
+def test_node_link_index_is_invalidated_by_add_link():
+    a, b, c = (Node(name=n, label=n, kind="linux") for n in "abc")
+    _connect(a, b)
+    assert a.get_downstream_links()[0].target is b  # noqa: S101
+    assert a.is_connected_to(b)  # noqa: S101
+    assert not a.is_connected_to(c)  # noqa: S101
+
+    _connect(a, c, direction="upstream")
+    assert [link.target for link in a.get_upstream_links()] == [c]  # noqa: S101
+    assert a.get_neighbors() == [b, c]  # noqa: S101
+    assert a.get_neighbor_map() == {"b": b, "c": c}  # noqa: S101
+    assert a.is_connected_to(c)  # noqa: S101
+
+
+def test_node_link_index_is_invalidated_by_update_links():
+    a = Node(name="a", label="a", kind="linux", graph_level=1)
+    b = Node(name="b", label="b", kind="linux", graph_level=1)
+    link = _connect(a, b)
+    assert a.get_lateral_links() == []  # noqa: S101
+
+    a.update_links()
+    assert a.get_lateral_links() == [link]  # noqa: S101
+    assert a.get_downstream_links() == []  # noqa: S101
+
+
+def test_models_have_no_instance_dict():
+    a = Node(name="a", label="a", kind="linux")
+    link = _connect(a, Node(name="b", label="b", kind="linux"))
+    assert not hasattr(a, "__dict__")  # noqa: S101
+    assert not hasattr(link, "__dict__")  # noqa: S101
+    assert link.port_pos is None  # noqa: S101
+
+
+def test_links_share_theme_style(nokia_styles, clos_topology):
+    data = clos_topology(num_spines=2, num_leaves=2, hosts_per_leaf=1)
+    _, links = NodeLinkBuilder(data, nokia_styles, "", "x").build_nodes_and_links()
+    assert len({id(link.style) for link in links}) == 1  # noqa: S101
+
+    links[0].set_styles(link_style="strokeColor=#ff0000;")
+    assert links[0].link_style == "strokeColor=#ff0000;"  # noqa: S101
+    assert links[1].link_style == nokia_styles["link_style"]  # noqa: S101
+
+
+@pytest.mark.benchmark
+def test_model_memory_on_20k_link_fabric(nokia_styles, clos_topology):
+    # 2000 leaves x (4 spines + 6 hosts) = 20k containerlab links
+    data = clos_topology(num_spines=4, num_leaves=2000, hosts_per_leaf=6)
+    builder = NodeLinkBuilder(data, nokia_styles, "", "x")
+
+    gc.collect()
+    tracemalloc.start()
+    start = tracemalloc.take_snapshot()
+    nodes, links = builder.build_nodes_and_links()
+    # Runtime attributes that layouts and builders fill in
+    for node in nodes.values():
+        node.get_neighbors()
+        node.half_w = node.half_h = 37.5
+    for link in links:
+        link.level_diff = 1
+        link.port_pos = (0.0, 0.0)
+    end = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    total = sum(stat.size_diff for stat in end.compare_to(start, "filename"))
+    assert len(links) == 40000  # noqa: S101
+    assert total / len(links) < 800, total  # noqa: S101
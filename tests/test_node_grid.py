@@ -0,0 +1,121 @@
+import random
+import time
+
+import pytest
+
+from clab_io_draw.core.diagram.custom_drawio import CustomDrawioDiagram
+from clab_io_draw.core.layout.node_grid import adjust_intermediary_nodes
+from clab_io_draw.core.models.link import Link
+from clab_io_draw.core.models.node import Node
+
+
+def _diagram(positions, links):
+    nodes = {}
+    for name, (x, y) in positions.items():
+        node = Node(name, name, "srl", width=40, height=40)
+        node.pos_x, node.pos_y = float(x), float(y)
+        nodes[name] = node
+    for a, b in links:
+        nodes[a].add_link(Link(nodes[a], nodes[b]))
+        nodes[b].add_link(Link(nodes[b], nodes[a]))
+    diagram = CustomDrawioDiagram()
+    diagram.nodes = nodes
+    return diagram
+
+
+def _lattice(columns, rows, seed=5):
+    """Nodes on a layout-like lattice, linked to random nodes one row down."""
+    rnd = random.Random(seed)  # noqa: S311
+    positions = {
+        f"n{r}-{c}": (100 + c * 150 + rnd.choice((0, 0, 75)), 100 + r * 175)
+        for r in range(rows)
+        for c in range(columns)
+    }
+    links = [
+        (f"n{r}-{c}", f"n{r + rnd.choice((1, 2))}-{rnd.randrange(columns)}")
+        for r in range(rows - 2)
+        for c in range(columns)
+    ]
+    # Same-row links, drawn horizontally
+    links += [(f"n{r}-{c}", f"n{r}-{c + 2}") for r in range(rows) for c in (0, 3)]
+    return _diagram(positions, links)
+
+
+def _single_pass(diagram, offset=100.0):
+    """The all-links by all-nodes scan the grid replaces."""
+    nodes = list(diagram.nodes.values())
+    for nd in nodes:
+        nd.half_w = float(nd.width) / 2.0 if nd.width else 20.0
+        nd.half_h = float(nd.height) / 2.0 if nd.height else 20.0
+    for link in diagram.get_links_from_nodes():
+        A, B = link.source, link.target
+        if abs(A.pos_x - B.pos_x) < 1e-5:
+            top_y, bot_y = min(A.pos_y, B.pos_y), max(A.pos_y, B.pos_y)
+            for N in nodes:
+                if (
+                    N not in (A, B)
+                    and N.pos_x - N.half_w <= A.pos_x <= N.pos_x + N.half_w
+                    and N.pos_y - N.half_h < bot_y
+                    and N.pos_y + N.half_h > top_y
+                ):
+                    N.pos_x -= offset
+        elif abs(A.pos_y - B.pos_y) < 1e-5:
+            left_x, right_x = min(A.pos_x, B.pos_x), max(A.pos_x, B.pos_x)
+            for N in nodes:
+                if (
+                    N not in (A, B)
+                    and N.pos_y - N.half_h <= A.pos_y <= N.pos_y + N.half_h
+                    and N.pos_x - N.half_w < right_x
+                    and N.pos_x + N.half_w > left_x
+                ):
+                    N.pos_y -= offset
+
+
+def _positions(diagram):
+    return {name: (n.pos_x, n.pos_y) for name, n in diagram.nodes.items()}
+
+
+def _overlapped(diagram):
+    before = _positions(diagram)
+    _single_pass(diagram)
+    return {name for name, pos in _positions(diagram).items() if before[name] != pos}
+
+
+def test_first_pass_matches_full_scan():
+    expected = _lattice(12, 12)
+    _single_pass(expected)
+    adjusted = _lattice(12, 12)
+    adjust_intermediary_nodes(adjusted, max_passes=1)
+    assert _positions(adjusted) == _positions(expected)  # noqa: S101
+    assert _positions(adjusted) != _positions(_lattice(12, 12))  # noqa: S101
+
+
+def test_shifted_nodes_are_rechecked():
+    # n is pushed off a-b straight onto c-d, which was already checked
+    diagram = _diagram(
+        {"c": (-100, 0), "d": (-100, 400), "a": (0, 0), "b": (0, 400), "n": (0, 200)},
+        [("c", "d"), ("a", "b")],
+    )
+    adjust_intermediary_nodes(diagram)
+    assert diagram.nodes["n"].pos_x == -200  # noqa: S101
+
+    diagram = _lattice(12, 12)
+    adjust_intermediary_nodes(diagram)
+    assert _overlapped(diagram) == set()  # noqa: S101
+
+
+@pytest.mark.benchmark
+def test_adjustment_scales_linearly():
+    timings = []
+    for columns in (50, 200):
+        runs = []
+        # Best of three, a garbage collection run can land in either size
+        for _ in range(3):
+            diagram = _lattice(columns, 50)
+            start = time.perf_counter()
+            adjust_intermediary_nodes(diagram)
+            runs.append(time.perf_counter() - start)
+        timings.append(min(runs))
+
+    # 4x the nodes and links must not cost anywhere near 16x
+    assert timings[1] < timings[0] * 8, timings  # noqa: S101
@@ -0,0 +1,73 @@
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+from clab_io_draw import clab2drawio
+from clab_io_draw.core.utils.render_cache import RenderCache
+
+LAB_EXAMPLES_DIR = Path(__file__).resolve().parents[1] / "lab-examples"
+
+
+def _render(input_file, output_file, cache, **kwargs):
+    clab2drawio.main(
+        input_file=str(input_file),
+        output_file=str(output_file),
+        grafana=True,
+        theme="nokia",
+        cache=cache,
+        **kwargs,
+    )
+
+
+def test_unchanged_lab_is_restored_from_cache(tmp_path, monkeypatch):
+    cache = RenderCache(str(tmp_path / "cache"))
+    input_file = tmp_path / "lab.clab.yml"
+    shutil.copy(LAB_EXAMPLES_DIR / "clos01.clab.yml", input_file)
+    first = tmp_path / "first" / "lab.drawio"
+    _render(input_file, first, cache)
+    written = sorted(p.name for p in first.parent.iterdir())
+    assert written == [  # noqa: S101
+        "lab.drawio",
+        "lab.grafana.flow_panel.yaml",
+        "lab.grafana.json",
+    ]
+
+    def no_layout(*_args, **_kwargs):
+        raise AssertionError("layout should not run on a cache hit")
+
+    monkeypatch.setattr(clab2drawio.GraphLevelManager, "assign_graphlevels", no_layout)
+    second = tmp_path / "second" / "lab.drawio"
+    _render(input_file, second, cache)
+    for name in written:
+        assert (second.parent / name).read_bytes() == (  # noqa: S101
+            first.parent / name
+        ).read_bytes()
+
+    # The parsed topology is hashed, so comments do not invalidate the entry,
+    # but changed options or annotations do
+    input_file.write_text(input_file.read_text() + "\n# comment\n")
+    _render(input_file, second, cache)
+    with pytest.raises(AssertionError, match="cache hit"):
+        _render(input_file, second, cache, layout="horizontal")
+    input_file.with_name("lab.clab.yml.annotations.json").write_text("{}")
+    with pytest.raises(AssertionError, match="cache hit"):
+        _render(input_file, second, cache)
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = RenderCache(str(tmp_path / "cache"), max_size=2500)
+    output = tmp_path / "out.drawio"
+    output.write_bytes(b"x" * 1000)
+    for key in ("a", "b"):
+        cache.store(key, {"drawio": str(output)})
+    # Entries are ordered by last use, fetching "a" makes "b" the oldest
+    past = os.stat(tmp_path / "cache" / "b" / "manifest.json").st_mtime - 10
+    os.utime(tmp_path / "cache" / "a" / "manifest.json", (past, past))
+    os.utime(tmp_path / "cache" / "b" / "manifest.json", (past + 1, past + 1))
+    assert cache.fetch("a", {"drawio": str(tmp_path / "a.drawio")})  # noqa: S101
+
+    cache.store("c", {"drawio": str(output)})
+    assert sorted(os.listdir(tmp_path / "cache")) == ["a", "c"]  # noqa: S101
+    assert cache.fetch("b", {"drawio": str(tmp_path / "b.drawio")}) is None  # noqa: S101
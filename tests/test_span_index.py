@@ -0,0 +1,16 @@
+import random
+
+from clab_io_draw.core.layout.span_index import SpanIndex
+
+
+def test_span_index_matches_pairwise_scan():
+    rnd = random.Random(3)  # noqa: S311
+    spans = SpanIndex()
+    pairs = []
+    for _ in range(200):
+        a, b = rnd.randrange(100), rnd.randrange(100)
+        spans.add(a, b)
+        pairs.append((min(a, b), max(a, b)))
+        for position in (rnd.randrange(100), a, b, rnd.random() * 100):
+            expected = any(low < position < high for low, high in pairs)
+            assert (position in spans) == expected  # noqa: S101
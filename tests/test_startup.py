@@ -0,0 +1,65 @@
+import subprocess
+import sys
+
+import pytest
+
+# Cumulative import time of the CLI module, in ms. About 4x what it takes on
+# a developer laptop, so only real regressions (a heavy dependency creeping
+# back onto the startup path) trip it.
+IMPORT_BUDGET_MS = 700
+
+# Heavy dependencies that only optional features (-I, -g, --all-pages, ...)
+# and the layouts themselves may import
+DEFERRED = (
+    "textual",
+    "ruamel",
+    "networkx",
+    "concurrent.futures.process",
+    "pygments",
+    "numpy",
+)
+
+
+def _import_times(module):
+    """
+    Import module in a fresh interpreter with -X importtime.
+
+    :return: Dict of imported module -> cumulative import time in microseconds.
+    """
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+CLI_MODULES = ["clab_io_draw.clab2drawio", "clab_io_draw.drawio2clab"]
+
+
+@pytest.mark.parametrize("module", CLI_MODULES)
+def test_cli_startup_defers_heavy_dependencies(module):
+    imported = set(_import_times(module))
+    deferred = sorted(
+        name
+        for name in imported
+        if any(name == dep or name.startswith(dep + ".") for dep in DEFERRED)
+    )
+    assert deferred == []  # noqa: S101
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("module", CLI_MODULES)
+def test_cli_startup_stays_within_budget(module):
+    # Best of three runs, the first one may include writing .pyc files
+    runs = [_import_times(module) for _ in range(3)]
+    elapsed_ms = min(times[module] for times in runs) / 1000
+    assert elapsed_ms < IMPORT_BUDGET_MS, elapsed_ms  # noqa: S101
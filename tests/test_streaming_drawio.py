@@ -0,0 +1,73 @@
+import shutil
+from pathlib import Path
+from random import SystemRandom
+
+import pytest
+
+from clab_io_draw.clab2drawio import main
+from clab_io_draw.core.diagram.streaming_drawio import StreamingDrawioDiagram
+
+LAB_EXAMPLES_DIR = Path(__file__).resolve().parents[1] / "lab-examples"
+
+
+@pytest.fixture
+def fixed_random(monkeypatch):
+    # Grafana midpoint connectors get a random offset
+    monkeypatch.setattr(SystemRandom, "random", lambda _self: 0.5)
+    monkeypatch.setattr(SystemRandom, "getrandbits", lambda _self, _k: 0)
+
+
+@pytest.mark.usefixtures("fixed_random")
+@pytest.mark.parametrize("theme", ["nokia", "grafana"])
+@pytest.mark.parametrize(
+    "yaml_file", sorted(LAB_EXAMPLES_DIR.glob("*.clab.yml")), ids=lambda p: p.stem
+)
+def test_stream_output_matches_tree_output(tmp_path, yaml_file, theme):
+    outputs = []
+    for stream in (False, True):
+        input_file = tmp_path / f"{stream}.clab.yml"
+        shutil.copy(yaml_file, input_file)
+        main(
+            input_file=str(input_file),
+            output_file=None,
+            grafana=False,
+            theme=theme,
+            include_unlinked_nodes=True,
+            stream=stream,
+        )
+        outputs.append(input_file.with_suffix(".drawio").read_bytes())
+
+    assert outputs[0] == outputs[1]  # noqa: S101
+
+
+def test_stream_rejects_node_updates():
+    with pytest.raises(ValueError):
+        StreamingDrawioDiagram(node_duplicates="update")
+    with StreamingDrawioDiagram() as diagram:
+        diagram.add_diagram("Page-1")
+        diagram.add_node(id="leaf1")
+        with pytest.raises(ValueError):
+            diagram.update_node(id="leaf1", label="leaf")
+
+
+def test_stream_releases_spool_files_when_rendering_fails(tmp_path, monkeypatch):
+    spools = []
+
+    def failing_dump_file(self, filename=None, folder="./Output/"):  # noqa: ARG001
+        spools.extend(self.spools.values())
+        raise OSError("disk full")
+
+    monkeypatch.setattr(StreamingDrawioDiagram, "dump_file", failing_dump_file)
+    input_file = tmp_path / "lab.clab.yml"
+    shutil.copy(LAB_EXAMPLES_DIR / "clos01.clab.yml", input_file)
+    with pytest.raises(OSError, match="disk full"):
+        main(
+            input_file=str(input_file),
+            output_file=None,
+            grafana=False,
+            theme="nokia",
+            stream=True,
+        )
+
+    assert spools  # noqa: S101
+    assert all(spool.file.closed for spool in spools)  # noqa: S101
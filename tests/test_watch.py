@@ -0,0 +1,98 @@
+import json
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from clab_io_draw import clab2drawio
+from clab_io_draw.core.data import graph_level_manager
+from clab_io_draw.core.utils.file_watcher import FileWatcher
+
+LAB_EXAMPLES_DIR = Path(__file__).resolve().parents[1] / "lab-examples"
+
+
+@pytest.mark.parametrize("use_inotify", [True, False])
+def test_file_watcher_reports_debounced_changes(tmp_path, use_inotify):
+    watched = tmp_path / "lab.clab.yml"
+    watched.write_text("a")
+    created = tmp_path / "lab.clab.yml.annotations.json"
+    with FileWatcher([watched, created], 0.01, use_inotify) as watcher:
+        assert watcher.wait(timeout=0.05) == set()  # noqa: S101
+
+        # An editor saving through a temporary file, plus unrelated writes
+        (tmp_path / "other.drawio").write_text("x")
+        replacement = tmp_path / ".lab.clab.yml.swp"
+        replacement.write_text("bb")
+        os.replace(replacement, watched)
+        created.write_text("{}")
+        assert watcher.wait(timeout=2, debounce=0.1) == {  # noqa: S101
+            str(watched),
+            str(created),
+        }
+        assert watcher.wait(timeout=0.05) == set()  # noqa: S101
+
+
+def _wait_for(condition, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"  # noqa: S101
+        time.sleep(0.02)
+
+
+def test_watch_rerenders_and_reuses_theme_and_levels(tmp_path, monkeypatch):
+    input_file = tmp_path / "lab.clab.yml"
+    shutil.copy(LAB_EXAMPLES_DIR / "clos01.clab.yml", input_file)
+    output_file = tmp_path / "lab.drawio"
+    calls = {"renders": 0, "theme": 0, "levels": 0}
+
+    render = clab2drawio.main
+    load_theme = clab2drawio.ThemeManager.load_theme
+    assign_levels = graph_level_manager.assign_levels
+
+    def counting_render(**kwargs):
+        render(**kwargs)
+        calls["renders"] += 1
+
+    def counting_load_theme(self):
+        calls["theme"] += 1
+        return load_theme(self)
+
+    def counting_assign_levels(graph):
+        calls["levels"] += 1
+        return assign_levels(graph)
+
+    monkeypatch.setattr(clab2drawio, "main", counting_render)
+    monkeypatch.setattr(clab2drawio.ThemeManager, "load_theme", counting_load_theme)
+    monkeypatch.setattr(graph_level_manager, "assign_levels", counting_assign_levels)
+
+    stop = threading.Event()
+    watcher = threading.Thread(
+        target=clab2drawio.watch,
+        args=(str(input_file), str(output_file), "nokia", stop),
+        kwargs={"debounce": 0.05, "grafana": False},
+    )
+    watcher.start()
+    try:
+        _wait_for(lambda: calls["renders"] == 1)
+        first = output_file.read_text()
+
+        # Placing nodes through annotations keeps the link graph
+        annotations = {
+            "nodeAnnotations": [
+                {"id": name, "position": {"x": 100 * i, "y": 50 * i}}
+                for i, name in enumerate(
+                    ["leaf1", "leaf2", "spine", "client1", "client2"]
+                )
+            ]
+        }
+        Path(f"{input_file}.annotations.json").write_text(json.dumps(annotations))
+        _wait_for(lambda: calls["renders"] == 2)
+    finally:
+        stop.set()
+        watcher.join()
+
+    assert output_file.read_text() != first  # noqa: S101
+    assert calls == {"renders": 2, "theme": 1, "levels": 1}  # noqa: S101